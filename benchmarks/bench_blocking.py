@@ -0,0 +1,114 @@
+"""Benchmark for the cost of request blocking on page loads.
+
+loads a local page with many small resources in one headless session per
+case: no blocklist, a blocklist that matches nothing and one blocking the
+images. on WebDriver BiDi browsers every request of a blocking session is
+intercepted and passes through a python callback before it is continued
+or failed, the second case measures that round trip alone. on chromium
+devtools blocks in the browser and the first two cases should match.
+needs the browser and its driver installed.
+
+usage:
+    python -m benchmarks.bench_blocking [browser] [loads] [resources]
+"""
+
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from quick_qa.web.blocking import install_blocker
+from quick_qa.web.webdriver_factory import (
+    BrowserOptionsSpecBuilder,
+    BrowserType,
+    DriverFactory,
+)
+
+CASES = {
+    "no blocklist": None,
+    "nothing matches": {"urls": ["*no-such-host.invalid*"]},
+    "images blocked": {"resource_types": ["image"]},
+}
+# 1x1 transparent gif
+GIF = bytes.fromhex(
+    "47494638396101000100800000000000ffffff21f90401000000002c00000000"
+    "010001000002024401003b"
+)
+
+
+def serve(resources: int) -> ThreadingHTTPServer:
+    half = resources // 2
+    page = (
+        "<html><body><h1>bench</h1>"
+        + "".join(f'<img src="/img/{i}.gif">' for i in range(half))
+        + "".join(f'<script src="/js/{i}.js"></script>' for i in range(half))
+        + "</body></html>"
+    ).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/img/"):
+                body, kind = GIF, "image/gif"
+            elif self.path.startswith("/js/"):
+                body, kind = b"window.n = (window.n || 0) + 1;", "text/javascript"
+            else:
+                body, kind = page, "text/html"
+            self.send_response(200)
+            self.send_header("Content-Type", kind)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(browser: str = "firefox", loads: int = 10, resources: int = 100) -> None:
+    server = serve(resources)
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    opts = (
+        BrowserOptionsSpecBuilder.create()
+        .set_browser_type(BrowserType(browser))
+        .set_headless(True)
+        .set_window_size("1280,800")
+        .build()
+    )
+    print(f"{browser}, {loads} loads per case, page with {resources} resources")
+    try:
+        _report(opts, url, loads)
+    finally:
+        server.shutdown()
+
+
+def _report(opts, url: str, loads: int) -> None:
+    baseline = None
+    for name, blocklist in CASES.items():
+        driver = DriverFactory.get_driver(opts)
+        try:
+            if blocklist:
+                install_blocker(driver, **blocklist)
+            driver.get(url)  # warm up the session and the server
+            load = []
+            for _ in range(loads):
+                started = time.perf_counter()
+                driver.get(url)
+                load.append(time.perf_counter() - started)
+        finally:
+            driver.quit()
+        median = statistics.median(load)
+        baseline = baseline or median
+        print(
+            f"  {name:<16} median {median * 1000:8.1f} ms  "
+            f"min {min(load) * 1000:8.1f} ms  "
+            f"{(median - baseline) * 1000:+7.1f} ms vs no blocklist"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) if arg.isdigit() else arg for arg in sys.argv[1:]))
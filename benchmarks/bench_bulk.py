@@ -0,0 +1,46 @@
+"""Benchmark for process pool bulk validation.
+
+validates many raw response bodies with valid_schema style single core
+validation and with BulkValidator at increasing worker counts. speedup
+is bounded by the cores of the machine running it.
+
+usage:
+    python -m benchmarks.bench_bulk [bodies] [items per body]
+"""
+
+import json
+import os
+import sys
+import time
+
+from benchmarks.bench_schema import SCHEMA, payload
+from quick_qa.api.bulk import BulkValidator
+from quick_qa.api.schema import CompiledSchema
+
+
+def main(bodies: int = 2_000, items: int = 50) -> None:
+    raw = [json.dumps(payload(items)).encode()] * bodies
+    compiled = CompiledSchema(SCHEMA)
+
+    print(f"{bodies} bodies of {items} items, {os.cpu_count()} cores")
+    started = time.perf_counter()
+    for body in raw:
+        compiled.validate(json.loads(body))
+    baseline = time.perf_counter() - started
+    print(f"  {'single core':<14} {baseline * 1000:9.1f} ms    1.0x")
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        with BulkValidator(SCHEMA, workers=workers, codec="json") as validator:
+            validator.validate(raw[:workers])  # start the workers
+            started = time.perf_counter()
+            validator.validate(raw)
+            elapsed = time.perf_counter() - started
+        print(
+            f"  {f'{workers} workers':<14} {elapsed * 1000:9.1f} ms  {baseline / elapsed:5.1f}x"
+        )
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,67 @@
+"""Benchmark for the json codecs used by Post/Put bodies and valid_schema.
+
+compares requests' stdlib serialization with the codecs from
+quick_qa.api.codec, and the cost of gzip on the encoded body.
+
+usage:
+    python -m benchmarks.bench_codec [items] [repeats]
+"""
+
+import json
+import sys
+import timeit
+
+from quick_qa.api.codec import compress, get_codec
+
+
+def payload(items: int) -> list:
+    return [
+        {
+            "id": i,
+            "name": f"user{i}",
+            "email": f"user{i}@mail.com",
+            "active": i % 2 == 0,
+            "score": i / 3,
+            "tags": ["a", "b"],
+        }
+        for i in range(items)
+    ]
+
+
+def main(items: int = 10_000, repeats: int = 5) -> None:
+    body = payload(items)
+    stdlib = get_codec("json")
+    fast = get_codec("auto")
+    encoded = fast.dumps(body)
+
+    print(f"{items} items, {len(encoded) / 1024:.0f} KiB, best of {repeats}")
+    _report(
+        {
+            "encode requests": lambda: json.dumps(body, allow_nan=False).encode(),
+            "encode json": lambda: stdlib.dumps(body),
+            f"encode {fast.name}": lambda: fast.dumps(body),
+        },
+        repeats,
+    )
+    _report(
+        {
+            "decode json": lambda: stdlib.loads(encoded),
+            f"decode {fast.name}": lambda: fast.loads(encoded),
+        },
+        repeats,
+    )
+    gzipped = compress(encoded, "gzip")
+    print(f"  gzip: {len(gzipped) / len(encoded):.0%} of the body size")
+    _report({"gzip level 6": lambda: compress(encoded, "gzip")}, repeats)
+
+
+def _report(cases: dict, repeats: int) -> None:
+    baseline = None
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=1, repeat=repeats))
+        baseline = baseline or best
+        print(f"  {name:<22} {best * 1000:9.2f} ms  {baseline / best:6.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,55 @@
+"""Benchmark for the schema driven fake server.
+
+drives Get.get against a FakeServer with the closed load model and
+reports the sustained request rate and latency percentiles. client and
+server share one interpreter, so the numbers are a floor for the server.
+
+usage:
+    python -m benchmarks.bench_fake_server [seconds] [concurrency]
+"""
+
+import sys
+
+from quick_qa.api.core import BaseEndpoint
+from quick_qa.api.fake_server import FakeServer
+from quick_qa.api.methods import Get
+from quick_qa.api.session import get_session
+
+
+class Users(BaseEndpoint):
+    path_url = "/users"
+    expected_schema = {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "required": ["id", "name", "email"],
+            "properties": {
+                "id": {"type": "integer", "minimum": 0},
+                "name": {"type": "string", "minLength": 1},
+                "email": {"type": "string", "format": "email"},
+                "active": {"type": "boolean"},
+            },
+        },
+    }
+
+
+def main(seconds: float = 5.0, concurrency: int = 16) -> None:
+    get_session().configure(maxsize=concurrency)
+    with FakeServer(array_size=20) as server:
+        server.register(Users)
+        report = Get(Users(server.base_url)).load(
+            "get", duration=seconds, concurrency=concurrency, validate_sample=0.01
+        )
+
+    stats = report.as_dict()
+    print(f"{concurrency} workers for {seconds:g}s")
+    print(f"  throughput  {stats['throughput_rps']:9.1f} req/s")
+    print(f"  errors      {stats['errors']:9d}")
+    for name in ("p50", "p99", "max"):
+        print(f"  {name:<11} {stats['latency_ms'][name]:9.3f} ms")
+    print(f"  connections {get_session().stats.snapshot()['misses']:9d} opened")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(*(cast(arg) for cast, arg in zip((float, int), args)))
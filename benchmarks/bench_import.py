@@ -0,0 +1,92 @@
+"""Benchmark for the cold import time of the api and web modules.
+
+every run imports in a fresh interpreter, so nothing is cached in
+sys.modules. the best time is compared with a budget per target, and
+the heavy dependencies each import pulled in and the slowest modules
+reported by ``python -X importtime`` are listed.
+
+usage:
+    python -m benchmarks.bench_import [repeats] [top]
+"""
+
+import subprocess
+import sys
+
+TARGETS = {
+    "quick_qa.api": [
+        "quick_qa.api.methods",
+        "quick_qa.api.async_methods",
+        "quick_qa.api.cassette",
+    ],
+    "quick_qa.web": [
+        "quick_qa.web.config",
+        "quick_qa.web.driver_store",
+        "quick_qa.web.pom",
+        "quick_qa.web.webdriver_factory",
+    ],
+    "quick_qa.configuration": ["quick_qa.configuration"],
+}
+HEAVY = ("jsonschema", "loguru", "requests", "selenium", "yaml")
+BUDGET = {"quick_qa.api": 0.6, "quick_qa.web": 0.6}
+"""seconds, generous on purpose: going over means a heavy dependency crept
+back onto the import path, not small drift
+"""
+
+_PROBE = """
+import sys, time
+started = time.perf_counter()
+{imports}
+print(time.perf_counter() - started)
+print(",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def cold_import(modules: list) -> tuple:
+    """returns (seconds, heavy dependencies loaded) for one fresh interpreter"""
+    code = _PROBE.format(
+        imports="\n".join(f"import {module}" for module in modules), heavy=HEAVY
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.split("\n")
+    return float(out[0]), out[1] or "-"
+
+
+def slowest(modules: list, top: int) -> list:
+    """returns the top modules by self time from -X importtime"""
+    err = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    rows = []
+    for line in err.splitlines()[1:]:
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        rows.append((int(self_us), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main(repeats: int = 5, top: int = 5) -> None:
+    print(f"best of {repeats} cold imports")
+    _report(TARGETS, repeats)
+    for name, modules in TARGETS.items():
+        print(f"  slowest modules under {name}:")
+        for self_us, module in slowest(modules, top):
+            print(f"    {module:<40} {self_us / 1000:7.2f} ms")
+
+
+def _report(cases: dict, repeats: int) -> None:
+    for name, modules in cases.items():
+        runs = [cold_import(modules) for _ in range(repeats)]
+        best = min(seconds for seconds, _ in runs)
+        budget = BUDGET.get(name)
+        verdict = ""
+        if budget is not None:
+            verdict = "  OVER BUDGET" if best >= budget else "  ok"
+            verdict += f" ({budget * 1000:.0f} ms)"
+        print(f"  {name:<24} {best * 1000:9.2f} ms  loads: {runs[0][1]}{verdict}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,105 @@
+"""Benchmark for the browser performance profiles.
+
+launches a headless browser per profile, times the launch and loading a
+local page with slow images, then quits. eager page loads return before
+the images arrive and image blocking skips them altogether.
+needs the browser and its driver installed.
+
+usage:
+    python -m benchmarks.bench_profiles [browser] [launches] [images]
+"""
+
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from quick_qa.web.profiles import PROFILES
+from quick_qa.web.webdriver_factory import (
+    BrowserOptionsSpecBuilder,
+    BrowserType,
+    DriverFactory,
+)
+
+IMAGE_DELAY = 0.2
+# 1x1 transparent gif
+GIF = bytes.fromhex(
+    "47494638396101000100800000000000ffffff21f90401000000002c00000000"
+    "010001000002024401003b"
+)
+
+
+def serve(images: int) -> ThreadingHTTPServer:
+    page = (
+        "<html><body><h1>bench</h1>"
+        + "".join(f'<img src="/img/{i}.gif">' for i in range(images))
+        + "</body></html>"
+    ).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/img/"):
+                time.sleep(IMAGE_DELAY)
+                body, kind = GIF, "image/gif"
+            else:
+                body, kind = page, "text/html"
+            self.send_response(200)
+            self.send_header("Content-Type", kind)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(browser: str = "chrome", launches: int = 3, images: int = 20) -> None:
+    server = serve(images)
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    print(f"{browser}, {launches} launches per profile, page with {images} images")
+    cases = {}
+    for name in PROFILES:
+        opts = (
+            BrowserOptionsSpecBuilder.create()
+            .set_browser_type(BrowserType(browser))
+            .set_headless(True)
+            .set_window_size("1280,800")
+            .set_profile(name)
+            .build()
+        )
+        cases[name] = opts
+    try:
+        _report(cases, url, launches)
+    finally:
+        server.shutdown()
+
+
+def _report(cases: dict, url: str, launches: int) -> None:
+    baseline = None
+    for name, opts in cases.items():
+        launch, load = [], []
+        for _ in range(launches):
+            started = time.perf_counter()
+            driver = DriverFactory.get_driver(opts)
+            launch.append(time.perf_counter() - started)
+            try:
+                started = time.perf_counter()
+                driver.get(url)
+                load.append(time.perf_counter() - started)
+            finally:
+                driver.quit()
+        best = min(launch) + min(load)
+        baseline = baseline or best
+        print(
+            f"  {name:<20} launch {min(launch) * 1000:8.0f} ms  "
+            f"page load {min(load) * 1000:8.0f} ms  {baseline / best:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) if arg.isdigit() else arg for arg in sys.argv[1:]))
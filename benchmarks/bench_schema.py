@@ -0,0 +1,85 @@
+"""Benchmark for BaseEndpoint.valid_schema on large array payloads.
+
+compares the old per call jsonschema.validate against the cached
+validator and the generated fast checks.
+
+usage:
+    python -m benchmarks.bench_schema [items] [repeats]
+"""
+
+import sys
+import timeit
+
+import jsonschema
+
+from quick_qa.api.schema import CompiledSchema
+
+SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "required": ["id", "name", "email"],
+        "properties": {
+            "id": {"type": "integer", "minimum": 0},
+            "name": {"type": "string", "minLength": 1},
+            "email": {"type": "string", "pattern": "@"},
+            "active": {"type": "boolean"},
+            "tags": {"type": "array", "items": {"type": "string"}},
+        },
+        "additionalProperties": False,
+    },
+}
+
+
+def payload(items: int) -> list:
+    return [
+        {
+            "id": i,
+            "name": f"user{i}",
+            "email": f"user{i}@mail.com",
+            "active": i % 2 == 0,
+            "tags": ["a", "b"],
+        }
+        for i in range(items)
+    ]
+
+
+def main(items: int = 10_000, repeats: int = 5) -> None:
+    body = payload(items)
+    cached = CompiledSchema(SCHEMA)
+    fast = CompiledSchema(SCHEMA, fast=True)
+
+    print(f"one response with {items} items, best of {repeats}")
+    _report(
+        {
+            "jsonschema.validate": lambda: jsonschema.validate(body, SCHEMA),
+            "cached validator": lambda: cached.validate(body),
+            "generated checks": lambda: fast.validate(body),
+        },
+        repeats,
+    )
+
+    small = [body[:1]] * 1000
+    print(f"1000 responses with 1 item, best of {repeats}")
+    _report(
+        {
+            "jsonschema.validate": lambda: [
+                jsonschema.validate(b, SCHEMA) for b in small
+            ],
+            "cached validator": lambda: [cached.validate(b) for b in small],
+            "generated checks": lambda: [fast.validate(b) for b in small],
+        },
+        repeats,
+    )
+
+
+def _report(cases: dict, repeats: int) -> None:
+    baseline = None
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=1, repeat=repeats))
+        baseline = baseline or best
+        print(f"  {name:<22} {best * 1000:9.2f} ms  {baseline / best:6.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
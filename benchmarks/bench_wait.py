@@ -0,0 +1,72 @@
+"""Benchmark for the poll schedule of the wait() helper.
+
+waits on a stub driver whose element shows up after a random delay
+(exponential, 0.3s mean) and whose every check costs a simulated
+WebDriver round-trip. compares
+selenium's fixed 0.5s interval with the default adaptive schedule and
+reports the latency between the element appearing and the wait
+returning, plus the checks sent to the stub driver.
+
+usage:
+    python -m benchmarks.bench_wait [waits] [round trip ms]
+"""
+
+import random
+import statistics
+import sys
+import time
+
+from selenium.common.exceptions import NoSuchElementException
+
+from quick_qa.web.waits import PollSchedule, poll_schedule, wait
+
+SCHEDULES = {
+    "fixed 0.5s": PollSchedule(initial=0.5, factor=1.0, maximum=0.5),
+    "adaptive": poll_schedule(),
+}
+
+
+class StubDriver:
+    """finds its element ``ready_at`` seconds after creation"""
+
+    def __init__(self, appears_after: float, round_trip: float):
+        self.ready_at = time.perf_counter() + appears_after
+        self.round_trip = round_trip
+        self.calls = 0
+
+    def find_element(self, *locator):
+        self.calls += 1
+        time.sleep(self.round_trip)
+        if time.perf_counter() < self.ready_at:
+            raise NoSuchElementException()
+        return "element"
+
+
+def main(waits: int = 40, round_trip_ms: float = 2.0) -> None:
+    rng = random.Random(7)
+    delays = [min(rng.expovariate(1 / 0.3), 3.0) for _ in range(waits)]
+    print(f"{waits} waits, element after ~0.3 s, {round_trip_ms} ms per check")
+    _report(delays, round_trip_ms / 1000)
+
+
+def _report(delays: list, round_trip: float) -> None:
+    baseline = None
+    for name, schedule in SCHEDULES.items():
+        latency, calls = [], 0
+        for appears_after in delays:
+            driver = StubDriver(appears_after, round_trip)
+            wait(driver, 5.0, lambda d: d.find_element("id", "x"), poll=schedule)
+            latency.append(time.perf_counter() - driver.ready_at)
+            calls += driver.calls
+        mean = statistics.mean(latency)
+        baseline = baseline or mean
+        print(
+            f"  {name:<12} mean latency {mean * 1000:7.1f} ms  "
+            f"max {max(latency) * 1000:7.1f} ms  "
+            f"checks {calls / len(delays):5.1f}/wait  "
+            f"saved {(baseline - mean) * len(delays):6.2f} s"
+        )
+
+
+if __name__ == "__main__":
+    main(*(float(arg) if "." in arg else int(arg) for arg in sys.argv[1:]))
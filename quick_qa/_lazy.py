@@ -0,0 +1,19 @@
+"""Module that holds stand-ins for dependencies imported on first use"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+class _LazyLogger:
+    """forwards to loguru's logger, importing loguru the first time
+    something is logged rather than when quick_qa is imported
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        from loguru import logger
+
+        return getattr(logger, name)
+
+
+logger: Any = _LazyLogger()
@@ -0,0 +1,19 @@
+"""Module that holds value checks shared by the api and web configs"""
+
+from urllib.parse import urlparse
+
+
+def is_url(text: str) -> bool:
+    """check if str value is a url
+
+    Args:
+        text (str):
+
+    Returns:
+        bool:
+    """
+    try:
+        result = urlparse(text.strip())
+        return bool(result.scheme and result.netloc)
+    except Exception:
+        return False
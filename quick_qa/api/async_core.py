@@ -0,0 +1,129 @@
+"""Module that holds the asyncio flavor of the api core"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar, Union
+from weakref import WeakKeyDictionary
+
+from quick_qa.api.configs import ApiConfigs
+from quick_qa.api.core import BaseEndpoint
+
+T = TypeVar("T")
+
+
+class ConcurrencyLimiter:
+    """runs blocking calls on a thread pool with at most ``limit`` in flight.
+    each event loop gets its own semaphore, so one limiter serves any loop.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._executor = ThreadPoolExecutor(
+            max_workers=limit, thread_name_prefix="quick_qa_async"
+        )
+        self._semaphores: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = WeakKeyDictionary()
+
+    def semaphore(self) -> asyncio.Semaphore:
+        """returns the semaphore for the running loop
+
+        Returns:
+            asyncio.Semaphore:
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.limit)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """awaits fn(*args, **kwargs) on the thread pool
+
+        Args:
+            fn (Callable[..., T]): blocking callable
+
+        Returns:
+            T: fn's return value
+        """
+        async with self.semaphore():
+            loop = asyncio.get_running_loop()
+            # run_in_executor doesn't carry context variables, e.g. time_budget
+            return await loop.run_in_executor(
+                self._executor, partial(copy_context().run, fn, *args, **kwargs)
+            )
+
+    def shutdown(self) -> None:
+        """stops the thread pool once queued calls finish"""
+        self._executor.shutdown(wait=False)
+
+
+_limiter: Optional[ConcurrencyLimiter] = None
+
+
+def get_limiter() -> ConcurrencyLimiter:
+    """returns the shared limiter, sized from ApiConfigs.concurrency
+
+    Returns:
+        ConcurrencyLimiter:
+    """
+    global _limiter
+    if _limiter is None:
+        _limiter = ConcurrencyLimiter(ApiConfigs.concurrency)
+    return _limiter
+
+
+def set_concurrency(limit: int) -> None:
+    """replaces the shared limiter with one allowing ``limit`` in-flight calls
+
+    Args:
+        limit (int):
+    """
+    global _limiter
+    if _limiter is not None:
+        _limiter.shutdown()
+    _limiter = ConcurrencyLimiter(limit)
+
+
+async def run_blocking(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """awaits a blocking call through the shared limiter
+
+    Args:
+        fn (Callable[..., T]):
+
+    Returns:
+        T:
+    """
+    return await get_limiter().run(fn, *args, **kwargs)
+
+
+class AsyncBaseEndpoint(BaseEndpoint):
+    """BaseEndpoint whose network calls are awaitable.
+
+    Existing endpoints opt in by mixing it in front:
+
+        class AsyncUsers(AsyncBaseEndpoint, Users):
+            pass
+    """
+
+    async def ping(self) -> bool:
+        """runs an options call and checks for 200
+
+        Returns:
+            bool: True if 200 status code
+        """
+        return await run_blocking(super().ping)
+
+    async def allowed_methods(self) -> Union[list, None]:
+        """returns a list of allowed mehods unless the api.
+        returns None if the api does not include the header in the response
+
+        Returns:
+            Union[list, None]
+        """
+        return await run_blocking(super().allowed_methods)
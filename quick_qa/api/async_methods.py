@@ -0,0 +1,70 @@
+"""Module that holds awaitable versions of the verb mixins.
+
+Each class runs its sync counterpart on the shared ConcurrencyLimiter, so
+the same endpoint objects and session are used and many calls can be
+awaited together from one event loop.
+"""
+
+from typing import Any, Optional
+
+from requests import Response
+
+from quick_qa.api.async_core import run_blocking
+from quick_qa.api.methods import Delete, Get, Post, Put
+
+
+class AsyncGet(Get):
+    async def get(
+        self, params: Optional[dict] = None, stream: bool = False
+    ) -> Response:
+        """returns a get request response
+
+        Args:
+            params (Optional[dict], optional): Defaults to None.
+            stream (bool, optional): defer downloading the body. Defaults to False.
+
+        Returns:
+            Response:
+        """
+        return await run_blocking(super().get, params=params, stream=stream)
+
+
+class AsyncPost(Post):
+    async def post(self, data: Optional[dict] = None, json: Any = None) -> Response:
+        """returns a post request response
+
+        Args:
+            data (Optional[dict], optional): Defaults to None.
+            json (Optional[str], optional): Defaults to None.
+
+        Returns:
+            Response:
+        """
+        return await run_blocking(super().post, data=data, json=json)
+
+
+class AsyncPut(Put):
+    async def put(self, data: Optional[dict] = None, json: Any = None) -> Response:
+        """returns a put request response
+
+        Args:
+            data (Optional[dict], optional): Defaults to None.
+            json (Optional[str], optional): Defaults to None.
+
+        Returns:
+            Response:
+        """
+        return await run_blocking(super().put, data=data, json=json)
+
+
+class AsyncDelete(Delete):
+    async def delete(self, data: Optional[dict] = None) -> Response:
+        """returns a delete request response
+
+        Args:
+            data (Optional[dict], optional): Defaults to None.
+
+        Returns:
+            Response:
+        """
+        return await run_blocking(super().delete, data=data)
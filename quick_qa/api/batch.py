@@ -0,0 +1,95 @@
+"""Module that holds the concurrent batch executor for endpoint fan-out"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Iterable, Iterator, Mapping, Optional, Union
+
+from requests import Response
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """outcome of one call in a batch"""
+
+    index: int
+    payload: Mapping[str, Any]
+    response: Optional[Response]
+    elapsed: float
+    """seconds spent on the call, excluding validation"""
+    valid: Union[bool, Exception, None] = None
+    """valid_schema result. None when validation was not requested or the call failed"""
+    error: Optional[Exception] = None
+    """exception raised by the call itself"""
+
+    @property
+    def ok(self) -> bool:
+        """True when the call succeeded and validation (if any) passed"""
+        return self.error is None and self.valid in (True, None)
+
+
+def _run_one(
+    call: Callable[..., Response],
+    index: int,
+    payload: Mapping[str, Any],
+    validator: Optional[Callable[[Response], Union[bool, Exception]]],
+) -> BatchResult:
+    start = time.perf_counter()
+    try:
+        response = call(**payload)
+    except Exception as e:
+        return BatchResult(index, payload, None, time.perf_counter() - start, error=e)
+    elapsed = time.perf_counter() - start
+
+    valid = validator(response) if validator is not None else None
+    return BatchResult(index, payload, response, elapsed, valid=valid)
+
+
+def run_batch(
+    call: Callable[..., Response],
+    payloads: Iterable[Mapping[str, Any]],
+    workers: int,
+    validator: Optional[Callable[[Response], Union[bool, Exception]]] = None,
+    window: Optional[int] = None,
+) -> Iterator[BatchResult]:
+    """calls ``call(**payload)`` for every payload on a thread pool and yields
+    the results in input order.
+
+    payloads are pulled lazily and at most ``window`` calls are queued or
+    running at once, so memory stays flat for any batch size.
+
+    Args:
+        call (Callable[..., Response]): verb to call, e.g. a Get.get bound method
+        payloads (Iterable[Mapping[str, Any]]): keyword arguments for each call
+        workers (int): thread pool size
+        validator (Optional[Callable], optional): run on the worker after each
+            successful call. Defaults to None.
+        window (Optional[int], optional): max calls in flight. Defaults to workers * 2.
+
+    Yields:
+        BatchResult:
+    """
+    window = window or workers * 2
+    pending: Deque[Future] = deque()
+    executor = ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="quick_qa_batch"
+    )
+    try:
+        for index, payload in enumerate(payloads):
+            # each call runs in a copy of the caller's context, e.g. its time_budget
+            pending.append(
+                executor.submit(
+                    copy_context().run, _run_one, call, index, payload, validator
+                )
+            )
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # reached early when the caller stops iterating
+        executor.shutdown(wait=True, cancel_futures=True)
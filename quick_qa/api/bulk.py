@@ -0,0 +1,226 @@
+"""Module that holds process pool schema validation for many bodies"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Union
+
+from jsonschema.exceptions import ValidationError
+from requests import Response
+
+from quick_qa.api.codec import get_codec
+from quick_qa.api.schema import CompiledSchema
+
+
+@dataclass(frozen=True)
+class ItemError:
+    """picklable summary of one validation error"""
+
+    message: str
+    path: Tuple[Union[str, int], ...]
+    """location in the body"""
+    validator: str
+    """keyword that failed, e.g. "type". "decode" when the body isn't json"""
+    schema_path: Tuple[Union[str, int], ...]
+
+    @classmethod
+    def from_error(cls, error: ValidationError) -> ItemError:
+        return cls(
+            message=error.message,
+            path=tuple(error.absolute_path),
+            validator=str(error.validator),
+            schema_path=tuple(error.absolute_schema_path),
+        )
+
+
+@dataclass(frozen=True)
+class ItemResult:
+    """validation outcome of one body"""
+
+    index: int
+    errors: Tuple[ItemError, ...] = ()
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+
+# --------------------------------------------------------------------------- #
+# Worker side
+# --------------------------------------------------------------------------- #
+_worker: Optional[Tuple[CompiledSchema, Any, int]] = None
+
+
+def _init_worker(schema: Any, fast: bool, codec: str, max_errors: int) -> None:
+    """builds the validator once per worker process"""
+    global _worker
+    _worker = (CompiledSchema(schema, fast=fast), get_codec(codec), max_errors)
+
+
+def _check(
+    compiled: CompiledSchema, codec: Any, max_errors: int, body: Any
+) -> Tuple[ItemError, ...]:
+    if isinstance(body, (bytes, bytearray)):
+        try:
+            body = codec.loads(body)
+        except ValueError as e:
+            return (ItemError(str(e), (), "decode", ()),)
+    errors = compiled.iter_errors(body)
+    return tuple(ItemError.from_error(e) for e in islice(errors, max_errors))
+
+
+def _check_chunk(
+    start: int, bodies: Sequence[Any]
+) -> List[Tuple[int, Tuple[ItemError, ...]]]:
+    """returns (index, errors) for the invalid bodies of a chunk only,
+    so valid items cost nothing to send back
+    """
+    compiled, codec, max_errors = _worker
+    failed = []
+    for offset, body in enumerate(bodies):
+        errors = _check(compiled, codec, max_errors, body)
+        if errors:
+            failed.append((start + offset, errors))
+    return failed
+
+
+# --------------------------------------------------------------------------- #
+# Public API
+# --------------------------------------------------------------------------- #
+def _body(item: Any) -> Any:
+    # raw bytes are cheaper to pickle than decoded json and decoding then
+    # happens on the workers as well
+    return item.content if isinstance(item, Response) else item
+
+
+class BulkValidator:
+    """validates many bodies against one schema on a process pool.
+
+    every worker receives the schema once, when it starts, and compiles
+    it there. bodies are sent in chunks and only errors come back.
+    keep one around to validate several batches without restarting workers.
+
+    Example:
+
+        with BulkValidator(Users.expected_schema) as validator:
+            results = validator.validate(r.response for r in batch_results)
+            assert all(r.valid for r in results)
+    """
+
+    def __init__(
+        self,
+        schema: Any,
+        workers: Optional[int] = None,
+        fast: bool = False,
+        codec: str = "auto",
+        max_errors: int = 1,
+    ):
+        """
+        Args:
+            schema (Any): json schema
+            workers (Optional[int], optional): processes. Defaults to os.cpu_count().
+            fast (bool, optional): use generated checks, see CompiledSchema. Defaults to False.
+            codec (str, optional): codec for bytes and Response bodies. Defaults to "auto".
+            max_errors (int, optional): errors kept per body. Defaults to 1.
+
+        Raises:
+            SchemaError: if the schema itself is invalid
+        """
+        # fail on a bad schema here rather than in every worker
+        self._local = CompiledSchema(schema, fast=fast)
+        self.schema = schema
+        self.workers = workers or os.cpu_count() or 1
+        self.codec = codec
+        self.max_errors = max_errors
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.schema, self._local.fast, self.codec, self.max_errors),
+            )
+        return self._pool
+
+    def validate(
+        self, bodies: Iterable[Any], chunk_size: Optional[int] = None
+    ) -> List[ItemResult]:
+        """validates bodies, results are in input order
+
+        Args:
+            bodies (Iterable[Any]): Response objects, raw json bytes, or
+                already decoded values
+            chunk_size (Optional[int], optional): bodies per task. Defaults to
+                about four tasks per worker.
+
+        Returns:
+            List[ItemResult]:
+        """
+        items = [_body(item) for item in bodies]
+        results = [ItemResult(index) for index in range(len(items))]
+        if not items:
+            return results
+
+        chunk_size = chunk_size or max(1, -(-len(items) // (self.workers * 4)))
+        if self.workers == 1 or len(items) <= chunk_size:
+            codec = get_codec(self.codec)
+            chunks: Iterable = [
+                [
+                    (index, errors)
+                    for index, body in enumerate(items)
+                    if (errors := _check(self._local, codec, self.max_errors, body))
+                ]
+            ]
+        else:
+            starts = range(0, len(items), chunk_size)
+            chunks = self._executor().map(
+                _check_chunk,
+                starts,
+                (items[start : start + chunk_size] for start in starts),
+            )
+
+        for chunk in chunks:
+            for index, errors in chunk:
+                results[index] = ItemResult(index, errors)
+        return results
+
+    def close(self) -> None:
+        """stops the worker processes"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> BulkValidator:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def validate_bulk(
+    schema: Any,
+    bodies: Iterable[Any],
+    workers: Optional[int] = None,
+    fast: bool = False,
+    codec: str = "auto",
+    max_errors: int = 1,
+) -> List[ItemResult]:
+    """one-off BulkValidator.validate with its own worker pool
+
+    Args:
+        schema (Any):
+        bodies (Iterable[Any]): Response objects, raw json bytes, or decoded values
+        workers (Optional[int], optional): Defaults to os.cpu_count().
+        fast (bool, optional): Defaults to False.
+        codec (str, optional): Defaults to "auto".
+        max_errors (int, optional): Defaults to 1.
+
+    Returns:
+        List[ItemResult]: in input order
+    """
+    with BulkValidator(schema, workers, fast, codec, max_errors) as validator:
+        return validator.validate(bodies)
@@ -0,0 +1,324 @@
+"""Module that holds the opt-in response cache for GET endpoints"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from requests import Response, Session
+from requests.structures import CaseInsensitiveDict
+
+from quick_qa.api import timing
+from quick_qa.api.configs import ApiConfigs
+
+
+def normalize_params(
+    params: Optional[Mapping[str, Any]],
+) -> Tuple[Tuple[str, str], ...]:
+    """turns query params into a hashable, order independent value.
+    list values are expanded the same way requests encodes them.
+
+    Args:
+        params (Optional[Mapping[str, Any]]):
+
+    Returns:
+        Tuple[Tuple[str, str], ...]:
+    """
+    if not params:
+        return ()
+    pairs = []
+    for key, value in params.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        pairs.extend((str(key), str(v)) for v in values if v is not None)
+    return tuple(sorted(pairs))
+
+
+@dataclass
+class _Entry:
+    response: Response
+    size: int
+    expires: float
+
+
+@dataclass
+class CacheStats:
+    """counters for one label of a ResponseCache"""
+
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    """conditional requests answered with 304"""
+    bytes_saved: int = 0
+    """body bytes served from the cache instead of the network"""
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "bytes_saved": self.bytes_saved,
+        }
+
+
+@dataclass
+class _Totals:
+    entries: int = 0
+    size: int = 0
+    evictions: int = 0
+    labels: Dict[str, CacheStats] = field(default_factory=dict)
+
+
+class ResponseCache:
+    """LRU cache of GET responses keyed on url and normalized params.
+
+    fresh entries are served without any request. an entry is fresh for the
+    response's ``Cache-Control: max-age``, else for ``ttl``; ``no-cache``
+    responses are stored but revalidated on every use and ``no-store`` ones
+    aren't stored. stale entries are revalidated with If-None-Match /
+    If-Modified-Since and reused when the server answers 304, whose
+    validators and Cache-Control replace the stored ones. every caller gets
+    its own copy of a cached response.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        Args:
+            max_bytes (Optional[int], optional): size cap for cached bodies and
+                headers. Defaults to None, which follows ApiConfigs.cache.
+            ttl (Optional[float], optional): seconds an entry is served without
+                revalidation. Defaults to None, which follows ApiConfigs.cache.
+        """
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._entries: OrderedDict[Tuple, _Entry] = OrderedDict()
+        self._totals = _Totals()
+        self._lock = threading.Lock()
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes is None:
+            return ApiConfigs.cache["max_bytes"]
+        return self._max_bytes
+
+    @property
+    def ttl(self) -> float:
+        return ApiConfigs.cache["ttl"] if self._ttl is None else self._ttl
+
+    # ------------------------------------------------------------------- #
+    # Public API
+    # ------------------------------------------------------------------- #
+    def get(
+        self,
+        session: Session,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None,
+        label: str = "",
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Response:
+        """returns a cached or fresh GET response
+
+        Args:
+            session (Session): used for network requests
+            url (str):
+            params (Optional[Mapping[str, Any]], optional): Defaults to None.
+            label (str, optional): stats bucket, usually the endpoint class name.
+                Defaults to "".
+            headers (Optional[Mapping[str, str]], optional): sent with network
+                requests, e.g. Accept-Encoding. not part of the cache key.
+                Defaults to None.
+
+        Returns:
+            Response:
+        """
+        key = (url, normalize_params(params))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if now < entry.expires:
+                    stats = self._stats(label)
+                    stats.hits += 1
+                    stats.bytes_saved += len(entry.response.content)
+                    # no request went out, keep it out of the latencies
+                    if (sample := timing.active()) is not None:
+                        sample.cached = True
+                    return _copy(entry.response)
+
+        headers = {**(headers or {}), **self._conditional_headers(entry)}
+        response = session.get(url=url, params=params, headers=headers or None)
+
+        with self._lock:
+            stats = self._stats(label)
+            if response.status_code == 304 and entry is not None:
+                stats.revalidated += 1
+                stats.bytes_saved += len(entry.response.content)
+                self._refresh(key, entry, response)
+                return _copy(entry.response)
+
+            stats.misses += 1
+            if self._cacheable(response):
+                self._store(key, response)
+            elif entry is not None:
+                self._drop(key)
+        return response
+
+    def clear(self) -> None:
+        """drops every entry, stats are kept"""
+        with self._lock:
+            self._entries.clear()
+            self._totals.entries = self._totals.size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """returns cache size, evictions and hit/miss counters per label
+
+        Returns:
+            Dict[str, Any]:
+        """
+        with self._lock:
+            labels = {name: s.as_dict() for name, s in self._totals.labels.items()}
+            total = CacheStats()
+            for s in self._totals.labels.values():
+                total.hits += s.hits
+                total.misses += s.misses
+                total.revalidated += s.revalidated
+                total.bytes_saved += s.bytes_saved
+            return {
+                "entries": self._totals.entries,
+                "size": self._totals.size,
+                "evictions": self._totals.evictions,
+                "total": total.as_dict(),
+                "labels": labels,
+            }
+
+    # ------------------------------------------------------------------- #
+    # Internal helpers
+    # ------------------------------------------------------------------- #
+    def _stats(self, label: str) -> CacheStats:
+        stats = self._totals.labels.get(label)
+        if stats is None:
+            stats = self._totals.labels[label] = CacheStats()
+        return stats
+
+    @staticmethod
+    def _conditional_headers(entry: Optional[_Entry]) -> Dict[str, str]:
+        if entry is None:
+            return {}
+        headers = {}
+        if etag := entry.response.headers.get("ETag"):
+            headers["If-None-Match"] = etag
+        if modified := entry.response.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = modified
+        return headers
+
+    @staticmethod
+    def _cacheable(response: Response) -> bool:
+        if response.status_code != 200:
+            return False
+        return "no-store" not in _cache_control(response)
+
+    def _expires(self, response: Response) -> float:
+        directives = _cache_control(response)
+        if "no-cache" in directives:
+            lifetime = 0.0
+        else:
+            try:
+                lifetime = float(int(directives["max-age"]))
+            except (KeyError, TypeError, ValueError):
+                lifetime = self.ttl
+        return time.monotonic() + lifetime
+
+    @staticmethod
+    def _size(response: Response) -> int:
+        headers = sum(len(k) + len(v) for k, v in response.headers.items())
+        return len(response.content) + headers
+
+    def _store(self, key: Tuple, response: Response) -> None:
+        size = self._size(response)
+        self._drop(key)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = _Entry(_copy(response), size, self._expires(response))
+        self._totals.entries += 1
+        self._totals.size += size
+        while self._totals.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._totals.entries -= 1
+            self._totals.size -= evicted.size
+            self._totals.evictions += 1
+
+    def _refresh(self, key: Tuple, entry: _Entry, not_modified: Response) -> None:
+        for name in _REFRESHED_HEADERS:
+            if name in not_modified.headers:
+                entry.response.headers[name] = not_modified.headers[name]
+        size = self._size(entry.response)
+        self._totals.size += size - entry.size
+        entry.size = size
+        entry.expires = self._expires(entry.response)
+        if not self._cacheable(entry.response):
+            self._drop(key)
+
+    def _drop(self, key: Tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._totals.entries -= 1
+            self._totals.size -= entry.size
+
+
+_REFRESHED_HEADERS = ("ETag", "Last-Modified", "Cache-Control", "Expires", "Date")
+"""headers of a 304 that replace the stored ones"""
+
+
+def _cache_control(response: Response) -> Dict[str, Optional[str]]:
+    """Cache-Control directives, lower cased, to their value or None"""
+    directives: Dict[str, Optional[str]] = {}
+    for part in response.headers.get("Cache-Control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') if value else None
+    return directives
+
+
+def _copy(response: Response) -> Response:
+    """a response sharing nothing mutable with the original but its body,
+    which is bytes. the raw stream is left out, the body is already read
+    """
+    copied = Response()
+    copied._content = response.content
+    copied._content_consumed = True
+    copied.status_code = response.status_code
+    copied.headers = CaseInsensitiveDict(response.headers)
+    copied.url = response.url
+    copied.encoding = response.encoding
+    copied.reason = response.reason
+    copied.elapsed = response.elapsed
+    copied.history = list(response.history)
+    copied.cookies = response.cookies.copy()
+    copied.request = response.request.copy() if response.request else None
+    return copied
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_cache() -> ResponseCache:
+    """returns the shared cache. its size and ttl are read from
+    ApiConfigs.cache when it is used, so a cache created in a class body,
+    before the config is loaded, still follows the config.
+
+    Endpoints opt in per class:
+
+        class Countries(BaseEndpoint):
+            path_url = "/countries"
+            response_cache = get_cache()
+
+    Returns:
+        ResponseCache:
+    """
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache()
+    return _cache
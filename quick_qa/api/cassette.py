@@ -0,0 +1,337 @@
+"""Module that holds record/replay cassettes for api suites"""
+
+from __future__ import annotations
+
+import atexit
+import base64
+import gzip
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from requests import PreparedRequest, Response, Session
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from quick_qa.api.configs import ApiConfigs
+from quick_qa.api.session import get_session
+
+_FORMAT_VERSION = 1
+
+
+class CassetteMode(Enum):
+    """enum for choosing how a cassette treats requests"""
+
+    RECORD = "record"
+    """always use the network and save every interaction"""
+    REPLAY = "replay"
+    """serve recorded interactions, use the network for anything else"""
+    STRICT = "strict"
+    """serve recorded interactions, raise CassetteMiss for anything else"""
+
+
+class CassetteMiss(Exception):
+    """raised in strict mode for a request that was never recorded"""
+
+
+def request_key(request: PreparedRequest) -> str:
+    """returns the lookup key for a request: method, url with sorted query
+    and a hash of the body
+
+    Args:
+        request (PreparedRequest):
+
+    Returns:
+        str:
+    """
+    parts = urlsplit(request.url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    url = urlunsplit((parts.scheme, parts.netloc, parts.path, query, ""))
+
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if not isinstance(body, bytes):
+        raise TypeError("streamed request bodies can't be recorded")
+    digest = hashlib.sha256(body).hexdigest()[:16] if body else "-"
+    return f"{request.method} {url} {digest}"
+
+
+class Cassette:
+    """recorded interactions indexed by request_key.
+
+    stored as gzip compressed json. a request that was made several times
+    replays its responses in order and then keeps repeating the last one.
+    """
+
+    def __init__(self, path: str, mode: CassetteMode = CassetteMode.REPLAY):
+        """
+        Args:
+            path (str): cassette file, created on save in record mode
+            mode (CassetteMode, optional): Defaults to CassetteMode.REPLAY.
+
+        Raises:
+            FileNotFoundError: replay modes with no cassette on disk
+        """
+        self.path = path
+        self.mode = mode
+        self._interactions: Dict[str, List[Dict[str, Any]]] = {}
+        self._played: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._mounted: Optional[Tuple[Session, Dict[str, BaseAdapter]]] = None
+        if mode is not CassetteMode.RECORD:
+            self.load()
+
+    # ------------------------------------------------------------------- #
+    # Storage
+    # ------------------------------------------------------------------- #
+    def load(self) -> None:
+        """reads the cassette file"""
+        with gzip.open(self.path, "rt", encoding="utf8") as f:
+            data = json.load(f)
+        if data.get("version") != _FORMAT_VERSION:
+            raise ValueError(f"unsupported cassette version in {self.path}")
+        self._interactions = data["interactions"]
+        self._played = {}
+
+    def save(self) -> None:
+        """writes the recorded interactions to the cassette file"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = {"version": _FORMAT_VERSION, "interactions": self._interactions}
+            with gzip.open(self.path, "wt", encoding="utf8") as f:
+                json.dump(data, f, separators=(",", ":"))
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._interactions.values())
+
+    # ------------------------------------------------------------------- #
+    # Record / replay
+    # ------------------------------------------------------------------- #
+    def record(
+        self, request: PreparedRequest, response: Response, body: Optional[bytes] = None
+    ) -> None:
+        """stores a response for a request
+
+        Args:
+            request (PreparedRequest):
+            response (Response):
+            body (Optional[bytes], optional): decoded body of a streamed
+                response. Defaults to None, which reads response.content.
+        """
+        if body is None:
+            body = response.content
+        entry = {
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+            "body": base64.b64encode(body).decode("ascii"),
+        }
+        with self._lock:
+            self._interactions.setdefault(request_key(request), []).append(entry)
+
+    def play(self, request: PreparedRequest) -> Optional[Response]:
+        """returns the recorded response for a request, None if never recorded
+
+        Args:
+            request (PreparedRequest):
+
+        Returns:
+            Optional[Response]:
+        """
+        key = request_key(request)
+        with self._lock:
+            entries = self._interactions.get(key)
+            if not entries:
+                return None
+            index = self._played.get(key, 0)
+            self._played[key] = index + 1
+            entry = entries[min(index, len(entries) - 1)]
+
+        response = Response()
+        response.status_code = entry["status"]
+        response.reason = entry["reason"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = base64.b64decode(entry["body"])
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(0)
+        return response
+
+    # ------------------------------------------------------------------- #
+    # Session integration
+    # ------------------------------------------------------------------- #
+    def mount(self, session: Optional[Session] = None) -> None:
+        """routes every request of the session through the cassette
+
+        Args:
+            session (Optional[Session], optional): Defaults to the shared session.
+        """
+        session = session or get_session()
+        adapters = dict(session.adapters)
+        for prefix, adapter in adapters.items():
+            session.mount(prefix, CassetteAdapter(self, adapter))
+        self._mounted = (session, adapters)
+
+    def unmount(self) -> None:
+        """restores the session adapters and saves when recording.
+        adapters remounted since, e.g. by PooledSession.configure, are kept
+        """
+        if self._mounted is None:
+            return
+        session, adapters = self._mounted
+        for prefix, adapter in adapters.items():
+            current = session.adapters.get(prefix)
+            if isinstance(current, CassetteAdapter) and current.cassette is self:
+                session.mount(prefix, adapter)
+        self._mounted = None
+        atexit.unregister(self.save)
+        if self.mode is CassetteMode.RECORD:
+            self.save()
+
+
+class CassetteAdapter(BaseAdapter):
+    """transport adapter that records to or replays from a Cassette"""
+
+    def __init__(self, cassette: Cassette, inner: BaseAdapter):
+        super().__init__()
+        self.cassette = cassette
+        self.inner = inner
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        if self.cassette.mode is not CassetteMode.RECORD:
+            response = self.cassette.play(request)
+            if response is not None:
+                response.connection = self
+                return response
+            if self.cassette.mode is CassetteMode.STRICT:
+                raise CassetteMiss(
+                    f"no recorded response for {request_key(request)} "
+                    f"in {self.cassette.path}"
+                )
+
+        response = self.inner.send(request, **kwargs)
+        if self.cassette.mode is not CassetteMode.RECORD:
+            return response
+        if kwargs.get("stream") and hasattr(response.raw, "stream"):
+            # reading content here would load the whole body before the
+            # caller streams it, record it as the caller reads instead
+            response.raw = _RecordingRaw(
+                response.raw,
+                lambda body: self.cassette.record(request, response, body),
+            )
+        else:
+            self.cassette.record(request, response)
+        return response
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class _RecordingRaw:
+    """stands in for the raw body of a streamed response while recording.
+    the decoded chunks are kept as the caller reads them and recorded at
+    the end of the body. a response closed before its end is read to the
+    end first, so the cassette always holds the whole body.
+    """
+
+    def __init__(self, raw: Any, on_done: Callable[[bytes], None]):
+        self._raw = raw
+        self._on_done = on_done
+        self._chunks: List[bytes] = []
+        self._done = False
+
+    def stream(self, amt: int = 2**16, decode_content: Optional[bool] = None):
+        for chunk in self._raw.stream(amt, decode_content=True):
+            self._chunks.append(chunk)
+            yield chunk
+        self._finish()
+
+    def close(self) -> None:
+        if not self._done:
+            for chunk in self._raw.stream(2**16, decode_content=True):
+                self._chunks.append(chunk)
+            self._finish()
+        self._raw.close()
+
+    def _finish(self) -> None:
+        if not self._done:
+            self._done = True
+            self._on_done(b"".join(self._chunks))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._raw, name)
+
+
+@contextmanager
+def use_cassette(
+    path: str,
+    mode: CassetteMode = CassetteMode.REPLAY,
+    session: Optional[Session] = None,
+) -> Iterator[Cassette]:
+    """mounts a cassette for the duration of the block
+
+    Example:
+
+        with use_cassette("cassettes/users.json.gz", CassetteMode.STRICT):
+            Get(Users(base_url)).get()
+
+    Args:
+        path (str):
+        mode (CassetteMode, optional): Defaults to CassetteMode.REPLAY.
+        session (Optional[Session], optional): Defaults to the shared session.
+
+    Yields:
+        Cassette:
+    """
+    cassette = Cassette(path, mode)
+    cassette.mount(session)
+    try:
+        yield cassette
+    finally:
+        cassette.unmount()
+
+
+def mount_configured_cassette(session: Optional[Session] = None) -> Optional[Cassette]:
+    """mounts the cassette from ApiConfigs.cassette. a recording cassette
+    is saved when the process exits.
+
+    the cassette is kept on the session as ``session.cassette``. calling
+    this again unmounts it first; the same path and mode reuse it, so
+    interactions recorded so far aren't lost.
+
+    Args:
+        session (Optional[Session], optional): Defaults to the shared session.
+
+    Returns:
+        Optional[Cassette]: None when no cassette is configured
+    """
+    session = session or get_session()
+    previous: Optional[Cassette] = getattr(session, "cassette", None)
+    if previous is not None:
+        previous.unmount()
+        session.cassette = None
+    if ApiConfigs.cassette is None:
+        return None
+    path = ApiConfigs.cassette["path"]
+    mode = CassetteMode(ApiConfigs.cassette.get("mode", "replay"))
+    if previous is not None and (previous.path, previous.mode) == (path, mode):
+        cassette = previous
+    else:
+        cassette = Cassette(path, mode)
+    cassette.mount(session)
+    session.cassette = cassette
+    if mode is CassetteMode.RECORD:
+        atexit.register(cassette.save)
+    return cassette
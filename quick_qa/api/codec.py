@@ -0,0 +1,145 @@
+"""Module that holds json codecs and request body compression"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import zlib
+from typing import Any, Dict, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+ENCODINGS = ("gzip", "deflate")
+
+
+# --------------------------------------------------------------------------- #
+# Codecs
+# --------------------------------------------------------------------------- #
+class JsonCodec:
+    """stdlib json, compact output"""
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        """encodes obj as utf-8 json
+
+        Args:
+            obj (Any):
+
+        Returns:
+            bytes:
+        """
+        return json.dumps(obj, separators=(",", ":"), allow_nan=False).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """decodes json
+
+        Args:
+            data (Union[bytes, str]):
+
+        Returns:
+            Any:
+        """
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """orjson, falling back to stdlib json for what orjson rejects
+    (non string keys, integers over 64 bits)
+    """
+
+    name = "orjson"
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            return super().dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # stdlib accepts utf-16/32 bodies and raises the usual error otherwise
+            return super().loads(data)
+
+
+_codecs: Dict[str, JsonCodec] = {"json": JsonCodec()}
+if orjson is not None:
+    _codecs["orjson"] = OrjsonCodec()
+
+
+def get_codec(name: str = "auto") -> JsonCodec:
+    """returns a shared codec by name
+
+    Args:
+        name (str, optional): "json", "orjson" or "auto" for the fastest
+            installed one. Defaults to "auto".
+
+    Raises:
+        ValueError: unknown or not installed codec
+
+    Returns:
+        JsonCodec:
+    """
+    if name == "auto":
+        return _codecs.get("orjson", _codecs["json"])
+    try:
+        return _codecs[name]
+    except KeyError:
+        raise ValueError(
+            f"json codec {name!r} is not available, use one of {sorted(_codecs)}"
+        ) from None
+
+
+# --------------------------------------------------------------------------- #
+# Compression
+# --------------------------------------------------------------------------- #
+def compress(body: bytes, encoding: str, level: int = 6) -> bytes:
+    """compresses a request body
+
+    Args:
+        body (bytes):
+        encoding (str): "gzip" or "deflate"
+        level (int, optional): 1 (fast) - 9 (small). Defaults to 6.
+
+    Raises:
+        ValueError: unknown encoding
+
+    Returns:
+        bytes:
+    """
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    if encoding == "deflate":
+        return zlib.compress(body, level)
+    raise ValueError(f"unknown encoding {encoding!r}, use one of {list(ENCODINGS)}")
+
+
+def encode_json(
+    obj: Any,
+    codec: JsonCodec,
+    compression: Optional[str] = None,
+    min_size: int = 1024,
+) -> Tuple[bytes, Dict[str, str]]:
+    """encodes a json body and the headers describing it.
+    bodies smaller than min_size are sent uncompressed.
+
+    Args:
+        obj (Any):
+        codec (JsonCodec):
+        compression (Optional[str], optional): "gzip" or "deflate". Defaults to None.
+        min_size (int, optional): bytes before compressing. Defaults to 1024.
+
+    Returns:
+        Tuple[bytes, Dict[str, str]]: body and headers
+    """
+    body = codec.dumps(obj)
+    headers = {"Content-Type": "application/json"}
+    if compression is not None and len(body) >= min_size:
+        body = compress(body, compression)
+        headers["Content-Encoding"] = compression
+    return body, headers
@@ -1,2 +1,325 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional
+
+from quick_qa._lazy import logger
+from quick_qa._validators import is_url
+from quick_qa.configuration import ConfigType, Configuration
+
+
+# --------------------------------------------------------------------------- #
+# Helper functions
+# --------------------------------------------------------------------------- #
+def is_int_at_least(value: Any, minimum: int) -> bool:
+    """check if value is an int (not a bool) >= minimum
+
+    Args:
+        value (Any):
+        minimum (int):
+
+    Returns:
+        bool:
+    """
+    return isinstance(value, int) and not isinstance(value, bool) and value >= minimum
+
+
+def is_number_at_least(value: Any, minimum: float) -> bool:
+    """check if value is an int or float (not a bool) >= minimum
+
+    Args:
+        value (Any):
+        minimum (float):
+
+    Returns:
+        bool:
+    """
+    return (
+        isinstance(value, (int, float))
+        and not isinstance(value, bool)
+        and value >= minimum
+    )
+
+
+# --------------------------------------------------------------------------- #
+# Core configuration class
+# --------------------------------------------------------------------------- #
 class ApiConfigs:
-    base_url: str
+    """class for setting api configurations"""
+
+    base_url: Optional[str] = None
+    pool: Dict[str, Any] = {
+        "hosts": 10,
+        "maxsize": 10,
+        "block": False,
+        "keep_alive": True,
+        "prewarm": 0,
+    }
+    """Connection pool settings.
+
+    hosts: number of per-host pools to keep around
+    maxsize: connections kept alive per host
+    block: when True ``maxsize`` is a hard per-host limit and callers wait
+    keep_alive: when False every request asks the server to close the connection
+    prewarm: connections to open against ``base_url`` when the session is configured
+    """
+
+    cache: Dict[str, Any] = {"max_bytes": 64 * 1024 * 1024, "ttl": 60.0}
+    """Shared GET response cache settings.
+
+    max_bytes: size cap for cached responses
+    ttl: seconds a response is served without revalidating
+    """
+
+    probe_ttl: float = 300.0
+    """Seconds an OPTIONS probe is reused by ping and allowed_methods"""
+
+    cassette: Optional[Dict[str, str]] = None
+    """Record/replay cassette mounted by configure_session.
+
+    path: cassette file
+    mode: "record", "replay" or "strict"
+    """
+
+    metrics: Optional[Dict[str, str]] = None
+    """Files the request timing breakdown is written to when the run exits.
+
+    json: path for the json export
+    prometheus: path for the prometheus text export
+    """
+
+    codec: str = "auto"
+    """Json codec for request and response bodies: "json", "orjson", or
+    "auto" for orjson when it is installed. Endpoint classes can override it.
+    """
+
+    breaker: Dict[str, Any] = {
+        "threshold": 5,
+        "reset_timeout": 30.0,
+        "half_open_max": 1,
+        "statuses": [],
+    }
+    """Per host circuit breaker settings.
+
+    threshold: consecutive failures that open the circuit
+    reset_timeout: seconds an open circuit fails fast before probing
+    half_open_max: probe requests let through at once
+    statuses: response statuses counted as failures besides connection errors
+    """
+
+    retry: Dict[str, Any] = {
+        "attempts": 0,
+        "backoff": 0.1,
+        "max_backoff": 5.0,
+        "statuses": [502, 503, 504],
+        "methods": ["GET", "HEAD", "OPTIONS", "PUT", "DELETE"],
+    }
+    """Retry settings, off while attempts is 0.
+
+    attempts: retries after the first try
+    backoff: base seconds of the jittered exponential backoff
+    max_backoff: cap for a single wait
+    statuses: response statuses that are retried besides connection errors
+    methods: methods that are safe to retry
+    """
+
+    concurrency: int = 10
+    """Max in-flight requests started from async endpoints. Keep pool.maxsize
+    at least this high so concurrent calls don't discard connections.
+    """
+
+    # ------------------------------------------------------------------- #
+    # Public API
+    # ------------------------------------------------------------------- #
+    @classmethod
+    def set_values(cls) -> None:
+        """checks that data from yaml are valid values
+        then sets them to the class attributes
+        """
+        data = Configuration.get_config(ConfigType.API)
+        if data is None:
+            return
+
+        if not Configuration.is_validated(ConfigType.API):
+            ApiConfigs._validate_data(data=data)
+            Configuration.mark_validated(ConfigType.API)
+
+        cls._set_value("base_url", data.get("base_url"))
+        cls._set_value("concurrency", data.get("concurrency"))
+        cls._set_value("probe_ttl", data.get("probe_ttl"))
+        cls._set_value("cassette", data.get("cassette"))
+        cls._set_value("metrics", data.get("metrics"))
+        cls._set_value("codec", data.get("codec"))
+        for attr in ("breaker", "retry"):
+            if (settings := data.get(attr)) is not None:
+                settings = {**getattr(cls, attr), **settings}
+            cls._set_value(attr, settings)
+        if (pool := data.get("pool")) is not None:
+            pool = {**cls.pool, **pool}
+        cls._set_value("pool", pool)
+        if (cache := data.get("cache")) is not None:
+            cache = {**cls.cache, **cache}
+        cls._set_value("cache", cache)
+
+    # ------------------------------------------------------------------- #
+    # Internal helpers
+    # ------------------------------------------------------------------- #
+    @classmethod
+    def _set_value(cls, attr: str, value: Any) -> None:
+        """wraps setting a value for single logging method.
+
+        Args:
+            attr (str): name of attribute
+            value (Any): attribute value
+        """
+        if value is None:
+            logger.warning(f"configfile {attr} value was None. keeping default")
+            return
+        setattr(cls, attr, value)
+
+    @staticmethod
+    def _validate_data(data: Mapping[str, Any]) -> None:
+        """validates data for configurations
+
+        Args:
+            data (Mapping[str, Any]):
+
+        Raises:
+            ValueError: invalid url
+            ValueError: concurrency is not a positive int
+            ValueError: probe_ttl is not a number >= 0
+            ValueError: pool is not a mapping
+            ValueError: unexpected pool keys
+            ValueError: pool sizes are not positive ints
+            ValueError: pool flags are not bools
+            ValueError: cache is not a mapping
+            ValueError: unexpected cache keys
+            ValueError: cache values out of range
+            ValueError: cassette has no path or an unknown mode
+            ValueError: metrics has unknown keys or non string paths
+            ValueError: unknown codec
+            ValueError: breaker or retry is not a mapping or has unexpected keys
+            ValueError: breaker or retry values out of range
+        """
+        # ---- base_url ----------------------------------------------------
+        if (url := data.get("base_url")) is not None:
+            if not isinstance(url, str) or not is_url(url):
+                raise ValueError("`base_url` must be a well-formed URL")
+
+        # ---- concurrency -------------------------------------------------
+        if (concurrency := data.get("concurrency")) is not None:
+            if not is_int_at_least(concurrency, 1):
+                raise ValueError("`concurrency` must be a positive int")
+
+        # ---- probe_ttl ---------------------------------------------------
+        if (probe_ttl := data.get("probe_ttl")) is not None:
+            if not is_number_at_least(probe_ttl, 0):
+                raise ValueError("`probe_ttl` must be a number >= 0")
+
+        # ---- pool --------------------------------------------------------
+        if (pool := data.get("pool")) is not None:
+            allowed_keys = set(ApiConfigs.pool)
+            if not isinstance(pool, Mapping):
+                raise ValueError("`pool` must be a mapping of pool settings")
+            unknown = set(pool) - allowed_keys
+            if unknown:
+                raise ValueError(
+                    f"`pool` contains unexpected keys: {sorted(unknown)}; "
+                    f"allowed keys are {sorted(allowed_keys)}"
+                )
+
+            for key in ("hosts", "maxsize"):
+                value = pool.get(key)
+                if value is not None and not is_int_at_least(value, 1):
+                    raise ValueError(f"`pool.{key}` must be a positive int")
+
+            prewarm = pool.get("prewarm")
+            if prewarm is not None and not is_int_at_least(prewarm, 0):
+                raise ValueError("`pool.prewarm` must be an int >= 0")
+
+            for key in ("block", "keep_alive"):
+                value = pool.get(key)
+                if value is not None and not isinstance(value, bool):
+                    raise ValueError(f"`pool.{key}` must be a bool")
+
+        # ---- cache -------------------------------------------------------
+        if (cache := data.get("cache")) is not None:
+            allowed_keys = set(ApiConfigs.cache)
+            if not isinstance(cache, Mapping):
+                raise ValueError("`cache` must be a mapping of cache settings")
+            unknown = set(cache) - allowed_keys
+            if unknown:
+                raise ValueError(
+                    f"`cache` contains unexpected keys: {sorted(unknown)}; "
+                    f"allowed keys are {sorted(allowed_keys)}"
+                )
+            max_bytes = cache.get("max_bytes")
+            if max_bytes is not None and not is_int_at_least(max_bytes, 1):
+                raise ValueError("`cache.max_bytes` must be a positive int")
+            ttl = cache.get("ttl")
+            if ttl is not None and not is_number_at_least(ttl, 0):
+                raise ValueError("`cache.ttl` must be a number >= 0")
+
+        # ---- cassette ----------------------------------------------------
+        if (cassette := data.get("cassette")) is not None:
+            modes = {"record", "replay", "strict"}
+            if not isinstance(cassette, Mapping) or not isinstance(
+                cassette.get("path"), str
+            ):
+                raise ValueError("`cassette` must be a mapping with a `path`")
+            if set(cassette) - {"path", "mode"}:
+                raise ValueError("`cassette` only accepts `path` and `mode`")
+            if cassette.get("mode", "replay") not in modes:
+                raise ValueError(f"`cassette.mode` must be one of {sorted(modes)}")
+
+        # ---- metrics -----------------------------------------------------
+        if (metrics := data.get("metrics")) is not None:
+            allowed_keys = {"json", "prometheus"}
+            if not isinstance(metrics, Mapping) or set(metrics) - allowed_keys:
+                raise ValueError(
+                    f"`metrics` must be a mapping with keys {sorted(allowed_keys)}"
+                )
+            if not all(isinstance(path, str) for path in metrics.values()):
+                raise ValueError("`metrics` paths must be strings")
+
+        # ---- codec -------------------------------------------------------
+        if (codec := data.get("codec")) is not None:
+            codecs = {"auto", "json", "orjson"}
+            if codec not in codecs:
+                raise ValueError(f"`codec` must be one of {sorted(codecs)}")
+
+        # ---- breaker / retry ---------------------------------------------
+        for attr in ("breaker", "retry"):
+            if (settings := data.get(attr)) is None:
+                continue
+            allowed_keys = set(getattr(ApiConfigs, attr))
+            if not isinstance(settings, Mapping):
+                raise ValueError(f"`{attr}` must be a mapping of {attr} settings")
+            unknown = set(settings) - allowed_keys
+            if unknown:
+                raise ValueError(
+                    f"`{attr}` contains unexpected keys: {sorted(unknown)}; "
+                    f"allowed keys are {sorted(allowed_keys)}"
+                )
+            for key, minimum in (
+                ("threshold", 1),
+                ("half_open_max", 1),
+                ("attempts", 0),
+            ):
+                value = settings.get(key)
+                if value is not None and not is_int_at_least(value, minimum):
+                    raise ValueError(f"`{attr}.{key}` must be an int >= {minimum}")
+            for key in ("reset_timeout", "backoff", "max_backoff"):
+                value = settings.get(key)
+                if value is not None and not is_number_at_least(value, 0):
+                    raise ValueError(f"`{attr}.{key}` must be a number >= 0")
+            statuses = settings.get("statuses")
+            if statuses is not None and not (
+                isinstance(statuses, list)
+                and all(is_int_at_least(s, 100) for s in statuses)
+            ):
+                raise ValueError(f"`{attr}.statuses` must be a list of status codes")
+            methods = settings.get("methods")
+            if methods is not None and not (
+                isinstance(methods, list) and all(isinstance(m, str) for m in methods)
+            ):
+                raise ValueError(f"`{attr}.methods` must be a list of method names")
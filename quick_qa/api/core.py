@@ -2,17 +2,43 @@
 
 from __future__ import annotations
 
-from typing import Union
+import re
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Tuple, Union
 
-import jsonschema
-import requests
 from requests import Response, Session
 
+from quick_qa.api.cache import ResponseCache
+from quick_qa.api.codec import JsonCodec, get_codec
+from quick_qa.api.configs import ApiConfigs
+from quick_qa.api.probe import ProbeResult, get_probe_cache
+from quick_qa.api.session import get_session
+
+# jsonschema is imported by the first validation, not with the endpoints
+if TYPE_CHECKING:
+    from quick_qa.api.bulk import ItemResult
+    from quick_qa.api.schema import CompiledSchema
+
+
+class _class_or_instance_method(classmethod):
+    """classmethod that binds to the instance when called on one, so
+    instance attributes shadowing class attributes are seen
+    """
+
+    def __get__(self, obj, objtype=None):
+        return self.__func__.__get__(objtype if obj is None else obj, objtype)
+
+
+_SCHEMA_CACHE_SIZE = 256
+_compiled_schemas: "OrderedDict[Tuple[int, bool], CompiledSchema]" = OrderedDict()
+_compiled_lock = threading.Lock()
+
 
 class BaseEndpoint:
     """Class that holds functionality for working with endpoints"""
 
-    _session: Session = Session()  # shared connection pool
+    _session: Session = get_session()  # shared connection pool
 
     path_url: Union[str, None] = None
 
@@ -32,6 +58,30 @@ class BaseEndpoint:
     } 
     """
 
+    fast_schema: bool = False
+    """Generate specialized python checks for expected_schema.
+    Schemas using unsupported keywords fall back to jsonschema.
+    """
+
+    response_cache: Optional[ResponseCache] = None
+    """Opt in to caching Get.get responses, e.g. ``response_cache = get_cache()``"""
+
+    json_codec: Optional[str] = None
+    """Codec for json bodies: "json", "orjson" or "auto". Defaults to ApiConfigs.codec"""
+
+    compression: Optional[str] = None
+    """Compress json request bodies with "gzip" or "deflate". the server has
+    to accept a Content-Encoding on requests.
+    """
+
+    compress_min_size: int = 1024
+    """Bytes a json request body needs before it is compressed"""
+
+    accept_encoding: Optional[str] = None
+    """Accept-Encoding header sent with every verb, e.g. "gzip". Defaults to
+    what requests advertises (gzip, deflate and br/zstd when installed).
+    """
+
     def __init__(self, base_url: str):
         self.base_url = base_url
         if self.path_url is None:
@@ -49,10 +99,138 @@ class BaseEndpoint:
             Exception: if validation raises an error the error is caught and passed as a return
         """
         try:
-            jsonschema.validate(instance=response.json(), schema=self.expected_schema)
-            return True
+            return self.compiled_schema().validate(self.decode(response))
+        except Exception as e:
+            return e
+
+    def valid_schema_bulk(
+        self,
+        responses: Iterable[Response],
+        workers: Optional[int] = None,
+        max_errors: int = 1,
+    ) -> List[ItemResult]:
+        """Validates many responses on a process pool, for batches too large
+        for valid_schema on one core. bodies are decoded on the workers too.
+
+        Args:
+            responses (Iterable[Response]): or raw json bytes
+            workers (Optional[int], optional): processes. Defaults to os.cpu_count().
+            max_errors (int, optional): errors kept per response. Defaults to 1.
+
+        Returns:
+            List[ItemResult]: one per response, in input order
+        """
+        from quick_qa.api.bulk import validate_bulk
+
+        return validate_bulk(
+            self.expected_schema,
+            responses,
+            workers=workers,
+            fast=self.fast_schema,
+            codec=self.json_codec or ApiConfigs.codec,
+            max_errors=max_errors,
+        )
+
+    def decode(self, response: Response) -> Any:
+        """returns the json body decoded with the class codec
+
+        Args:
+            response (Response):
+
+        Returns:
+            Any:
+        """
+        return self.codec().loads(response.content)
+
+    def valid_schema_stream(
+        self, response: Response, max_errors: int = 1, chunk_size: int = 64 * 1024
+    ) -> Union[bool, Exception]:
+        """Validates a json array body item by item as it downloads, so peak
+        memory doesn't depend on the payload size. request the response with
+        ``stream=True`` (e.g. ``Get.get(stream=True)``) for the body to be
+        read lazily. the response is closed afterwards.
+
+        Args:
+            response (Response): enter a Response Object
+            max_errors (int, optional): stop after this many errors. Defaults to 1.
+            chunk_size (int, optional): bytes read per chunk. Defaults to 64 KiB.
+
+        Returns:
+            bool: True when every item is valid
+            Exception: StreamValidationError with the collected errors, or the
+                error raised while reading/parsing
+        """
+        from quick_qa.api.streaming import validate_stream
+
+        try:
+            return validate_stream(
+                response.iter_content(chunk_size=chunk_size),
+                self.compiled_schema(),
+                max_errors=max_errors,
+            )
         except Exception as e:
             return e
+        finally:
+            response.close()
+
+    @_class_or_instance_method
+    def compiled_schema(owner) -> CompiledSchema:
+        """returns the validator for expected_schema. called on an instance,
+        an expected_schema or fast_schema assigned to the instance is used.
+        validators are cached by schema object, so one is built per schema
+        and a new one when expected_schema or fast_schema is reassigned.
+
+        Raises:
+            SchemaError: if expected_schema is invalid
+
+        Returns:
+            CompiledSchema:
+        """
+        from quick_qa.api.schema import CompiledSchema
+
+        schema, fast = owner.expected_schema, owner.fast_schema
+        key = (id(schema), fast)
+        with _compiled_lock:
+            compiled = _compiled_schemas.get(key)
+            # the cached validator holds on to its schema, so a matching
+            # object means the id wasn't reused
+            if compiled is not None and compiled.schema is schema:
+                _compiled_schemas.move_to_end(key)
+                return compiled
+        compiled = CompiledSchema(schema, fast=fast)
+        with _compiled_lock:
+            _compiled_schemas[key] = compiled
+            if len(_compiled_schemas) > _SCHEMA_CACHE_SIZE:
+                _compiled_schemas.popitem(last=False)
+        return compiled
+
+    @_class_or_instance_method
+    def codec(owner) -> JsonCodec:
+        """returns the codec for json_codec, or ApiConfigs.codec when unset.
+        called on an instance, a json_codec assigned to the instance is used
+
+        Returns:
+            JsonCodec:
+        """
+        return get_codec(owner.json_codec or ApiConfigs.codec)
+
+    @_class_or_instance_method
+    def invalidate_schema(owner) -> None:
+        """drops the cached validator. needed after mutating expected_schema in place"""
+        with _compiled_lock:
+            _compiled_schemas.pop((id(owner.expected_schema), owner.fast_schema), None)
+
+    def probe(self, refresh: bool = False) -> ProbeResult:
+        """returns the cached OPTIONS result for this endpoint.
+        one call is made per endpoint_url until ApiConfigs.probe_ttl passes.
+
+        Args:
+            refresh (bool, optional): send a new OPTIONS call. Defaults to False.
+
+        Returns:
+            ProbeResult:
+        """
+        return get_probe_cache().probe(self._session, self.endpoint_url, refresh)
 
     def ping(self) -> bool:
         """runs an options call and checks for 200
@@ -61,8 +239,7 @@ class BaseEndpoint:
             bool: True if 200 status code
         """
         acceptable_status_codes = [200, 204]
-        res = requests.options(self.endpoint_url)
-        return res.status_code in acceptable_status_codes
+        return self.probe().status_code in acceptable_status_codes
 
     def allowed_methods(self) -> Union[list, None]:
         """returns a list of allowed mehods unless the api.
@@ -71,9 +248,7 @@ class BaseEndpoint:
         Returns:
             Union[list, None]
         """
-        res = requests.options(self.endpoint_url)
-        headers = res.headers
-        allowed_string = headers.get("Allow")
+        allowed_string = self.probe().allow
         if allowed_string:
-            return allowed_string.split()
+            return re.split(r"[,\s]+", allowed_string.strip(", "))
         return None
@@ -0,0 +1,395 @@
+"""Module that holds a schema driven local stand-in server for endpoints"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import string
+import threading
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set, Tuple, Union
+
+from quick_qa.api.schema import CompiledSchema
+
+Latency = Union[float, Tuple[float, float]]
+
+_REASONS = {
+    200: "OK",
+    201: "Created",
+    204: "No Content",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+}
+
+_FORMATS = {
+    "date-time": lambda rng: datetime.fromtimestamp(
+        rng.randint(0, 2_000_000_000), tz=timezone.utc
+    ).isoformat(),
+    "date": lambda rng: datetime.fromtimestamp(
+        rng.randint(0, 2_000_000_000), tz=timezone.utc
+    )
+    .date()
+    .isoformat(),
+    "email": lambda rng: f"{_word(rng, 8)}@example.com",
+    "uri": lambda rng: f"https://example.com/{_word(rng, 8)}",
+    "uuid": lambda rng: str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+}
+
+
+# --------------------------------------------------------------------------- #
+# Synthetic data
+# --------------------------------------------------------------------------- #
+def _word(rng: random.Random, length: int) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=length))
+
+
+def _resolve(ref: str, root: Any) -> Any:
+    if not ref.startswith("#"):
+        raise ValueError(f"only local $refs are supported: {ref}")
+    node = root
+    for part in ref.lstrip("#/").split("/") if ref != "#" else []:
+        node = node[part.replace("~1", "/").replace("~0", "~")]
+    return node
+
+
+def _infer_type(schema: dict) -> str:
+    if "properties" in schema or "required" in schema:
+        return "object"
+    if "items" in schema or "minItems" in schema:
+        return "array"
+    if "minimum" in schema or "maximum" in schema:
+        return "number"
+    if "minLength" in schema or "format" in schema or "pattern" in schema:
+        return "string"
+    return "null"
+
+
+def fake_instance(
+    schema: Union[dict, bool],
+    rng: Optional[random.Random] = None,
+    array_size: int = 3,
+    root: Any = None,
+) -> Any:
+    """builds an instance that should satisfy the schema.
+
+    covers the common keywords (types, properties, items, enum, const,
+    bounds, lengths, formats, local $ref, allOf/anyOf/oneOf). callers
+    should validate the result, see FakeServer.register.
+
+    Args:
+        schema (Union[dict, bool]):
+        rng (Optional[random.Random], optional): Defaults to Random(0).
+        array_size (int, optional): items per array, within minItems/maxItems. Defaults to 3.
+
+    Returns:
+        Any:
+    """
+    rng = rng or random.Random(0)
+    root = schema if root is None else root
+    if schema is True:
+        return None
+    if schema is False:
+        raise ValueError("no instance satisfies a false schema")
+
+    if "$ref" in schema:
+        return fake_instance(_resolve(schema["$ref"], root), rng, array_size, root)
+    if "const" in schema:
+        return schema["const"]
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    if "allOf" in schema:
+        merged = {k: v for k, v in schema.items() if k != "allOf"}
+        for part in schema["allOf"]:
+            part = _resolve(part["$ref"], root) if "$ref" in part else part
+            for key, value in part.items():
+                if isinstance(value, dict) and isinstance(merged.get(key), dict):
+                    merged[key] = {**merged[key], **value}
+                elif isinstance(value, list) and isinstance(merged.get(key), list):
+                    merged[key] = merged[key] + value
+                else:
+                    merged[key] = value
+        return fake_instance(merged, rng, array_size, root)
+    for keyword in ("anyOf", "oneOf"):
+        if keyword in schema:
+            return fake_instance(schema[keyword][0], rng, array_size, root)
+
+    types = schema.get("type", _infer_type(schema))
+    if isinstance(types, list):
+        types = next((t for t in types if t != "null"), "null")
+
+    if types == "object":
+        return {
+            key: fake_instance(sub, rng, array_size, root)
+            for key, sub in schema.get("properties", {}).items()
+        } | {
+            key: None
+            for key in schema.get("required", [])
+            if key not in schema.get("properties", {})
+        }
+    if types == "array":
+        low = schema.get("minItems", 0)
+        high = schema.get("maxItems", max(low, array_size))
+        count = min(max(array_size, low), high)
+        items = schema.get("items", True)
+        return [fake_instance(items, rng, array_size, root) for _ in range(count)]
+    if types == "string":
+        if schema.get("format") in _FORMATS:
+            return _FORMATS[schema["format"]](rng)
+        low = schema.get("minLength", 1)
+        high = schema.get("maxLength", max(low, 12))
+        return _word(rng, rng.randint(low, max(low, min(high, low + 12))))
+    if types in ("integer", "number"):
+        low = schema.get("minimum", schema.get("exclusiveMinimum", -1) + 1)
+        high = schema.get("maximum", schema.get("exclusiveMaximum", low + 1001) - 1)
+        value = rng.randint(int(low), max(int(low), int(high)))
+        if multiple := schema.get("multipleOf"):
+            value = int(value // multiple * multiple)
+        return value if types == "integer" else float(value)
+    if types == "boolean":
+        return rng.random() < 0.5
+    return None
+
+
+# --------------------------------------------------------------------------- #
+# Server
+# --------------------------------------------------------------------------- #
+@dataclass
+class _Route:
+    methods: Tuple[str, ...]
+    body: bytes
+    status: int
+    latency: Optional[Latency]
+    error_rate: Optional[float]
+
+
+def _response(status: int, body: bytes = b"", headers: Optional[dict] = None) -> bytes:
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}"]
+    headers = {"Content-Length": str(len(body)), **(headers or {})}
+    if body:
+        headers.setdefault("Content-Type", "application/json")
+    lines.extend(f"{k}: {v}" for k, v in headers.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+class FakeServer:
+    """in-process HTTP/1.1 stand-in that serves schema conforming bodies
+    for registered endpoint classes at their path_url.
+
+    runs an asyncio server on a background thread with keep-alive, so it
+    can serve many concurrent clients without a thread per connection.
+    response bodies are generated and encoded once at registration.
+
+    Example:
+
+        with FakeServer(latency=0.01, error_rate=0.05) as server:
+            server.register(Users)
+            Get(Users(server.base_url)).get()
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Latency = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        seed: int = 0,
+        array_size: int = 3,
+    ):
+        """
+        Args:
+            host (str, optional): Defaults to "127.0.0.1".
+            port (int, optional): 0 picks a free port. Defaults to 0.
+            latency (Latency, optional): seconds, or a (min, max) range, added
+                before every response. Defaults to 0.0.
+            error_rate (float, optional): fraction of requests answered with
+                error_status. Defaults to 0.0.
+            error_status (int, optional): Defaults to 500.
+            seed (int, optional): seeds data generation and error injection. Defaults to 0.
+            array_size (int, optional): items in generated arrays. Defaults to 3.
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.array_size = array_size
+        self.requests: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._routes: Dict[str, _Route] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    # ------------------------------------------------------------------- #
+    # Public API
+    # ------------------------------------------------------------------- #
+    def register(
+        self,
+        endpoint_cls: type,
+        body: Any = None,
+        status: int = 200,
+        methods: Tuple[str, ...] = ("GET", "POST", "PUT", "DELETE"),
+        latency: Optional[Latency] = None,
+        error_rate: Optional[float] = None,
+    ) -> Any:
+        """serves an endpoint class at its path_url
+
+        Args:
+            endpoint_cls (type): BaseEndpoint subclass
+            body (Any, optional): json body to serve. Defaults to an instance
+                generated from expected_schema.
+            status (int, optional): Defaults to 200.
+            methods (Tuple[str, ...], optional): allowed methods, OPTIONS is always answered.
+            latency (Optional[Latency], optional): overrides the server latency.
+            error_rate (Optional[float], optional): overrides the server error rate.
+
+        Raises:
+            ValueError: the generated body doesn't match expected_schema,
+                pass ``body`` explicitly for such schemas
+
+        Returns:
+            Any: the body being served
+        """
+        if body is None:
+            schema = endpoint_cls.expected_schema
+            body = fake_instance(schema, self._rng, self.array_size)
+            error = CompiledSchema(schema).validate(body)
+            if error is not True:
+                raise ValueError(
+                    f"could not generate a body for {endpoint_cls.__name__}, "
+                    f"pass body explicitly: {error.message}"
+                )
+        self._routes[endpoint_cls.path_url] = _Route(
+            methods=tuple(m.upper() for m in methods),
+            body=json.dumps(body).encode(),
+            status=status,
+            latency=latency,
+            error_rate=error_rate,
+        )
+        return body
+
+    def start(self) -> str:
+        """starts serving on a background thread
+
+        Returns:
+            str: base url to build endpoints with
+        """
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        self._stopped = asyncio.Event()
+
+        def run() -> None:
+            self._loop.run_until_complete(self._serve(ready))
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="quick_qa_fake", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self.base_url
+
+    def stop(self) -> None:
+        """stops the server and waits for the thread"""
+        if self._loop is None or self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._stopped.set)
+        self._thread.join()
+        self._loop = self._thread = None
+
+    def __enter__(self) -> FakeServer:
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------------- #
+    # Internal helpers
+    # ------------------------------------------------------------------- #
+    def _delay(self, route: _Route) -> float:
+        latency = self.latency if route.latency is None else route.latency
+        if isinstance(latency, tuple):
+            return self._rng.uniform(*latency)
+        return latency
+
+    async def _serve(self, ready: threading.Event) -> None:
+        server = await asyncio.start_server(
+            self._handle, self.host, self.port, backlog=1024
+        )
+        self.port = server.sockets[0].getsockname()[1]
+        ready.set()
+        async with server:
+            await self._stopped.wait()
+        # keep-alive connections are still parked in their handlers, closing
+        # them lets each handler see EOF and return
+        for writer in list(self._writers):
+            writer.close()
+        await asyncio.gather(
+            *(asyncio.all_tasks() - {asyncio.current_task()}), return_exceptions=True
+        )
+
+    async def _respond(self, method: str, path: str) -> bytes:
+        route = self._routes.get(path)
+        if route is None:
+            return _response(404)
+        allow = ", ".join(("OPTIONS",) + route.methods)
+        if method == "OPTIONS":
+            return _response(204, headers={"Allow": allow})
+        if method not in route.methods:
+            return _response(405, headers={"Allow": allow})
+
+        if delay := self._delay(route):
+            await asyncio.sleep(delay)
+        error_rate = self.error_rate if route.error_rate is None else route.error_rate
+        if error_rate and self._rng.random() < error_rate:
+            return _response(self.error_status, b'{"error": "injected"}')
+        if method == "DELETE":
+            return _response(204)
+        return _response(route.status, route.body)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._writers.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, target, version = line.decode("latin-1").split()
+                headers = {}
+                while (header := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = header.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                if "chunked" in headers.get("transfer-encoding", ""):
+                    writer.write(_response(411, headers={"Connection": "close"}))
+                    break
+                if length := int(headers.get("content-length", 0)):
+                    await reader.readexactly(length)
+
+                path = target.split("?", 1)[0]
+                self.requests[path] += 1
+                writer.write(await self._respond(method, path))
+                await writer.drain()
+                if version != "HTTP/1.1" or headers.get("connection") == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
@@ -0,0 +1,296 @@
+"""Module that holds the load generation mode for endpoints"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
+
+from requests import Response
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+# --------------------------------------------------------------------------- #
+# Histogram
+# --------------------------------------------------------------------------- #
+class LatencyHistogram:
+    """HDR style histogram of latencies.
+
+    values are stored in microseconds in log-linear buckets, so any
+    recorded value is reported within ``10 ** -digits`` relative error
+    while memory only grows with the spread of values, not their count.
+    """
+
+    def __init__(self, digits: int = 3):
+        """
+        Args:
+            digits (int, optional): significant decimal digits kept. Defaults to 3.
+        """
+        self.digits = digits
+        self._sub_bits = math.ceil(math.log2(2 * 10**digits))
+        self._counts: Counter = Counter()
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def _bucket(self, value: int) -> int:
+        """lowest value sharing a bucket with value"""
+        shift = max(0, value.bit_length() - self._sub_bits)
+        return (value >> shift) << shift
+
+    def record(self, seconds: float) -> None:
+        """adds a latency
+
+        Args:
+            seconds (float):
+        """
+        value = max(0, int(seconds * 1_000_000))
+        self._counts[self._bucket(value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: LatencyHistogram) -> None:
+        """adds every value recorded in other
+
+        Args:
+            other (LatencyHistogram):
+        """
+        self._counts.update(other._counts)
+        self.count += other.count
+        self.total += other.total
+        for attr, pick in (("min", min), ("max", max)):
+            theirs = getattr(other, attr)
+            if theirs is not None:
+                ours = getattr(self, attr)
+                setattr(self, attr, theirs if ours is None else pick(ours, theirs))
+
+    def percentile(self, percent: float) -> float:
+        """returns the latency in seconds at or below which ``percent`` of
+        values fall
+
+        Args:
+            percent (float): 0 - 100
+
+        Returns:
+            float: 0.0 when nothing was recorded
+        """
+        if self.count == 0:
+            return 0.0
+        target = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for bucket in sorted(self._counts):
+            seen += self._counts[bucket]
+            if seen >= target:
+                return bucket / 1_000_000
+        return self.max / 1_000_000
+
+    def mean(self) -> float:
+        """mean latency in seconds"""
+        return self.total / self.count / 1_000_000 if self.count else 0.0
+
+
+# --------------------------------------------------------------------------- #
+# Report
+# --------------------------------------------------------------------------- #
+@dataclass
+class LoadReport:
+    """results of a load run"""
+
+    duration: float
+    latency: LatencyHistogram
+    errors: int = 0
+    status_codes: Dict[int, int] = field(default_factory=dict)
+    sampled: int = 0
+    invalid: int = 0
+
+    @property
+    def requests(self) -> int:
+        return self.latency.count
+
+    @property
+    def throughput(self) -> float:
+        """completed requests per second"""
+        return self.requests / self.duration if self.duration else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """returns the report as json compatible data, latencies in ms
+
+        Returns:
+            Dict[str, Any]:
+        """
+
+        def ms(seconds: float) -> float:
+            return round(seconds * 1000, 3)
+
+        latency = {f"p{p:g}": ms(self.latency.percentile(p)) for p in PERCENTILES}
+        latency["min"] = ms((self.latency.min or 0) / 1_000_000)
+        latency["max"] = ms((self.latency.max or 0) / 1_000_000)
+        latency["mean"] = ms(self.latency.mean())
+        return {
+            "duration_s": round(self.duration, 3),
+            "requests": self.requests,
+            "throughput_rps": round(self.throughput, 2),
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 4),
+            "status_codes": {str(k): v for k, v in sorted(self.status_codes.items())},
+            "latency_ms": latency,
+            "schema": {"sampled": self.sampled, "invalid": self.invalid},
+        }
+
+    def to_json(self, **kwargs) -> str:
+        """returns the report as a json string
+
+        Returns:
+            str:
+        """
+        return json.dumps(self.as_dict(), **kwargs)
+
+
+# --------------------------------------------------------------------------- #
+# Runner
+# --------------------------------------------------------------------------- #
+Payload = Union[Mapping[str, Any], Callable[[int], Mapping[str, Any]], None]
+
+
+class _Worker:
+    """per thread results, merged once the run is over"""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.status_codes: Counter = Counter()
+        self.sampled = 0
+        self.invalid = 0
+
+
+class LoadRunner:
+    """drives a verb at a target rate or concurrency for a fixed duration.
+
+    with ``rate`` set, calls are scheduled at fixed intervals (open model)
+    and latency is measured from the scheduled start, so time spent queued
+    behind slow calls is included. without it every worker calls back to
+    back (closed model).
+    """
+
+    def __init__(
+        self,
+        call: Callable[..., Response],
+        duration: float,
+        concurrency: int,
+        rate: Optional[float] = None,
+        payload: Payload = None,
+        validator: Optional[Callable[[Response], Union[bool, Exception]]] = None,
+        validate_sample: float = 0.0,
+    ):
+        """
+        Args:
+            call (Callable[..., Response]): verb to call, e.g. a Get.get bound method
+            duration (float): seconds to generate load for
+            concurrency (int): worker threads
+            rate (Optional[float], optional): target requests per second. Defaults to None.
+            payload (Payload, optional): keyword arguments for every call, or a
+                callable building them from the request number. Defaults to None.
+            validator (Optional[Callable], optional): usually valid_schema. Defaults to None.
+            validate_sample (float, optional): fraction of responses to validate. Defaults to 0.0.
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive")
+        self.call = call
+        self.duration = duration
+        self.concurrency = concurrency
+        self.rate = rate
+        self.payload = payload
+        self.validator = validator
+        self.validate_sample = validate_sample if validator else 0.0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def _kwargs(self, number: int) -> Mapping[str, Any]:
+        if self.payload is None:
+            return {}
+        if callable(self.payload):
+            return self.payload(number)
+        return self.payload
+
+    def _take(self) -> int:
+        with self._lock:
+            number = self._next
+            self._next += 1
+            return number
+
+    def _work(self, start: float, deadline: float) -> _Worker:
+        worker = _Worker()
+        while True:
+            number = self._take()
+            if self.rate is None:
+                began = time.perf_counter()
+                if began >= deadline:
+                    return worker
+            else:
+                began = start + number / self.rate
+                if began >= deadline:
+                    return worker
+                delay = began - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+            try:
+                response = self.call(**self._kwargs(number))
+            except Exception:
+                worker.latency.record(time.perf_counter() - began)
+                worker.errors += 1
+                continue
+            worker.latency.record(time.perf_counter() - began)
+            worker.status_codes[response.status_code] += 1
+            if not response.ok:
+                worker.errors += 1
+
+            if self.validate_sample and random.random() < self.validate_sample:
+                worker.sampled += 1
+                if self.validator(response) is not True:
+                    worker.invalid += 1
+
+    def run(self) -> LoadReport:
+        """generates load until the duration passes
+
+        Returns:
+            LoadReport:
+        """
+        self._next = 0
+        start = time.perf_counter()
+        deadline = start + self.duration
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="quick_qa_load"
+        ) as executor:
+            futures = [
+                executor.submit(copy_context().run, self._work, start, deadline)
+                for _ in range(self.concurrency)
+            ]
+            workers: List[_Worker] = [f.result() for f in futures]
+        elapsed = time.perf_counter() - start
+
+        report = LoadReport(duration=elapsed, latency=LatencyHistogram())
+        codes: Counter = Counter()
+        for worker in workers:
+            report.latency.merge(worker.latency)
+            report.errors += worker.errors
+            report.sampled += worker.sampled
+            report.invalid += worker.invalid
+            codes.update(worker.status_codes)
+        report.status_codes = dict(codes)
+        return report
@@ -1,9 +1,15 @@
-from typing import Optional
+import inspect
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Optional
 
-import requests
 from requests import Response
 
+from quick_qa.api.batch import BatchResult, run_batch
+from quick_qa.api.codec import encode_json
+from quick_qa.api.configs import ApiConfigs
 from quick_qa.api.core import BaseEndpoint
+from quick_qa.api.load import LoadReport, LoadRunner, Payload
+from quick_qa.api.pagination import PageError, Paginator, iter_pages
+from quick_qa.api.timing import TimedRaw, get_recorder
 
 
 class BaseEndpointContainer:
@@ -11,49 +17,284 @@ class BaseEndpointContainer:
 
     def __init__(self, base_endpoint: BaseEndpoint):
         self.endpoint_url = base_endpoint.endpoint_url
+        self._session = base_endpoint._session
+        self._base_endpoint = base_endpoint
+
+    def batch(
+        self,
+        method: str,
+        payloads: Iterable[Mapping[str, Any]],
+        workers: Optional[int] = None,
+        validate: bool = False,
+    ) -> Iterator[BatchResult]:
+        """runs one verb for many payloads concurrently.
+
+        Example:
+
+            get = Get(users)
+            for result in get.batch("get", ({"params": {"id": i}} for i in ids)):
+                assert result.ok
+
+        Args:
+            method (str): name of the verb method, e.g. "get"
+            payloads (Iterable[Mapping[str, Any]]): keyword arguments for each call
+            workers (Optional[int], optional): Defaults to ApiConfigs.concurrency.
+            validate (bool, optional): run valid_schema on the worker. Defaults to False.
+
+        Returns:
+            Iterator[BatchResult]: results in input order, streamed as they finish
+        """
+        return run_batch(
+            call=self._verb(method),
+            payloads=payloads,
+            workers=workers or ApiConfigs.concurrency,
+            validator=self._base_endpoint.valid_schema if validate else None,
+        )
+
+    def load(
+        self,
+        method: str,
+        duration: float,
+        rate: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        payload: Payload = None,
+        validate_sample: float = 0.0,
+    ) -> LoadReport:
+        """drives one verb at a target rate or concurrency for a fixed duration.
+
+        Example:
+
+            report = Get(users).load("get", duration=30, rate=200)
+            print(report.to_json())
+
+        Args:
+            method (str): name of the verb method, e.g. "get"
+            duration (float): seconds to generate load for
+            rate (Optional[float], optional): requests per second. Defaults to None,
+                which calls as fast as ``concurrency`` workers allow.
+            concurrency (Optional[int], optional): Defaults to ApiConfigs.concurrency.
+            payload (Payload, optional): keyword arguments for the verb, or a
+                callable returning them for the n-th request. Defaults to None.
+            validate_sample (float, optional): fraction of responses checked
+                with valid_schema. Defaults to 0.0.
+
+        Returns:
+            LoadReport:
+        """
+        return LoadRunner(
+            call=self._verb(method),
+            duration=duration,
+            concurrency=concurrency or ApiConfigs.concurrency,
+            rate=rate,
+            payload=payload,
+            validator=self._base_endpoint.valid_schema,
+            validate_sample=validate_sample,
+        ).run()
+
+    def _verb(self, method: str) -> Callable[..., Response]:
+        """returns the blocking verb method. the Async* mixins override the
+        verbs with coroutines, which the worker threads can't run, so those
+        are skipped for the sync verb they wrap
+
+        Args:
+            method (str): name of the verb method, e.g. "get"
+
+        Raises:
+            AttributeError: no blocking method of that name
+
+        Returns:
+            Callable[..., Response]:
+        """
+        for klass in type(self).__mro__:
+            verb = klass.__dict__.get(method)
+            if verb is not None and not inspect.iscoroutinefunction(verb):
+                return verb.__get__(self, type(self))
+        raise AttributeError(f"{type(self).__name__} has no blocking {method!r}")
+
+    def _send(
+        self, verb: str, call: Callable[..., Response], *args, **kwargs
+    ) -> Response:
+        """makes the call while recording its timing breakdown,
+        tagged with the endpoint class and verb
+
+        Args:
+            verb (str):
+            call (Callable[..., Response]):
+
+        Returns:
+            Response:
+        """
+        endpoint = type(self._base_endpoint).__name__
+        with get_recorder().measure(endpoint, verb) as sample:
+            response = call(*args, **kwargs)
+            sample.status = response.status_code
+            # a streamed body is downloaded by the caller, time it until then
+            raw = getattr(response, "raw", None) if kwargs.get("stream") else None
+            if raw is not None:
+                sample.deferred = True
+                response.raw = TimedRaw(raw, sample)
+        return response
+
+    def _headers(self, **kwargs) -> Dict[str, Any]:
+        """adds the endpoint's Accept-Encoding header to request kwargs
+
+        Returns:
+            Dict[str, Any]:
+        """
+        accept_encoding = self._base_endpoint.accept_encoding
+        if accept_encoding is not None:
+            headers = {**kwargs.get("headers", {}), "Accept-Encoding": accept_encoding}
+            kwargs["headers"] = headers
+        return kwargs
+
+    def _body(self, data: Optional[dict], json: Any) -> Dict[str, Any]:
+        """request kwargs for a body. json is encoded with the endpoint
+        codec and compressed when the endpoint opted in. like requests,
+        data wins when both are given.
+
+        Args:
+            data (Optional[dict]):
+            json (Any):
+
+        Returns:
+            Dict[str, Any]:
+        """
+        if data or json is None:
+            return self._headers(data=data, json=json)
+        endpoint = self._base_endpoint
+        body, headers = encode_json(
+            json,
+            endpoint.codec(),
+            compression=endpoint.compression,
+            min_size=endpoint.compress_min_size,
+        )
+        return self._headers(data=body, headers=headers)
 
 
 class Get(BaseEndpointContainer):
-    def get(self, params: Optional[dict] = None) -> Response:
+    def get(self, params: Optional[dict] = None, stream: bool = False) -> Response:
         """returns a get request response
 
         Args:
             params (Optional[dict], optional): Defaults to None.
+            stream (bool, optional): defer downloading the body, for use with
+                valid_schema_stream. streamed responses are never cached. Defaults to False.
 
         Returns:
             Response:
         """
-        res = requests.get(url=self.endpoint_url, params=params)
+        cache = self._base_endpoint.response_cache
+        if cache is not None and not stream:
+            return self._send(
+                "get",
+                cache.get,
+                self._session,
+                self.endpoint_url,
+                params,
+                label=type(self._base_endpoint).__name__,
+                **self._headers(),
+            )
+        res = self._send(
+            "get",
+            self._session.get,
+            **self._headers(url=self.endpoint_url, params=params, stream=stream),
+        )
         return res
 
+    def paginate(
+        self,
+        paginator: Paginator,
+        params: Optional[dict] = None,
+        prefetch: int = 2,
+        validate: bool = False,
+        max_pages: Optional[int] = None,
+    ) -> Iterator[Any]:
+        """yields the items of every page, loading the next ``prefetch``
+        pages in the background while the current one is consumed.
+
+        Example:
+
+            pages = CursorPagination(next_field="meta.next", items_field="data")
+            for user in Get(users).paginate(pages, params={"active": 1}):
+                ...
+
+        Args:
+            paginator (Paginator): CursorPagination, OffsetPagination or LinkPagination
+            params (Optional[dict], optional): params of the first page. Defaults to None.
+            prefetch (int, optional): pages loaded ahead, 0 loads on demand. Defaults to 2.
+            validate (bool, optional): check every page body against
+                expected_schema. Defaults to False.
+            max_pages (Optional[int], optional): Defaults to no limit.
+
+        Raises:
+            PageError: a page returned an error status, failed to load or
+                didn't match expected_schema
+
+        Yields:
+            Any: items in page order
+        """
+        endpoint = self._base_endpoint
+
+        def fetch(url: str, params: Optional[dict]):
+            response = self._send(
+                "get", self._session.get, **self._headers(url=url, params=params)
+            )
+            response.raise_for_status()
+            return response, endpoint.decode(response)
+
+        pages = iter_pages(
+            fetch, paginator, self.endpoint_url, params, prefetch, max_pages
+        )
+        page = 0
+        try:
+            while True:
+                try:
+                    response, body = next(pages)
+                except StopIteration:
+                    return
+                except Exception as e:
+                    raise PageError(page, getattr(e, "response", None), e) from e
+                if validate:
+                    valid = endpoint.compiled_schema().validate(body)
+                    if valid is not True:
+                        raise PageError(page, response, valid)
+                yield from paginator.items(body)
+                page += 1
+        finally:
+            pages.close()
+
 
 class Post(BaseEndpointContainer):
-    def post(self, data: Optional[dict] = None, json: Optional[str] = None) -> Response:
+    def post(self, data: Optional[dict] = None, json: Any = None) -> Response:
         """returns a post request response
 
         Args:
             data (Optional[dict], optional): Defaults to None.
-            json (Optional[str], optional): Defaults to None.
+            json (Any, optional): encoded with the endpoint codec. Defaults to None.
 
         Returns:
             Response:
         """
-        res = requests.post(url=self.endpoint_url, data=data, json=json)
+        res = self._send(
+            "post", self._session.post, url=self.endpoint_url, **self._body(data, json)
+        )
         return res
 
 
 class Put(BaseEndpointContainer):
-    def put(self, data: Optional[dict] = None, json: Optional[str] = None) -> Response:
+    def put(self, data: Optional[dict] = None, json: Any = None) -> Response:
         """returns a put request response
 
         Args:
             data (Optional[dict], optional): Defaults to None.
-            json (Optional[str], optional): Defaults to None.
+            json (Any, optional): encoded with the endpoint codec. Defaults to None.
 
         Returns:
             Response:
         """
-        res = requests.put(url=self.endpoint_url, data=data, json=json)
+        res = self._send(
+            "put", self._session.put, url=self.endpoint_url, **self._body(data, json)
+        )
         return res
 
 
@@ -67,5 +308,9 @@ class Delete(BaseEndpointContainer):
         Returns:
             Response:
         """
-        res = requests.delete(url=self.endpoint_url, data=data)
+        res = self._send(
+            "delete",
+            self._session.delete,
+            **self._headers(url=self.endpoint_url, data=data),
+        )
         return res
@@ -0,0 +1,310 @@
+"""Module that holds pagination styles and the prefetching page iterator"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from requests import Response
+
+PageRequest = Tuple[str, Optional[Dict[str, Any]]]
+"""url and query params of one page"""
+
+Fetch = Callable[[str, Optional[Dict[str, Any]]], Tuple[Response, Any]]
+"""sends a page request, returns the response and its decoded body"""
+
+
+class PageError(Exception):
+    """raised when a page fails to load or validate"""
+
+    def __init__(self, page: int, response: Optional[Response], error: Any):
+        self.page = page
+        self.response = response
+        self.error = error
+        super().__init__(f"page {page}: {error}")
+
+
+def _lookup(body: Any, field: Optional[str]) -> Any:
+    """follows a dotted field path, None when it is missing"""
+    if field is None:
+        return body
+    for key in field.split("."):
+        if not isinstance(body, dict):
+            return None
+        body = body.get(key)
+    return body
+
+
+# --------------------------------------------------------------------------- #
+# Styles
+# --------------------------------------------------------------------------- #
+class Paginator:
+    """base class for a pagination style"""
+
+    concurrent = False
+    """True when page requests can be built without the previous response"""
+
+    def __init__(self, items_field: Optional[str] = None):
+        """
+        Args:
+            items_field (Optional[str], optional): dotted path of the item list
+                in a page body. Defaults to None, the body is the list.
+        """
+        self.items_field = items_field
+
+    def first(self, url: str, params: Optional[Dict[str, Any]]) -> PageRequest:
+        return url, params
+
+    def next(
+        self, request: PageRequest, response: Response, body: Any
+    ) -> Optional[PageRequest]:
+        """returns the request for the page after this one, None on the last page"""
+        raise NotImplementedError
+
+    def items(self, body: Any) -> List[Any]:
+        return _lookup(body, self.items_field) or []
+
+
+class CursorPagination(Paginator):
+    """the body names the cursor of the next page, e.g.
+    ``{"items": [...], "next_cursor": "abc"}``
+    """
+
+    def __init__(
+        self,
+        cursor_param: str = "cursor",
+        next_field: str = "next_cursor",
+        items_field: Optional[str] = "items",
+    ):
+        """
+        Args:
+            cursor_param (str, optional): query param carrying the cursor. Defaults to "cursor".
+            next_field (str, optional): dotted path of the next cursor. Defaults to "next_cursor".
+            items_field (Optional[str], optional): Defaults to "items".
+        """
+        super().__init__(items_field)
+        self.cursor_param = cursor_param
+        self.next_field = next_field
+
+    def next(self, request, response, body):
+        cursor = _lookup(body, self.next_field)
+        if cursor in (None, ""):
+            return None
+        url, params = request
+        return url, {**(params or {}), self.cursor_param: cursor}
+
+
+class OffsetPagination(Paginator):
+    """offset/limit query params. a page shorter than ``limit`` is the last,
+    so pages can be requested ahead without waiting for each other.
+    """
+
+    concurrent = True
+
+    def __init__(
+        self,
+        limit: int = 100,
+        offset_param: str = "offset",
+        limit_param: str = "limit",
+        items_field: Optional[str] = None,
+        start: int = 0,
+    ):
+        """
+        Args:
+            limit (int, optional): items per page. Defaults to 100.
+            offset_param (str, optional): Defaults to "offset".
+            limit_param (str, optional): Defaults to "limit".
+            items_field (Optional[str], optional): Defaults to None.
+            start (int, optional): first offset. Defaults to 0.
+        """
+        super().__init__(items_field)
+        self.limit = limit
+        self.offset_param = offset_param
+        self.limit_param = limit_param
+        self.start = start
+
+    def nth(self, url: str, params: Optional[Dict[str, Any]], n: int) -> PageRequest:
+        """returns the request for the n-th page, counting from 0"""
+        offset = self.start + n * self.limit
+        return url, {
+            **(params or {}),
+            self.offset_param: offset,
+            self.limit_param: self.limit,
+        }
+
+    def first(self, url, params):
+        return self.nth(url, params, 0)
+
+    def is_last(self, body: Any) -> bool:
+        return len(self.items(body)) < self.limit
+
+    def next(self, request, response, body):
+        if self.is_last(body):
+            return None
+        url, params = request
+        params = dict(params or {})
+        params[self.offset_param] = params[self.offset_param] + self.limit
+        return url, params
+
+
+class LinkPagination(Paginator):
+    """RFC 8288 ``Link: <url>; rel="next"`` response headers"""
+
+    def __init__(self, rel: str = "next", items_field: Optional[str] = None):
+        """
+        Args:
+            rel (str, optional): Defaults to "next".
+            items_field (Optional[str], optional): Defaults to None.
+        """
+        super().__init__(items_field)
+        self.rel = rel
+
+    def next(self, request, response, body):
+        link = response.links.get(self.rel)
+        if not link or not link.get("url"):
+            return None
+        # the link carries the full query already and may be relative
+        return urljoin(response.url, link["url"]), None
+
+
+# --------------------------------------------------------------------------- #
+# Iteration
+# --------------------------------------------------------------------------- #
+_DONE = object()
+
+
+def _sequential(
+    fetch: Fetch, paginator: Paginator, request: Optional[PageRequest], max_pages: int
+) -> Iterator[Tuple[Response, Any]]:
+    page = 0
+    while request is not None and page < max_pages:
+        response, body = fetch(*request)
+        yield response, body
+        request = paginator.next(request, response, body)
+        page += 1
+
+
+def _chained(
+    fetch: Fetch,
+    paginator: Paginator,
+    request: Optional[PageRequest],
+    max_pages: int,
+    prefetch: int,
+) -> Iterator[Tuple[Response, Any]]:
+    """a background thread walks the pages, at most ``prefetch`` ahead"""
+    pages: queue.SimpleQueue = queue.SimpleQueue()
+    slots = threading.Semaphore(prefetch)
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            page = 0
+            current = request
+            while current is not None and page < max_pages:
+                # a slot is freed once the consumer takes a page
+                while not slots.acquire(timeout=0.05):
+                    if stop.is_set():
+                        return
+                if stop.is_set():
+                    return
+                response, body = fetch(*current)
+                pages.put((response, body))
+                current = paginator.next(current, response, body)
+                page += 1
+        except BaseException as e:
+            pages.put(e)
+        finally:
+            pages.put(_DONE)
+
+    thread = threading.Thread(
+        target=copy_context().run, args=(produce,), name="quick_qa_pages", daemon=True
+    )
+    thread.start()
+    try:
+        while (page := pages.get()) is not _DONE:
+            if isinstance(page, BaseException):
+                raise page
+            slots.release()
+            yield page
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _concurrent(
+    fetch: Fetch,
+    paginator: OffsetPagination,
+    url: str,
+    params: Optional[Dict[str, Any]],
+    max_pages: int,
+    prefetch: int,
+) -> Iterator[Tuple[Response, Any]]:
+    """keeps ``prefetch`` page requests in flight, yields them in order and
+    stops at the first short page. requests already sent past the last page
+    are dropped.
+    """
+    executor = ThreadPoolExecutor(max_workers=prefetch, thread_name_prefix="quick_qa")
+    window: Deque[Future] = deque()
+    submitted = 0
+
+    def fill() -> None:
+        nonlocal submitted
+        while len(window) < prefetch and submitted < max_pages:
+            window.append(
+                executor.submit(
+                    copy_context().run, fetch, *paginator.nth(url, params, submitted)
+                )
+            )
+            submitted += 1
+
+    try:
+        fill()
+        while window:
+            response, body = window.popleft().result()
+            if paginator.is_last(body):
+                yield response, body
+                return
+            # top the window up before handing the page out
+            fill()
+            yield response, body
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_pages(
+    fetch: Fetch,
+    paginator: Paginator,
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    prefetch: int = 2,
+    max_pages: Optional[int] = None,
+) -> Iterator[Tuple[Response, Any]]:
+    """yields (response, body) for every page in order.
+
+    while a page is being consumed the next ``prefetch`` pages load in the
+    background: concurrently for offset pagination, one after another for
+    styles where the next request comes from the previous response. at
+    most ``prefetch`` pages are held besides the current one.
+
+    Args:
+        fetch (Fetch):
+        paginator (Paginator):
+        url (str): first page url
+        params (Optional[Dict[str, Any]], optional): Defaults to None.
+        prefetch (int, optional): pages loaded ahead, 0 loads on demand. Defaults to 2.
+        max_pages (Optional[int], optional): Defaults to no limit.
+
+    Returns:
+        Iterator[Tuple[Response, Any]]:
+    """
+    max_pages = float("inf") if max_pages is None else max_pages
+    if prefetch <= 0:
+        return _sequential(fetch, paginator, paginator.first(url, params), max_pages)
+    if paginator.concurrent:
+        return _concurrent(fetch, paginator, url, params, max_pages, prefetch)
+    return _chained(fetch, paginator, paginator.first(url, params), max_pages, prefetch)
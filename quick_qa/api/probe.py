@@ -0,0 +1,120 @@
+"""Module that holds the cached OPTIONS probe behind ping and allowed_methods"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+from requests import Session
+
+from quick_qa.api.configs import ApiConfigs
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    """status and Allow header of one OPTIONS call"""
+
+    status_code: int
+    allow: Optional[str]
+    expires: float
+
+
+class ProbeCache:
+    """caches one OPTIONS call per endpoint url for ``ttl`` seconds.
+    concurrent probes of the same url share a single request.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._results: Dict[str, ProbeResult] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def probe(self, session: Session, url: str, refresh: bool = False) -> ProbeResult:
+        """returns the cached probe for url, sending OPTIONS when missing or expired
+
+        Args:
+            session (Session):
+            url (str):
+            refresh (bool, optional): ignore any cached result. Defaults to False.
+
+        Returns:
+            ProbeResult:
+        """
+        with self._lock:
+            url_lock = self._locks.setdefault(url, threading.Lock())
+
+        with url_lock:
+            result = self._results.get(url)
+            if refresh or result is None or time.monotonic() >= result.expires:
+                res = session.options(url)
+                result = ProbeResult(
+                    status_code=res.status_code,
+                    allow=res.headers.get("Allow"),
+                    expires=time.monotonic() + self.ttl,
+                )
+                self._results[url] = result
+            return result
+
+    def clear(self) -> None:
+        """drops every cached probe"""
+        with self._lock:
+            self._results.clear()
+
+
+_probe_cache: Optional[ProbeCache] = None
+
+
+def get_probe_cache() -> ProbeCache:
+    """returns the shared probe cache, ttl from ApiConfigs.probe_ttl
+
+    Returns:
+        ProbeCache:
+    """
+    global _probe_cache
+    if _probe_cache is None:
+        _probe_cache = ProbeCache(ApiConfigs.probe_ttl)
+    return _probe_cache
+
+
+def probe_all(
+    endpoint_classes: Iterable[type],
+    base_url: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, ProbeResult]:
+    """probes many endpoint classes concurrently, e.g. at session start,
+    so later ping/allowed_methods calls are served from the cache
+
+    Args:
+        endpoint_classes (Iterable[type]): BaseEndpoint subclasses
+        base_url (Optional[str], optional): Defaults to ApiConfigs.base_url.
+        workers (Optional[int], optional): Defaults to ApiConfigs.concurrency.
+
+    Raises:
+        ValueError: no base_url given or configured
+
+    Returns:
+        Dict[str, ProbeResult]: keyed by endpoint url
+    """
+    base_url = base_url or ApiConfigs.base_url
+    if base_url is None:
+        raise ValueError("base_url must be passed or set in the api config")
+
+    endpoints = [cls(base_url) for cls in endpoint_classes]
+
+    # probes run in copies of the caller's context, e.g. its time_budget
+    context = copy_context()
+
+    def run(endpoint: Any) -> ProbeResult:
+        return context.copy().run(endpoint.probe)
+
+    with ThreadPoolExecutor(
+        max_workers=workers or ApiConfigs.concurrency,
+        thread_name_prefix="quick_qa_probe",
+    ) as executor:
+        results = list(executor.map(run, endpoints))
+    return {e.endpoint_url: r for e, r in zip(endpoints, results)}
@@ -0,0 +1,359 @@
+"""Module that holds per host circuit breakers, retry policy and time budgets"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, Optional
+from urllib.parse import urlsplit
+
+from requests import Response, exceptions
+
+from quick_qa.api.configs import ApiConfigs
+
+
+class CircuitState(Enum):
+    """enum for the states of a circuit breaker"""
+
+    CLOSED = "closed"
+    """requests flow, consecutive failures are counted"""
+    OPEN = "open"
+    """requests fail fast until the reset timeout passes"""
+    HALF_OPEN = "half_open"
+    """a limited number of probe requests decide whether to close again"""
+
+
+class CircuitOpenError(exceptions.ConnectionError):
+    """raised instead of sending a request to a host whose circuit is open"""
+
+
+class TimeBudgetExceeded(exceptions.Timeout):
+    """raised when the active time budget is spent before a request starts"""
+
+
+# --------------------------------------------------------------------------- #
+# Circuit breaker
+# --------------------------------------------------------------------------- #
+class CircuitBreaker:
+    """thread safe circuit breaker for one host.
+
+    opens after ``threshold`` consecutive failures. once ``reset_timeout``
+    seconds passed, up to ``half_open_max`` probe requests are let through:
+    a success closes the circuit, a failure opens it again.
+    """
+
+    def __init__(
+        self, threshold: int = 5, reset_timeout: float = 30.0, half_open_max: int = 1
+    ):
+        """
+        Args:
+            threshold (int, optional): consecutive failures that open the circuit. Defaults to 5.
+            reset_timeout (float, optional): seconds before probing an open circuit. Defaults to 30.0.
+            half_open_max (int, optional): concurrent probe requests. Defaults to 1.
+        """
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max = half_open_max
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def before_request(self, url: str = "") -> None:
+        """claims a slot for a request
+
+        Args:
+            url (str, optional): used in the error message. Defaults to "".
+
+        Raises:
+            CircuitOpenError: the circuit is open or its probe slots are taken
+        """
+        with self._lock:
+            if self.state is CircuitState.CLOSED:
+                return
+            if (
+                self.state is CircuitState.OPEN
+                and time.monotonic() - self._opened_at >= self.reset_timeout
+            ):
+                self.state = CircuitState.HALF_OPEN
+                self._probes = 0
+            if (
+                self.state is CircuitState.HALF_OPEN
+                and self._probes < self.half_open_max
+            ):
+                self._probes += 1
+                return
+            self.rejected += 1
+        raise CircuitOpenError(
+            f"circuit open after {self.failures} consecutive failures: {url}"
+        )
+
+    def record_success(self) -> None:
+        """closes the circuit and clears the failure count"""
+        with self._lock:
+            self.state = CircuitState.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        """counts a failure, opening the circuit at the threshold
+        or when a half-open probe fails
+        """
+        with self._lock:
+            self.failures += 1
+            if self.state is CircuitState.HALF_OPEN or (
+                self.state is CircuitState.CLOSED and self.failures >= self.threshold
+            ):
+                self.state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+                self.opened += 1
+
+    def release(self) -> None:
+        """gives back a probe slot for a request that ended without telling
+        anything about the host, e.g. an invalid url
+        """
+        with self._lock:
+            if self.state is CircuitState.HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """returns a point in time copy of the breaker state
+
+        Returns:
+            Dict[str, Any]:
+        """
+        with self._lock:
+            return {
+                "state": self.state.value,
+                "failures": self.failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+
+class BreakerRegistry:
+    """hands out one CircuitBreaker per scheme, host and port"""
+
+    def __init__(
+        self,
+        threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max: int = 1,
+        statuses: Iterable[int] = (),
+    ):
+        """
+        Args:
+            threshold (int, optional): Defaults to 5.
+            reset_timeout (float, optional): Defaults to 30.0.
+            half_open_max (int, optional): Defaults to 1.
+            statuses (Iterable[int], optional): response statuses counted as
+                failures. connection errors and timeouts always are. Defaults to ().
+        """
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.configure(threshold, reset_timeout, half_open_max, statuses)
+
+    def configure(
+        self,
+        threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max: int = 1,
+        statuses: Iterable[int] = (),
+    ) -> None:
+        """applies new settings and drops every breaker
+
+        Args:
+            threshold (int, optional): Defaults to 5.
+            reset_timeout (float, optional): Defaults to 30.0.
+            half_open_max (int, optional): Defaults to 1.
+            statuses (Iterable[int], optional): Defaults to ().
+        """
+        with self._lock:
+            self.threshold = threshold
+            self.reset_timeout = reset_timeout
+            self.half_open_max = half_open_max
+            self.statuses: FrozenSet[int] = frozenset(statuses)
+            self._breakers.clear()
+
+    def get(self, url: str) -> CircuitBreaker:
+        """returns the breaker for the host of url
+
+        Args:
+            url (str):
+
+        Returns:
+            CircuitBreaker:
+        """
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc.rpartition('@')[2].lower()}"
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = self._breakers[key] = CircuitBreaker(
+                    self.threshold, self.reset_timeout, self.half_open_max
+                )
+            return breaker
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """returns the state of every breaker keyed by host
+
+        Returns:
+            Dict[str, Dict[str, Any]]:
+        """
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {host: breaker.snapshot() for host, breaker in breakers.items()}
+
+    def reset(self) -> None:
+        """drops every breaker, closing all circuits"""
+        with self._lock:
+            self._breakers.clear()
+
+
+_breakers: Optional[BreakerRegistry] = None
+
+
+def get_breakers() -> BreakerRegistry:
+    """returns the shared registry, configured from ApiConfigs.breaker
+
+    Returns:
+        BreakerRegistry:
+    """
+    global _breakers
+    if _breakers is None:
+        _breakers = BreakerRegistry(**ApiConfigs.breaker)
+    return _breakers
+
+
+# --------------------------------------------------------------------------- #
+# Retry
+# --------------------------------------------------------------------------- #
+@dataclass(frozen=True)
+class RetryPolicy:
+    """retries with full jitter exponential backoff.
+
+    a retry sleeps a random time between 0 and
+    ``min(max_backoff, backoff * 2 ** attempt)``, or the Retry-After of
+    the response when that is longer and still within ``max_backoff``.
+    """
+
+    attempts: int = 0
+    """retries after the first try, 0 disables retrying"""
+    backoff: float = 0.1
+    max_backoff: float = 5.0
+    statuses: FrozenSet[int] = frozenset({502, 503, 504})
+    """response statuses that are retried"""
+    methods: FrozenSet[str] = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+    """methods that are safe to send again"""
+
+    def __post_init__(self):
+        object.__setattr__(self, "statuses", frozenset(self.statuses))
+        object.__setattr__(self, "methods", frozenset(m.upper() for m in self.methods))
+
+    def should_retry(
+        self, method: str, attempt: int, response: Optional[Response] = None
+    ) -> bool:
+        """True when another try is allowed after a failed one
+
+        Args:
+            method (str):
+            attempt (int): retries done so far
+            response (Optional[Response], optional): None for connection errors.
+
+        Returns:
+            bool:
+        """
+        if attempt >= self.attempts or method.upper() not in self.methods:
+            return False
+        return response is None or response.status_code in self.statuses
+
+    def delay(self, attempt: int, response: Optional[Response] = None) -> float:
+        """seconds to wait before the next try
+
+        Args:
+            attempt (int): retries done so far
+            response (Optional[Response], optional): Defaults to None.
+
+        Returns:
+            float:
+        """
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+        retry_after = response.headers.get("Retry-After") if response else None
+        if retry_after is not None and retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), self.max_backoff))
+        return delay
+
+
+# --------------------------------------------------------------------------- #
+# Time budget
+# --------------------------------------------------------------------------- #
+# a context variable so budgets of different threads don't interfere.
+# batch, load, pagination and async workers run in a copy of the caller's
+# context (contextvars.copy_context) and share its budget
+_deadline: ContextVar[Optional[float]] = ContextVar("quick_qa_deadline", default=None)
+
+
+@contextmanager
+def time_budget(seconds: float) -> Iterator[None]:
+    """limits the wall time every request inside the block may use,
+    retries and backoff included. requests time out at the deadline and
+    no request starts after it.
+
+    Example, a budget for every test in conftest.py:
+
+        @pytest.fixture(autouse=True)
+        def budget():
+            with time_budget(30):
+                yield
+
+    Args:
+        seconds (float):
+    """
+    previous = _deadline.get()
+    deadline = time.monotonic() + seconds
+    token = _deadline.set(deadline if previous is None else min(previous, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_budget() -> Optional[float]:
+    """seconds left in the active time budget
+
+    Returns:
+        Optional[float]: None when no budget is active
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def cap_timeout(timeout: Any) -> Any:
+    """limits a requests timeout to the remaining time budget
+
+    Args:
+        timeout (Any): None, seconds or a (connect, read) tuple
+
+    Raises:
+        TimeBudgetExceeded: the budget is spent
+
+    Returns:
+        Any: the timeout to send with
+    """
+    remaining = remaining_budget()
+    if remaining is None:
+        return timeout
+    if remaining <= 0:
+        raise TimeBudgetExceeded("time budget exhausted")
+    if isinstance(timeout, tuple):
+        return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+    return remaining if timeout is None else min(timeout, remaining)
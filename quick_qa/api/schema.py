@@ -0,0 +1,359 @@
+"""Module that holds compiled json schema validators"""
+
+from __future__ import annotations
+
+import re
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from jsonschema.exceptions import ValidationError, best_match
+from jsonschema.validators import (
+    Draft6Validator,
+    Draft7Validator,
+    Draft201909Validator,
+    Draft202012Validator,
+    validator_for,
+)
+
+from quick_qa._lazy import logger
+
+# drafts where "integer" accepts integral floats and exclusive bounds are numbers
+_FAST_DRAFTS = (
+    Draft6Validator,
+    Draft7Validator,
+    Draft201909Validator,
+    Draft202012Validator,
+)
+
+# keywords that never affect the validation result
+_ANNOTATIONS = {
+    "$schema",
+    "$id",
+    "$comment",
+    "title",
+    "description",
+    "default",
+    "examples",
+    "format",
+    "readOnly",
+    "writeOnly",
+    "deprecated",
+    "contentMediaType",
+    "contentEncoding",
+    "definitions",
+    "$defs",
+}
+
+_TYPE_CHECKS = {
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "string": "isinstance({v}, str)",
+    "boolean": "isinstance({v}, bool)",
+    "null": "{v} is None",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "integer": (
+        "((isinstance({v}, int) and not isinstance({v}, bool))"
+        " or (isinstance({v}, float) and {v}.is_integer()))"
+    ),
+}
+
+_MISSING = object()
+
+
+# --------------------------------------------------------------------------- #
+# Code generation
+# --------------------------------------------------------------------------- #
+class _CheckGenerator:
+    """turns a json schema into the source of a function that returns
+    True when an instance is valid.
+
+    Raises NotImplementedError for any keyword it can't reproduce exactly.
+    """
+
+    _KEYWORDS = {
+        "type",
+        "properties",
+        "required",
+        "additionalProperties",
+        "items",
+        "enum",
+        "const",
+        "minimum",
+        "maximum",
+        "exclusiveMinimum",
+        "exclusiveMaximum",
+        "minLength",
+        "maxLength",
+        "pattern",
+        "minItems",
+        "maxItems",
+        "minProperties",
+        "maxProperties",
+    }
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.namespace: Dict[str, Any] = {"_MISSING": _MISSING}
+        self._counter = 0
+
+    def build(self, schema: Union[dict, bool]) -> Callable[[Any], bool]:
+        self.lines.append("def check(v0):")
+        self._emit(schema, "v0", 1)
+        self.lines.append("    return True")
+        exec("\n".join(self.lines), self.namespace)
+        return self.namespace["check"]
+
+    # ------------------------------------------------------------------- #
+    # helpers
+    # ------------------------------------------------------------------- #
+    def _name(self, prefix: str) -> str:
+        self._counter += 1
+        return f"{prefix}{self._counter}"
+
+    def _const(self, value: Any) -> str:
+        name = self._name("_c")
+        self.namespace[name] = value
+        return name
+
+    def _line(self, depth: int, text: str) -> None:
+        self.lines.append("    " * depth + text)
+
+    def _fail_if(self, depth: int, condition: str) -> None:
+        self._line(depth, f"if {condition}:")
+        self._line(depth + 1, "return False")
+
+    @contextmanager
+    def _block(self, depth: int, *headers: str) -> Iterator[int]:
+        """writes the headers and yields the body depth.
+        headers are removed again when nothing was written in the body.
+        """
+        for header in headers:
+            self._line(depth, header)
+        mark = len(self.lines)
+        yield depth + 1
+        if len(self.lines) == mark:
+            del self.lines[mark - len(headers) :]
+
+    @contextmanager
+    def _guard(self, depth: int, v: str, known: Optional[str], wanted: str):
+        """opens an isinstance block when the type isn't already known"""
+        if known == wanted or (known == "integer" and wanted == "number"):
+            yield depth
+            return
+        with self._block(depth, f"if {_TYPE_CHECKS[wanted].format(v=v)}:") as inner:
+            yield inner
+
+    # ------------------------------------------------------------------- #
+    # emitters
+    # ------------------------------------------------------------------- #
+    def _emit(self, schema: Union[dict, bool], v: str, depth: int) -> None:
+        if schema is True:
+            return
+        if schema is False:
+            self._line(depth, "return False")
+            return
+        if not isinstance(schema, dict):
+            raise NotImplementedError(f"unsupported subschema: {schema!r}")
+
+        unsupported = set(schema) - self._KEYWORDS - _ANNOTATIONS
+        if unsupported:
+            raise NotImplementedError(f"unsupported keywords: {sorted(unsupported)}")
+
+        known = self._emit_type(schema, v, depth)
+        self._emit_enum(schema, v, depth)
+        self._emit_number(schema, v, depth, known)
+        self._emit_string(schema, v, depth, known)
+        self._emit_array(schema, v, depth, known)
+        self._emit_object(schema, v, depth, known)
+
+    def _emit_type(self, schema: dict, v: str, depth: int) -> Optional[str]:
+        if "type" not in schema:
+            return None
+        types = schema["type"]
+        if isinstance(types, str):
+            types = [types]
+        if any(t not in _TYPE_CHECKS for t in types):
+            raise NotImplementedError(f"unsupported type: {types!r}")
+        checks = " or ".join(_TYPE_CHECKS[t].format(v=v) for t in types)
+        self._fail_if(depth, f"not ({checks})")
+        return types[0] if len(types) == 1 else None
+
+    def _emit_enum(self, schema: dict, v: str, depth: int) -> None:
+        # json equality treats True/1 as different and 1/1.0 as equal, so
+        # only strings and null are compared with plain python equality
+        values = []
+        if "enum" in schema:
+            values.append(list(schema["enum"]))
+        if "const" in schema:
+            values.append([schema["const"]])
+        for allowed in values:
+            if any(a is not None and not isinstance(a, str) for a in allowed):
+                raise NotImplementedError("enum/const only supports strings and null")
+            strings = self._const(frozenset(a for a in allowed if a is not None))
+            nullable = f" or {v} is None" if None in allowed else ""
+            self._fail_if(
+                depth,
+                f"not ((isinstance({v}, str) and {v} in {strings}){nullable})",
+            )
+
+    def _emit_number(self, schema: dict, v: str, depth: int, known) -> None:
+        bounds = [
+            ("minimum", "<"),
+            ("maximum", ">"),
+            ("exclusiveMinimum", "<="),
+            ("exclusiveMaximum", ">="),
+        ]
+        with self._guard(depth, v, known, "number") as inner:
+            for keyword, op in bounds:
+                if keyword in schema:
+                    self._fail_if(inner, f"{v} {op} {self._const(schema[keyword])}")
+
+    def _emit_string(self, schema: dict, v: str, depth: int, known) -> None:
+        with self._guard(depth, v, known, "string") as inner:
+            if "minLength" in schema:
+                self._fail_if(inner, f"len({v}) < {int(schema['minLength'])}")
+            if "maxLength" in schema:
+                self._fail_if(inner, f"len({v}) > {int(schema['maxLength'])}")
+            if "pattern" in schema:
+                pattern = self._const(re.compile(schema["pattern"]))
+                self._fail_if(inner, f"{pattern}.search({v}) is None")
+
+    def _emit_array(self, schema: dict, v: str, depth: int, known) -> None:
+        items = schema.get("items", True)
+        if not isinstance(items, (dict, bool)):
+            raise NotImplementedError("tuple style items are not supported")
+        with self._guard(depth, v, known, "array") as inner:
+            if "minItems" in schema:
+                self._fail_if(inner, f"len({v}) < {int(schema['minItems'])}")
+            if "maxItems" in schema:
+                self._fail_if(inner, f"len({v}) > {int(schema['maxItems'])}")
+            item = self._name("v")
+            with self._block(inner, f"for {item} in {v}:") as body:
+                self._emit(items, item, body)
+
+    def _emit_object(self, schema: dict, v: str, depth: int, known) -> None:
+        properties = schema.get("properties", {})
+        with self._guard(depth, v, known, "object") as inner:
+            if "minProperties" in schema:
+                self._fail_if(inner, f"len({v}) < {int(schema['minProperties'])}")
+            if "maxProperties" in schema:
+                self._fail_if(inner, f"len({v}) > {int(schema['maxProperties'])}")
+            if required := schema.get("required"):
+                required = self._const(set(required))
+                self._fail_if(inner, f"not ({v}.keys() >= {required})")
+
+            for key, subschema in properties.items():
+                value = self._name("v")
+                with self._block(
+                    inner,
+                    f"{value} = {v}.get({key!r}, _MISSING)",
+                    f"if {value} is not _MISSING:",
+                ) as body:
+                    self._emit(subschema, value, body)
+
+            additional = schema.get("additionalProperties", True)
+            key = self._name("k")
+            known_keys = self._const(set(properties))
+            with self._block(inner, f"for {key} in {v}:") as loop:
+                with self._block(loop, f"if {key} not in {known_keys}:") as body:
+                    self._emit(additional, f"{v}[{key}]", body)
+
+
+def compile_checks(
+    schema: Union[dict, bool], validator_cls: Optional[type] = None
+) -> Callable[[Any], bool]:
+    """generates a specialized python function for a schema.
+    the function returns True for valid instances and False otherwise.
+
+    Args:
+        schema (Union[dict, bool]):
+        validator_cls (Optional[type], optional): draft the schema belongs to.
+            Defaults to the draft named by the schema.
+
+    Raises:
+        NotImplementedError: when the schema uses keywords that can't be generated
+
+    Returns:
+        Callable[[Any], bool]:
+    """
+    if (validator_cls or validator_for(schema)) not in _FAST_DRAFTS:
+        raise NotImplementedError("only draft 6 and newer schemas are supported")
+    return _CheckGenerator().build(schema)
+
+
+# --------------------------------------------------------------------------- #
+# Compiled schema
+# --------------------------------------------------------------------------- #
+class CompiledSchema:
+    """validator that is checked and built once for a schema"""
+
+    def __init__(self, schema: Union[dict, bool], fast: bool = False):
+        """
+        Args:
+            schema (Union[dict, bool]):
+            fast (bool, optional): try to generate specialized python checks.
+                schemas that can't be generated fall back to jsonschema. Defaults to False.
+
+        Raises:
+            SchemaError: if the schema itself is invalid
+        """
+        validator_cls = validator_for(schema)
+        validator_cls.check_schema(schema)
+        self._setup(schema, fast, validator_cls(schema))
+
+    def _setup(self, schema: Union[dict, bool], fast: bool, validator: Any) -> None:
+        self.schema = schema
+        self.fast = fast
+        self._validator = validator
+        self._check: Optional[Callable[[Any], bool]] = None
+        if fast:
+            try:
+                self._check = compile_checks(schema, type(validator))
+            except NotImplementedError as e:
+                logger.debug(f"no fast schema checks, using jsonschema: {e}")
+
+    def items(self) -> CompiledSchema:
+        """returns a CompiledSchema for the ``items`` subschema of an array
+        schema. references still resolve against the full schema.
+
+        Returns:
+            CompiledSchema:
+        """
+        items = True
+        if isinstance(self.schema, dict):
+            items = self.schema.get("items", True)
+        compiled = CompiledSchema.__new__(CompiledSchema)
+        compiled._setup(items, self.fast, self._validator.evolve(schema=items))
+        return compiled
+
+    @property
+    def is_fast(self) -> bool:
+        """True when generated checks are in use"""
+        return self._check is not None
+
+    def iter_errors(self, instance: Any) -> Iterator[ValidationError]:
+        """yields every validation error for the instance
+
+        Args:
+            instance (Any):
+        """
+        if self._check is not None and self._check(instance):
+            return
+        yield from self._validator.iter_errors(instance)
+
+    def validate(self, instance: Any) -> Union[bool, ValidationError]:
+        """validates an instance
+
+        Args:
+            instance (Any):
+
+        Returns:
+            bool: True when valid
+            ValidationError: the most relevant error when invalid
+        """
+        if self._check is not None and self._check(instance):
+            return True
+        error = best_match(self._validator.iter_errors(instance))
+        if error is None:
+            return True
+        return error
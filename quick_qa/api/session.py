@@ -0,0 +1,434 @@
+"""Module that holds the pooled session every api call goes through"""
+
+from __future__ import annotations
+
+import atexit
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Optional
+
+from requests import Request, Response, Session, exceptions
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.poolmanager import PoolManager
+from urllib3.util.connection import allowed_gai_family
+
+from quick_qa._lazy import logger
+from quick_qa.api import timing
+from quick_qa.api.configs import ApiConfigs
+from quick_qa.api.resilience import (
+    BreakerRegistry,
+    RetryPolicy,
+    TimeBudgetExceeded,
+    cap_timeout,
+    get_breakers,
+    remaining_budget,
+)
+
+if TYPE_CHECKING:
+    from quick_qa.api.cassette import Cassette
+
+
+# --------------------------------------------------------------------------- #
+# Metrics
+# --------------------------------------------------------------------------- #
+@dataclass
+class PoolStats:
+    """thread safe counters for connection pool usage"""
+
+    checkouts: int = 0
+    misses: int = 0
+    saturated: int = 0
+    discarded: int = 0
+    prewarmed: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    @property
+    def hits(self) -> int:
+        """checkouts that reused a pooled connection"""
+        return self.checkouts - self.misses
+
+    def record(self, counter: str, amount: int = 1) -> None:
+        """increments a counter
+
+        Args:
+            counter (str): name of the counter attribute
+            amount (int, optional): Defaults to 1.
+        """
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def snapshot(self) -> Dict[str, int]:
+        """returns a point in time copy of the counters
+
+        Returns:
+            Dict[str, int]:
+        """
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "hits": self.hits,
+                "misses": self.misses,
+                "saturated": self.saturated,
+                "discarded": self.discarded,
+                "prewarmed": self.prewarmed,
+            }
+
+    def reset(self) -> None:
+        """sets every counter back to 0"""
+        with self._lock:
+            self.checkouts = self.misses = self.saturated = 0
+            self.discarded = self.prewarmed = 0
+
+
+# --------------------------------------------------------------------------- #
+# Timed urllib3 connections
+# --------------------------------------------------------------------------- #
+class _TimedConnectionMixin:
+    """reports dns, connect, tls, send and ttfb to the active timing sample.
+    without an active sample it behaves exactly like the base connection.
+    """
+
+    _dns_host: str
+    port: int
+    _connecting: float = 0.0  # dns + tcp connect of the last _new_conn
+    _connected_in: float = 0.0  # the whole last connect, tls included
+    _sent_at: float = 0.0
+
+    def _new_conn(self):
+        if timing.active() is None:
+            return super()._new_conn()
+
+        # resolve here so name resolution and the tcp connect are timed
+        # apart, then hand urllib3 each address in turn like it would itself
+        host = self._dns_host
+        started = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(
+                host, self.port, allowed_gai_family(), socket.SOCK_STREAM
+            )
+        except socket.gaierror:
+            return super()._new_conn()  # raises urllib3's NameResolutionError
+        resolved = time.perf_counter()
+        timing.mark("dns", resolved - started)
+
+        error: Optional[Exception] = None
+        try:
+            for address in dict.fromkeys(info[4][0] for info in infos):
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                    break
+                except ConnectTimeoutError as e:  # also NewConnectionError
+                    error = e
+            else:
+                raise error
+        finally:
+            self._dns_host = host
+        ended = time.perf_counter()
+        timing.mark("connect", ended - resolved)
+        self._connecting = ended - started
+        return sock
+
+    def connect(self) -> None:
+        started = time.perf_counter()
+        self._connecting = 0.0
+        super().connect()
+        self._connected_in = time.perf_counter() - started
+        if isinstance(self, HTTPSConnection):
+            timing.mark("tls", self._connected_in - self._connecting)
+
+    def request(self, *args, **kwargs) -> None:
+        if timing.active() is None:
+            return super().request(*args, **kwargs)
+        # plain http connects lazily inside request, keep that out of "send"
+        started = time.perf_counter()
+        self._connected_in = 0.0
+        super().request(*args, **kwargs)
+        self._sent_at = time.perf_counter()
+        timing.mark("send", self._sent_at - started - self._connected_in)
+
+    def getresponse(self):
+        response = super().getresponse()
+        sample = timing.active()
+        if sample is not None:
+            sample.headers_at = time.perf_counter()
+            timing.mark("ttfb", sample.headers_at - self._sent_at)
+        return response
+
+
+# --------------------------------------------------------------------------- #
+# Metered urllib3 pools
+# --------------------------------------------------------------------------- #
+class _MeteredPoolMixin:
+    """records checkouts, new connections and saturation on a urllib3 pool"""
+
+    stats: PoolStats
+
+    def _get_conn(self, timeout=None):
+        self.stats.record("checkouts")
+        # the queue starts filled with ``maxsize`` placeholders, so an empty
+        # queue means every slot is checked out
+        if self.pool is not None and self.pool.empty():
+            self.stats.record("saturated")
+        return super()._get_conn(timeout)
+
+    def _new_conn(self):
+        self.stats.record("misses")
+        return super()._new_conn()
+
+    def _put_conn(self, conn) -> None:
+        if self.pool is not None and self.pool.full():
+            self.stats.record("discarded")
+        super()._put_conn(conn)
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _MeteredHTTPConnectionPool(_MeteredPoolMixin, HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _MeteredHTTPSConnectionPool(_MeteredPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _MeteredPoolManager(PoolManager):
+    """pool manager that hands out metered pools sharing one PoolStats"""
+
+    def __init__(self, *args, stats: PoolStats, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = stats
+        self.pool_classes_by_scheme = {
+            "http": _MeteredHTTPConnectionPool,
+            "https": _MeteredHTTPSConnectionPool,
+        }
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context)
+        pool.stats = self.stats
+        return pool
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter that reports connection pool metrics and sends through
+    the per host circuit breaker, retry policy and active time budget
+    """
+
+    def __init__(
+        self,
+        stats: PoolStats,
+        retry: Optional[RetryPolicy] = None,
+        breakers: Optional[BreakerRegistry] = None,
+        **kwargs,
+    ):
+        self.stats = stats
+        self.retry = retry or RetryPolicy()
+        self.breakers = breakers or get_breakers()
+        super().__init__(**kwargs)
+
+    def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ) -> Response:
+        breaker = self.breakers.get(request.url)
+        # streamed bodies can only be sent once
+        replayable = request.body is None or isinstance(request.body, (bytes, str))
+        attempt = 0
+        while True:
+            capped = cap_timeout(timeout)
+            breaker.before_request(request.url)
+            response: Optional[Response] = None
+            try:
+                response = super().send(request, stream, capped, verify, cert, proxies)
+            except (exceptions.ConnectionError, exceptions.Timeout) as e:
+                breaker.record_failure()
+                if not (
+                    replayable and self.retry.should_retry(request.method, attempt)
+                ):
+                    raise
+                error = e
+            except Exception:
+                breaker.release()
+                raise
+            else:
+                if response.status_code in self.breakers.statuses:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if not (
+                    replayable
+                    and self.retry.should_retry(request.method, attempt, response)
+                ):
+                    return response
+
+            delay = self.retry.delay(attempt, response)
+            remaining = remaining_budget()
+            if remaining is not None and delay >= remaining:
+                if response is None:
+                    raise TimeBudgetExceeded("time budget exhausted") from error
+                return response
+            if response is not None:
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = _MeteredPoolManager(
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            stats=self.stats,
+            **pool_kwargs,
+        )
+
+
+# --------------------------------------------------------------------------- #
+# Session
+# --------------------------------------------------------------------------- #
+class PooledSession(Session):
+    """requests Session with tunable, metered connection pools"""
+
+    def __init__(self):
+        super().__init__()
+        self.stats = PoolStats()
+        self.retry_policy = RetryPolicy(**ApiConfigs.retry)
+        self.cassette: Optional[Cassette] = None
+        """cassette mounted by configure_session"""
+        self.configure(**ApiConfigs.pool)
+
+    def configure(
+        self,
+        hosts: int = 10,
+        maxsize: int = 10,
+        block: bool = False,
+        keep_alive: bool = True,
+        prewarm: int = 0,
+    ) -> None:
+        """remounts the adapters with new pool settings.
+        open connections from the previous adapters are closed.
+
+        Args:
+            hosts (int, optional): number of per-host pools to keep. Defaults to 10.
+            maxsize (int, optional): connections kept per host. Defaults to 10.
+            block (bool, optional): make maxsize a hard per-host limit. Defaults to False.
+            keep_alive (bool, optional): Defaults to True.
+            prewarm (int, optional): unused here, see prewarm. Defaults to 0.
+        """
+        for adapter in self.adapters.values():
+            adapter.close()
+        for prefix in ("https://", "http://"):
+            self.mount(
+                prefix,
+                PooledAdapter(
+                    stats=self.stats,
+                    retry=self.retry_policy,
+                    pool_connections=hosts,
+                    pool_maxsize=maxsize,
+                    pool_block=block,
+                ),
+            )
+
+        if keep_alive:
+            self.headers.pop("Connection", None)
+        else:
+            self.headers["Connection"] = "close"
+
+    def prewarm(self, url: str, connections: int) -> int:
+        """opens connections to the host of url ahead of the first request
+
+        Args:
+            url (str):
+            connections (int): number of connections to open. capped at the pool maxsize
+
+        Returns:
+            int: number of connections that were opened
+        """
+        adapter = self.get_adapter(url)
+        if not isinstance(adapter, PooledAdapter):
+            return 0
+
+        # resolve verify/cert/proxies the same way a real request would so the
+        # warmed connections land in the pool that request will use
+        settings = self.merge_environment_settings(url, {}, None, self.verify, None)
+        request = Request("HEAD", url).prepare()
+        pool = adapter.get_connection_with_tls_context(
+            request,
+            verify=settings["verify"],
+            proxies=settings["proxies"],
+            cert=settings["cert"],
+        )
+        connections = min(connections, adapter._pool_maxsize)
+
+        opened = []
+        try:
+            for _ in range(connections):
+                conn = pool._get_conn()
+                try:
+                    conn.connect()
+                except Exception as e:
+                    logger.warning(f"could not prewarm connection to {url}: {e}")
+                    conn.close()
+                    pool._put_conn(None)
+                    break
+                opened.append(conn)
+        finally:
+            for conn in opened:
+                pool._put_conn(conn)
+
+        self.stats.record("prewarmed", len(opened))
+        return len(opened)
+
+
+_session: PooledSession = PooledSession()
+
+
+def get_session() -> PooledSession:
+    """returns the shared session
+
+    Returns:
+        PooledSession:
+    """
+    return _session
+
+
+def configure_session(base_url: Optional[str] = None) -> PooledSession:
+    """applies ApiConfigs.pool, retry and breaker to the shared session, prewarms
+    connections against the base url, mounts the configured cassette and
+    schedules the ApiConfigs.metrics export for when the process exits
+
+    Args:
+        base_url (Optional[str], optional): Defaults to ApiConfigs.base_url.
+
+    Returns:
+        PooledSession:
+    """
+    _session.retry_policy = RetryPolicy(**ApiConfigs.retry)
+    get_breakers().configure(**ApiConfigs.breaker)
+    _session.configure(**ApiConfigs.pool)
+    base_url = base_url or ApiConfigs.base_url
+    if base_url and ApiConfigs.pool.get("prewarm"):
+        _session.prewarm(base_url, ApiConfigs.pool["prewarm"])
+    if ApiConfigs.cassette is not None or _session.cassette is not None:
+        # imported here, the cassette module builds on this one
+        from quick_qa.api.cassette import mount_configured_cassette
+
+        mount_configured_cassette(_session)
+    if ApiConfigs.metrics is not None:
+        atexit.unregister(timing.export_configured_metrics)
+        atexit.register(timing.export_configured_metrics)
+    return _session
@@ -0,0 +1,158 @@
+"""Module that holds streaming json validation for large array responses"""
+
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator, List, Union
+
+from jsonschema.exceptions import ValidationError
+
+from quick_qa.api.schema import CompiledSchema
+
+_WHITESPACE = " \t\n\r"
+
+# top level keywords that can be checked without holding the whole array
+_STREAMABLE = {"type", "items", "minItems", "maxItems"}
+
+
+class StreamValidationError(Exception):
+    """raised/returned when a streamed body fails validation"""
+
+    def __init__(self, errors: List[ValidationError], items: int):
+        self.errors = errors
+        self.items = items
+        super().__init__(
+            f"{len(errors)} validation error(s) in the first {items} item(s); "
+            f"first: {errors[0].message}"
+        )
+
+
+def iter_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """decodes a top level json array element by element.
+
+    only the undecoded remainder of the body is buffered, so memory is
+    bounded by the chunk size plus the largest single element.
+
+    Args:
+        chunks (Iterable[bytes]): body chunks, e.g. response.iter_content()
+
+    Raises:
+        ValueError: body is not a json array or is truncated
+
+    Yields:
+        Any: decoded elements
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8-sig")()
+    chunks = iter(chunks)
+    buf, pos, eof = "", 0, False
+
+    def fill() -> bool:
+        """appends the next chunk, False at end of body"""
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+            buf = buf[pos:] + utf8.decode(b"", final=True)
+        else:
+            buf = buf[pos:] + utf8.decode(chunk)
+        pos = 0
+        return True
+
+    def grow() -> bool:
+        """at least doubles the undecoded text so a large item is retried
+        a logarithmic number of times. False when the body is exhausted
+        """
+        target = 2 * (len(buf) - pos) or 1
+        grew = False
+        while len(buf) - pos < target and fill():
+            grew = True
+        return grew
+
+    def peek() -> str:
+        """returns the next non whitespace character, "" at end of body"""
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if not fill():
+                return ""
+
+    if peek() != "[":
+        raise ValueError("response body is not a json array")
+    pos += 1
+    if peek() == "]":
+        return
+
+    while True:
+        peek()
+        while True:
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if not grow():
+                    raise ValueError("invalid or truncated json array item") from None
+                continue
+            # a number at the end of the buffer may continue in the next chunk
+            if end == len(buf) and grow():
+                continue
+            break
+        pos = end
+        yield item
+
+        separator = peek()
+        pos += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"expected ',' or ']' in json array, got {separator!r}")
+
+
+def validate_stream(
+    chunks: Iterable[bytes], schema: CompiledSchema, max_errors: int = 1
+) -> Union[bool, StreamValidationError]:
+    """validates a streamed json array against an array schema one item at
+    a time, stopping after ``max_errors`` errors.
+
+    Args:
+        chunks (Iterable[bytes]):
+        schema (CompiledSchema): schema for the whole array
+        max_errors (int, optional): Defaults to 1.
+
+    Raises:
+        ValueError: schema uses array keywords that need the whole body
+
+    Returns:
+        bool: True when valid
+        StreamValidationError: holds the collected errors, paths start at the item index
+    """
+    top = schema.schema if isinstance(schema.schema, dict) else {}
+    unsupported = set(top) - _STREAMABLE - {"$schema", "$id", "$defs", "definitions"}
+    if unsupported or top.get("type", "array") != "array":
+        raise ValueError(
+            f"schema can't be validated as a stream: {sorted(unsupported) or top['type']}"
+        )
+
+    items = schema.items()
+    errors: List[ValidationError] = []
+    count = 0
+    for count, item in enumerate(iter_array(chunks), start=1):
+        if "maxItems" in top and count > top["maxItems"]:
+            errors.append(ValidationError(f"more than {top['maxItems']} items"))
+            return StreamValidationError(errors[:max_errors], count)
+        for error in items.iter_errors(item):
+            error.relative_path.appendleft(count - 1)
+            errors.append(error)
+            if len(errors) >= max_errors:
+                return StreamValidationError(errors, count)
+
+    if "minItems" in top and count < top["minItems"]:
+        errors.append(ValidationError(f"{count} items is fewer than {top['minItems']}"))
+    if errors:
+        return StreamValidationError(errors[:max_errors], count)
+    return True
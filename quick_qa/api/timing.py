@@ -0,0 +1,319 @@
+"""Module that holds per request timing breakdowns and their export"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+from quick_qa.api.configs import ApiConfigs
+from quick_qa.api.load import PERCENTILES, LatencyHistogram
+
+PHASES = ("dns", "connect", "tls", "send", "ttfb", "download", "total")
+"""dns: name resolution for a new connection
+connect: tcp connect for a new connection
+tls: handshake for a new https connection
+send: writing the request line, headers and body
+ttfb: waiting for the response headers once the request was sent
+download: reading the body after the headers arrived
+total: the whole verb call, including time spent in requests itself
+"""
+
+
+class Sample:
+    """phases collected for one verb call.
+    redirects and retries add to the same sample.
+    """
+
+    __slots__ = ("phases", "status", "headers_at", "cached", "deferred", "_on_finish")
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.status: Union[int, str] = "error"
+        self.headers_at: Optional[float] = None
+        self.cached = False
+        """answered from a cache without a request, such samples aren't recorded"""
+        self.deferred = False
+        """set inside measure to end the sample with finish instead of at the
+        end of the block, e.g. when the body of a streamed response is read
+        """
+        self._on_finish: Optional[Callable[[], None]] = None
+
+    def finish(self) -> None:
+        """ends a deferred sample. only the first call counts"""
+        on_finish, self._on_finish = self._on_finish, None
+        if on_finish is not None:
+            on_finish()
+
+
+_active: ContextVar[Optional[Sample]] = ContextVar("quick_qa_timing", default=None)
+
+
+def active() -> Optional[Sample]:
+    """returns the sample being collected on this thread, if any
+
+    Returns:
+        Optional[Sample]:
+    """
+    return _active.get()
+
+
+def mark(phase: str, seconds: float) -> None:
+    """adds time to a phase of the active sample
+
+    Args:
+        phase (str): one of PHASES
+        seconds (float):
+    """
+    sample = _active.get()
+    if sample is not None:
+        sample.phases[phase] = sample.phases.get(phase, 0.0) + seconds
+
+
+# --------------------------------------------------------------------------- #
+# Recorder
+# --------------------------------------------------------------------------- #
+class TimingRecorder:
+    """aggregates request phases per endpoint class and verb.
+
+    every phase keeps a LatencyHistogram, so memory only grows with the
+    number of series, never with the number of requests. phases that
+    didn't happen (no dns or connect on a reused connection) aren't recorded.
+    """
+
+    def __init__(self, digits: int = 2):
+        """
+        Args:
+            digits (int, optional): significant digits kept by the histograms. Defaults to 2.
+        """
+        self.digits = digits
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._phases: Dict[Tuple[str, str, str], LatencyHistogram] = {}
+        self._statuses: Dict[Tuple[str, str], Counter] = {}
+
+    @contextmanager
+    def measure(self, endpoint: str, verb: str) -> Iterator[Sample]:
+        """collects the phases of the requests sent inside the block.
+        set ``status`` on the yielded sample once the response is known.
+        a sample marked ``deferred`` in the block ends on ``sample.finish()``.
+
+        Example:
+
+            with get_recorder().measure("Users", "get") as sample:
+                response = session.get(url)
+                sample.status = response.status_code
+
+        Args:
+            endpoint (str): endpoint class name
+            verb (str):
+
+        Yields:
+            Sample:
+        """
+        sample = Sample()
+        if not self.enabled:
+            yield sample
+            return
+        token = _active.set(sample)
+        started = time.perf_counter()
+        try:
+            yield sample
+        finally:
+            _active.reset(token)
+
+            def finish() -> None:
+                ended = time.perf_counter()
+                if sample.headers_at is not None:
+                    sample.phases["download"] = ended - sample.headers_at
+                sample.phases["total"] = ended - started
+                if not sample.cached:
+                    self.record(endpoint, verb, sample)
+
+            sample._on_finish = finish
+            if not sample.deferred:
+                sample.finish()
+
+    def record(self, endpoint: str, verb: str, sample: Sample) -> None:
+        """adds a finished sample
+
+        Args:
+            endpoint (str):
+            verb (str):
+            sample (Sample):
+        """
+        with self._lock:
+            for phase, seconds in sample.phases.items():
+                key = (endpoint, verb, phase)
+                hist = self._phases.get(key)
+                if hist is None:
+                    hist = self._phases[key] = LatencyHistogram(self.digits)
+                hist.record(seconds)
+            self._statuses.setdefault((endpoint, verb), Counter())[sample.status] += 1
+
+    def reset(self) -> None:
+        """drops everything recorded so far"""
+        with self._lock:
+            self._phases.clear()
+            self._statuses.clear()
+
+    # ------------------------------------------------------------------- #
+    # Export
+    # ------------------------------------------------------------------- #
+    def as_dict(self) -> Dict[str, Any]:
+        """returns the aggregates as json compatible data, times in ms
+
+        Returns:
+            Dict[str, Any]: keyed by "<endpoint>.<verb>"
+        """
+
+        def ms(seconds: float) -> float:
+            return round(seconds * 1000, 3)
+
+        with self._lock:
+            result: Dict[str, Any] = {}
+            for (endpoint, verb), statuses in sorted(
+                self._statuses.items(), key=lambda item: item[0]
+            ):
+                phases = {}
+                for phase in PHASES:
+                    hist = self._phases.get((endpoint, verb, phase))
+                    if hist is None:
+                        continue
+                    stats = {f"p{p:g}": ms(hist.percentile(p)) for p in PERCENTILES}
+                    stats["mean"] = ms(hist.mean())
+                    stats["max"] = ms((hist.max or 0) / 1_000_000)
+                    phases[phase] = {"count": hist.count, **stats}
+                result[f"{endpoint}.{verb}"] = {
+                    "endpoint": endpoint,
+                    "verb": verb,
+                    "requests": sum(statuses.values()),
+                    "status_codes": {
+                        str(k): v for k, v in sorted(statuses.items(), key=str)
+                    },
+                    "phases_ms": phases,
+                }
+            return result
+
+    def to_json(self, **kwargs) -> str:
+        """returns as_dict as a json string
+
+        Returns:
+            str:
+        """
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "quick_qa") -> str:
+        """returns the aggregates in the prometheus text exposition format.
+        phases are summaries in seconds, statuses a request counter.
+
+        Args:
+            prefix (str, optional): metric name prefix. Defaults to "quick_qa".
+
+        Returns:
+            str:
+        """
+        phase_metric = f"{prefix}_request_phase_seconds"
+        count_metric = f"{prefix}_requests_total"
+        lines = [
+            f"# HELP {phase_metric} Time spent in each phase of an api request.",
+            f"# TYPE {phase_metric} summary",
+        ]
+        with self._lock:
+            for (endpoint, verb, phase), hist in sorted(self._phases.items()):
+                labels = _labels(endpoint=endpoint, verb=verb, phase=phase)
+                for p in PERCENTILES:
+                    quantile = _labels(quantile=f"{p / 100:g}")
+                    lines.append(
+                        f"{phase_metric}{{{labels},{quantile}}} "
+                        f"{hist.percentile(p):.6g}"
+                    )
+                lines.append(
+                    f"{phase_metric}_sum{{{labels}}} {hist.total / 1_000_000:.6g}"
+                )
+                lines.append(f"{phase_metric}_count{{{labels}}} {hist.count}")
+
+            lines.append(f"# HELP {count_metric} Api requests by response status.")
+            lines.append(f"# TYPE {count_metric} counter")
+            for (endpoint, verb), statuses in sorted(self._statuses.items()):
+                for status, count in sorted(statuses.items(), key=str):
+                    labels = _labels(endpoint=endpoint, verb=verb, status=status)
+                    lines.append(f"{count_metric}{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write(
+        self,
+        json_path: Union[str, Path, None] = None,
+        prometheus_path: Union[str, Path, None] = None,
+    ) -> None:
+        """writes the exports to files
+
+        Args:
+            json_path (Union[str, Path, None], optional): Defaults to None.
+            prometheus_path (Union[str, Path, None], optional): Defaults to None.
+        """
+        if json_path is not None:
+            Path(json_path).write_text(self.to_json(indent=2))
+        if prometheus_path is not None:
+            Path(prometheus_path).write_text(self.to_prometheus())
+
+
+def _labels(**labels: Any) -> str:
+    def escape(value: Any) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return ",".join(f'{key}="{escape(value)}"' for key, value in labels.items())
+
+
+class TimedRaw:
+    """stands in for the raw body of a streamed response and finishes its
+    sample once the body is read to the end or the response is closed
+    """
+
+    def __init__(self, raw: Any, sample: Sample):
+        self._raw = raw
+        self._sample = sample
+
+    def stream(self, amt: int = 2**16, decode_content: Optional[bool] = None):
+        yield from self._raw.stream(amt, decode_content=decode_content)
+        self._sample.finish()
+
+    def read(self, amt: Optional[int] = None, *args, **kwargs) -> bytes:
+        data = self._raw.read(amt, *args, **kwargs)
+        if amt is None or not data:
+            self._sample.finish()
+        return data
+
+    def close(self) -> None:
+        self._sample.finish()
+        self._raw.close()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._raw, name)
+
+
+_recorder: TimingRecorder = TimingRecorder()
+
+
+def get_recorder() -> TimingRecorder:
+    """returns the shared recorder every verb reports to
+
+    Returns:
+        TimingRecorder:
+    """
+    return _recorder
+
+
+def export_configured_metrics() -> None:
+    """writes the shared recorder to the files in ApiConfigs.metrics"""
+    if ApiConfigs.metrics is None:
+        return
+    _recorder.write(
+        json_path=ApiConfigs.metrics.get("json"),
+        prometheus_path=ApiConfigs.metrics.get("prometheus"),
+    )
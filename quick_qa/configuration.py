@@ -1,8 +1,30 @@
+import hashlib
+import os
+import pickle
+import tempfile
 from enum import Enum
-from typing import Union
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Union
 
-import yaml
-from loguru import logger
+from quick_qa._lazy import logger
+
+CACHE_DIR_ENV = "QUICK_QA_CACHE_DIR"
+"""environment variable naming the snapshot directory. the
+quick_qa.web.matrix plugin exports it, so pytest-xdist workers (which
+inherit the controller's environment) read the controller's snapshot
+"""
+
+_SNAPSHOT_VERSION = 2
+
+_VALIDATOR_SOURCES = (
+    "_validators.py",
+    "api/configs.py",
+    "web/config.py",
+    "web/blocking.py",
+    "web/profiles.py",
+)
+"""modules whose code decides whether a config section is valid"""
 
 
 class ConfigType(Enum):
@@ -12,6 +34,36 @@ class ConfigType(Enum):
     API = "api"
 
 
+def default_cache_dir() -> Path:
+    """returns $QUICK_QA_CACHE_DIR, else a per user directory under
+    $XDG_CACHE_HOME or ~/.cache
+
+    Returns:
+        Path:
+    """
+    if env := os.environ.get(CACHE_DIR_ENV):
+        return Path(env)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "quick_qa"
+
+
+@lru_cache(maxsize=None)
+def _validator_digest() -> Optional[str]:
+    """hash of the validation code, None when its source can't be read
+
+    Returns:
+        Optional[str]:
+    """
+    package = Path(__file__).parent
+    digest = hashlib.sha256()
+    try:
+        for name in _VALIDATOR_SOURCES:
+            digest.update((package / name).read_bytes())
+    except OSError:
+        return None
+    return digest.hexdigest()[:32]
+
+
 class Configuration:
     """class that handles grabbing dictionary data from config yaml
     files
@@ -19,17 +71,54 @@ class Configuration:
 
     config_data: Union[dict, None] = None
 
+    _snapshot: Optional[Path] = None
+    """snapshot file of the loaded config, None when caching is off"""
+    _key: Optional[Dict[str, Any]] = None
+    """source path, mtime and size the snapshot belongs to"""
+    _validated: Set[str] = set()
+    """config types whose section passed validation"""
+
     @classmethod
-    def set_config_data(cls, path: str) -> None:
+    def set_config_data(cls, path: str, cache: bool = True) -> None:
         """sets the config_data attribute to the dict
-        value from the yaml
+        value from the yaml.
+
+        the parsed data is kept in a snapshot keyed by the file's path,
+        mtime and size, together with which sections were validated.
+        later processes load the snapshot instead of parsing again, until
+        the file changes, and skip validation unless the validation code
+        changed since the snapshot was written.
 
         Args:
             path (str): path to the yaml file
+            cache (bool, optional): read and write the snapshot. Defaults to True.
         """
-        with open(path, "r", encoding="utf8") as f:
-            data = yaml.load(f, Loader=yaml.SafeLoader)
+        source = Path(path).resolve()
+        stat = source.stat()
+        key = {"path": str(source), "mtime": stat.st_mtime_ns, "size": stat.st_size}
+
+        cls._key = key if cache else None
+        cls._snapshot = None
+        if cache:
+            digest = hashlib.sha256(str(source).encode()).hexdigest()[:32]
+            cls._snapshot = default_cache_dir() / f"config-{digest}.pickle"
+            if (snapshot := cls._read_snapshot(key)) is not None:
+                cls.config_data = snapshot["data"]
+                validators = _validator_digest()
+                if validators is not None and snapshot["validators"] == validators:
+                    cls._validated = set(snapshot["validated"])
+                else:
+                    cls._validated = set()
+                return
+
+        import yaml  # only needed on a cache miss, keep it off the import path
+
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        with open(source, "r", encoding="utf8") as f:
+            data = yaml.load(f, Loader=loader)
         cls.config_data = data
+        cls._validated = set()
+        cls._write_snapshot()
 
     @classmethod
     def get_config(cls, config_type: ConfigType) -> Union[dict, None]:
@@ -52,3 +141,72 @@ class Configuration:
         if target_config is None:
             logger.warning(f"no configuration found for: {config_type}")
         return target_config
+
+    @classmethod
+    def is_validated(cls, config_type: ConfigType) -> bool:
+        """True when the section of the loaded file already passed
+        validation, in this process or the one that wrote the snapshot
+
+        Args:
+            config_type (ConfigType):
+
+        Returns:
+            bool:
+        """
+        return config_type.value in cls._validated
+
+    @classmethod
+    def mark_validated(cls, config_type: ConfigType) -> None:
+        """records that a section passed validation and saves it to the
+        snapshot. does nothing unless the data came from set_config_data
+        with caching on
+
+        Args:
+            config_type (ConfigType):
+        """
+        if cls._key is None or config_type.value in cls._validated:
+            return
+        cls._validated.add(config_type.value)
+        cls._write_snapshot()
+
+    # ------------------------------------------------------------------- #
+    # Snapshot
+    # ------------------------------------------------------------------- #
+    @classmethod
+    def _read_snapshot(cls, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        try:
+            with open(cls._snapshot, "rb") as f:
+                snapshot = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"ignoring unreadable config snapshot {cls._snapshot}: {e}")
+            return None
+        if (
+            not isinstance(snapshot, dict)
+            or snapshot.get("version") != _SNAPSHOT_VERSION
+            or snapshot.get("key") != key
+        ):
+            return None
+        return snapshot
+
+    @classmethod
+    def _write_snapshot(cls) -> None:
+        if cls._snapshot is None or cls._key is None:
+            return
+        snapshot = {
+            "version": _SNAPSHOT_VERSION,
+            "key": cls._key,
+            "data": cls.config_data,
+            "validated": sorted(cls._validated),
+            "validators": _validator_digest(),
+        }
+        try:
+            cls._snapshot.parent.mkdir(parents=True, exist_ok=True)
+            # write then rename, so concurrent workers never read half a file
+            fd, tmp = tempfile.mkstemp(dir=cls._snapshot.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cls._snapshot)
+        except OSError as e:
+            logger.warning(f"could not write config snapshot {cls._snapshot}: {e}")
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import re
+import threading
+import weakref
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Pattern, Set
+
+from quick_qa._lazy import logger
+from quick_qa.web.network_events import is_chromium
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+
+#  -------------------------------------#
+#  Patterns
+# --------------------------------------#
+RESOURCE_TYPES: Dict[str, tuple] = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "media": ("mp4", "webm", "ogg", "mp3", "wav", "m4a", "mov"),
+    "stylesheet": ("css",),
+}
+"""blockable resource types and the file extensions they are matched by.
+the same url patterns are used on every browser, so types are recognised
+by extension rather than by what the browser reports, for blocking and
+counting alike
+"""
+
+
+def blocked_patterns(urls: Iterable[str], resource_types: Iterable[str]) -> List[str]:
+    """returns the url patterns for a blocklist, ``*`` matching anything
+
+    Args:
+        urls (Iterable[str]): url patterns
+        resource_types (Iterable[str]): keys of RESOURCE_TYPES
+
+    Returns:
+        List[str]:
+    """
+    patterns = list(urls)
+    for resource_type in resource_types:
+        for ext in RESOURCE_TYPES[resource_type]:
+            patterns += [f"*.{ext}", f"*.{ext}?*"]
+    return patterns
+
+
+def compile_patterns(patterns: Iterable[str]) -> Pattern[str]:
+    """one regex for the patterns, matching the whole url like devtools does
+
+    Args:
+        patterns (Iterable[str]):
+
+    Returns:
+        Pattern[str]:
+    """
+    parts = [re.escape(p).replace(r"\*", ".*") for p in patterns]
+    return re.compile("|".join(f"(?:{part})" for part in parts) or "(?!)", re.I)
+
+
+def _resource_type(url: str) -> str:
+    path = url.split("?", 1)[0].split("#", 1)[0].lower()
+    ext = path.rsplit(".", 1)[-1] if "." in path.rsplit("/", 1)[-1] else ""
+    for resource_type, extensions in RESOURCE_TYPES.items():
+        if ext in extensions:
+            return resource_type
+    return "other"
+
+
+#  -------------------------------------#
+#  Stats
+# --------------------------------------#
+@dataclass
+class PageBlockStats:
+    """blocked requests of every visit to one page url"""
+
+    visits: int = 0
+    blocked: int = 0
+    by_type: Counter = field(default_factory=Counter)
+    """blocked requests by RESOURCE_TYPES key of the url, "other" for the rest"""
+    load_ms: float = 0.0
+    """navigation timing duration of the visits added up"""
+
+    @property
+    def mean_load_ms(self) -> float:
+        return self.load_ms / self.visits if self.visits else 0.0
+
+
+_stats: Dict[str, PageBlockStats] = {}
+_stats_lock = threading.Lock()
+
+
+def get_block_stats() -> Dict[str, PageBlockStats]:
+    """returns a copy of the blocked request counts keyed by page url.
+    a page is counted once the browser navigates away from it or the
+    session goes back to the pool
+
+    Returns:
+        Dict[str, PageBlockStats]:
+    """
+    with _stats_lock:
+        return {
+            url: PageBlockStats(s.visits, s.blocked, Counter(s.by_type), s.load_ms)
+            for url, s in _stats.items()
+        }
+
+
+def reset_block_stats() -> None:
+    """drops the collected counts"""
+    with _stats_lock:
+        _stats.clear()
+
+
+#  -------------------------------------#
+#  Blocker
+# --------------------------------------#
+_LOAD_MS = """
+const nav = performance.getEntriesByType('navigation')[0];
+return nav ? nav.duration : null;
+"""
+
+
+class Blocker:
+    """blocks matching requests in one session and counts them per page.
+
+    chromium drivers block through devtools ``Network.setBlockedURLs`` on a
+    devtools connection, whose ``Network.loadingFailed`` events give the
+    counts. when that connection can't be opened the block list is set with
+    execute_cdp_cmd, which blocks without counting. other browsers intercept
+    requests over WebDriver BiDi (``webSocketUrl`` capability) and fail the
+    matching ones. BiDi url patterns match hostnames and paths literally, so
+    they can't express the ``*`` patterns and every request of the session
+    is intercepted. each one then waits for a python callback before it is
+    continued, benchmarks/bench_blocking.py measures what that costs a page
+    load.
+    """
+
+    def __init__(self, driver: WebDriver, patterns: List[str]):
+        """
+        Args:
+            driver (WebDriver):
+            patterns (List[str]): see blocked_patterns
+        """
+        self._driver = weakref.ref(driver)
+        self.patterns = patterns
+        self.regex = compile_patterns(patterns)
+        self.mode: Optional[str] = None
+        """"cdp", "cdp-command" (no counts), "bidi", or None when nothing is blocked"""
+        self.page: Optional[str] = None
+        self._blocked: Counter = Counter()
+        self._inspector: Any = None
+        """devtools BlockedReason of the requests setBlockedURLs blocks"""
+        self._urls: Dict[str, str] = {}
+        """devtools request id to url of the requests in flight"""
+        self._unresolved: Set[str] = set()
+        """ids of blocked requests whose requestWillBeSent hasn't arrived yet"""
+        self._lock = threading.Lock()
+
+    def install(self) -> Blocker:
+        driver = self._driver()
+        if is_chromium(driver):
+            try:
+                self._install_devtools(driver)
+            except Exception as e:
+                logger.warning(f"devtools connection failed, blocking uncounted: {e}")
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd(
+                    "Network.setBlockedURLs", {"urls": self.patterns}
+                )
+                self.mode = "cdp-command"
+            return self
+        try:
+            driver.network.add_request_handler("before_request", self._on_bidi_request)
+            self.mode = "bidi"
+        except Exception as e:
+            logger.warning(
+                f"request blocking needs WebDriver BiDi on {driver.name}, "
+                f"nothing is blocked: {e}"
+            )
+        return self
+
+    def _install_devtools(self, driver: WebDriver) -> None:
+        devtools, conn = driver.start_devtools()
+        conn.execute(devtools.network.enable())
+        conn.execute(devtools.network.set_blocked_ur_ls(urls=self.patterns))
+        self._inspector = devtools.network.BlockedReason.INSPECTOR
+        # loadingFailed has no url, it comes from requestWillBeSent
+        conn.add_callback(devtools.network.RequestWillBeSent, self._on_cdp_request)
+        conn.add_callback(devtools.network.LoadingFinished, self._on_cdp_finished)
+        conn.add_callback(devtools.network.LoadingFailed, self._on_loading_failed)
+        self.mode = "cdp"
+
+    def _on_cdp_request(self, event: Any) -> None:
+        request_id, url = str(event.request_id), event.request.url
+        with self._lock:
+            if request_id in self._unresolved:
+                self._unresolved.discard(request_id)
+                self._blocked[_resource_type(url)] += 1
+            else:
+                self._urls[request_id] = url
+
+    def _on_cdp_finished(self, event: Any) -> None:
+        with self._lock:
+            self._urls.pop(str(event.request_id), None)
+
+    def _on_loading_failed(self, event: Any) -> None:
+        request_id = str(event.request_id)
+        with self._lock:
+            url = self._urls.pop(request_id, None)
+            # csp, mixed content, corp, ... blocks aren't ours
+            if event.blocked_reason != self._inspector:
+                return
+            if url is None:
+                # events are delivered on threads of their own
+                self._unresolved.add(request_id)
+            else:
+                self._blocked[_resource_type(url)] += 1
+
+    def _on_bidi_request(self, request: Any) -> None:
+        # every request passes through here once intercepted, keep it cheap
+        if request.url and self.regex.fullmatch(request.url):
+            self._count(_resource_type(request.url))
+            request.fail_request()
+        else:
+            request.continue_request()
+
+    def _count(self, resource_type: str) -> None:
+        with self._lock:
+            self._blocked[resource_type] += 1
+
+    def start_page(self, url: str) -> None:
+        """records the page being left and starts counting for url
+
+        Args:
+            url (str):
+        """
+        self.close_page()
+        with self._lock:
+            self.page = url
+            self._blocked.clear()
+
+    def close_page(self) -> None:
+        """adds the counts of the current page to the stats"""
+        with self._lock:
+            page, blocked = self.page, Counter(self._blocked)
+            self.page = None
+        if page is None:
+            return
+        load_ms = 0.0
+        try:
+            load_ms = float(self._driver().execute_script(_LOAD_MS) or 0.0)
+        except Exception:
+            pass
+        total = sum(blocked.values())
+        with _stats_lock:
+            stats = _stats.setdefault(page, PageBlockStats())
+            stats.visits += 1
+            stats.blocked += total
+            stats.by_type.update(blocked)
+            stats.load_ms += load_ms
+        logger.info(
+            f"{page}: blocked {total} requests {dict(blocked)}, loaded in {load_ms:.0f} ms"
+        )
+
+
+_blockers: "weakref.WeakKeyDictionary[Any, Blocker]" = weakref.WeakKeyDictionary()
+
+
+def install_blocker(
+    driver: WebDriver, urls: Iterable[str] = (), resource_types: Iterable[str] = ()
+) -> Optional[Blocker]:
+    """starts blocking the given urls and resource types in a session.
+    does nothing for an empty blocklist
+
+    Args:
+        driver (WebDriver):
+        urls (Iterable[str], optional): patterns, ``*`` matches anything. Defaults to ().
+        resource_types (Iterable[str], optional): keys of RESOURCE_TYPES. Defaults to ().
+
+    Returns:
+        Optional[Blocker]:
+    """
+    patterns = blocked_patterns(urls, resource_types)
+    if not patterns:
+        return None
+    blocker = _blockers[driver] = Blocker(driver, patterns).install()
+    return blocker
+
+
+def get_blocker(driver: WebDriver) -> Optional[Blocker]:
+    """returns the blocker installed in a session, if any
+
+    Args:
+        driver (WebDriver):
+
+    Returns:
+        Optional[Blocker]:
+    """
+    try:
+        return _blockers.get(driver)
+    except TypeError:
+        return None
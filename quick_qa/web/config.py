@@ -2,32 +2,17 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import Any, Dict, List, Mapping, Optional
-from urllib.parse import urlparse
-
-from loguru import logger
 
+from quick_qa._lazy import logger
+from quick_qa._validators import is_url
 from quick_qa.configuration import ConfigType, Configuration
+from quick_qa.web.blocking import RESOURCE_TYPES
+from quick_qa.web.profiles import PROFILES
 
 
 # --------------------------------------------------------------------------- #
 # Helper functions
 # --------------------------------------------------------------------------- #
-def is_url(text: str) -> bool:
-    """check if str value is a url
-
-    Args:
-        text (str):
-
-    Returns:
-        bool:
-    """
-    try:
-        result = urlparse(text.strip())
-        return bool(result.scheme and result.netloc)
-    except Exception:
-        return False
-
-
 def is_int_pair(s: str) -> bool:
     """check if string is in format "<int>,<int>"
 
@@ -61,6 +46,8 @@ class DriverSpec:
     browser: str
     headless: bool
     window_size: str
+    profile: Optional[str] = None
+    """PerformanceProfile name, see quick_qa.web.profiles"""
 
 
 # --------------------------------------------------------------------------- #
@@ -69,7 +56,29 @@ class DriverSpec:
 class Config:
     """class for setting web configurations"""
 
-    timeouts: Dict[str, float] = {"find": 5.0, "interact": 3.0}
+    timeouts: Dict[str, float] = {
+        "find": 5.0,
+        "interact": 3.0,
+        "load": 10.0,
+        "launch": 60.0,
+    }
+    """Seconds waited for.
+
+    find, interact, load: elements to show up, become interactable and
+    pages to load
+    launch: a prewarmed session to finish booting before a lease launches
+    its own
+    """
+    polling: Dict[str, Dict[str, float]] = {
+        "default": {"initial": 0.01, "factor": 1.5, "max": 0.25}
+    }
+    """Poll schedules of waits, see quick_qa.web.waits.PollSchedule.
+
+    default: delays start at ``initial`` seconds and grow by ``factor`` up
+    to ``max``
+    find, interact, load: optional overrides, on top of default, for the
+    waits using the timeout of the same name
+    """
     base_url: Optional[str] = None
     drivers: List[DriverSpec] = [
         DriverSpec(
@@ -79,6 +88,34 @@ class Config:
             window_size="1280,1280",
         )
     ]
+    pool: Dict[str, Any] = {"size": 1, "max_age": 600.0, "prewarm": False}
+    """WebDriver session pool settings.
+
+    size: idle sessions kept per browser options, 0 quits every session on release
+    max_age: seconds a session is reused before it is replaced by a fresh one
+    prewarm: start a session for every entry of ``drivers`` in the background
+    when a pytest session with the quick_qa.web.matrix plugin starts, in each
+    xdist worker but not in the controller. outside of that plugin call
+    DriverFactory.prewarm()
+    """
+    network_idle: Dict[str, Any] = {"events": False, "quiet": 0.05}
+    """How NetworkIdle decides the network is idle.
+
+    events: opt in to following the browser network events of every session
+    built by DriverFactory (devtools on chromium, WebDriver BiDi otherwise,
+    which firefox sessions are then started with) instead of polling a
+    script injected in the page. also lets reset_driver clear the storage
+    of every origin a chromium session visited
+    quiet: seconds without requests in flight before the network counts as idle.
+    a page that made no requests is idle at once
+    """
+    blocklist: Dict[str, List[str]] = {"urls": [], "resource_types": []}
+    """Requests blocked in every session built by DriverFactory.
+
+    urls: url patterns where ``*`` matches anything, e.g. "*google-analytics.com*"
+    resource_types: any of "image", "font", "media", "stylesheet", matched by
+    file extension
+    """
 
     # ------------------------------------------------------------------- #
     # Public API
@@ -92,11 +129,32 @@ class Config:
         if data is None:
             return
 
-        Config._validate_data(data=data)
+        if not Configuration.is_validated(ConfigType.WEB):
+            Config._validate_data(data=data)
+            Configuration.mark_validated(ConfigType.WEB)
 
-        cls._set_value("timeouts", data.get("timeouts"))
+        if (timeouts := data.get("timeouts")) is not None:
+            timeouts = {**cls.timeouts, **timeouts}
+        cls._set_value("timeouts", timeouts)
+        if (polling := data.get("polling")) is not None:
+            polling = {**cls.polling, **polling}
+            polling["default"] = {**cls.polling["default"], **polling["default"]}
+        cls._set_value("polling", polling)
         cls._set_value("base_url", data.get("base_url"))
-        cls._set_value("drivers", data.get("drivers"))
+        if (drivers := data.get("drivers")) is not None:
+            drivers = [DriverSpec(**driver) for driver in drivers]
+        cls._set_value("drivers", drivers)
+        if (pool := data.get("pool")) is not None:
+            pool = {**cls.pool, **pool}
+        cls._set_value("pool", pool)
+
+        if (network_idle := data.get("network_idle")) is not None:
+            network_idle = {**cls.network_idle, **network_idle}
+        cls._set_value("network_idle", network_idle)
+
+        if (blocklist := data.get("blocklist")) is not None:
+            blocklist = {**cls.blocklist, **blocklist}
+        cls._set_value("blocklist", blocklist)
 
     # ------------------------------------------------------------------- #
     # Internal helpers
@@ -124,14 +182,19 @@ class Config:
         Raises:
             ValueError: if timeout keys don't hold floats
             ValueError: unexpected timeout keys
+            ValueError: unexpected polling keys or values
             ValueError: invalid url
             ValueError: drivers don;t fit spec
             ValueError: missing driver keys
             ValueError: improper window size
+            ValueError: unknown performance profile
+            ValueError: unexpected pool keys or values
+            ValueError: unexpected network_idle keys or values
+            ValueError: unexpected blocklist keys or values
         """
         # ---- timeouts ----------------------------------------------------
         if (timeouts := data.get("timeouts")) is not None:
-            allowed_keys = {"find", "interact"}
+            allowed_keys = {"find", "interact", "load", "launch"}
             if not isinstance(timeouts, Mapping):
                 raise ValueError("`timeouts` must be a mapping of key → float")
             unknown = set(timeouts) - allowed_keys
@@ -141,6 +204,37 @@ class Config:
                     f"allowed keys are {sorted(allowed_keys)}"
                 )
 
+        # ---- polling -----------------------------------------------------
+        if (polling := data.get("polling")) is not None:
+            allowed_keys = {"default", "find", "interact", "load"}
+            schedule_keys = {"initial", "factor", "max"}
+            if not isinstance(polling, Mapping):
+                raise ValueError("`polling` must be a mapping of wait → schedule")
+            unknown = set(polling) - allowed_keys
+            if unknown:
+                raise ValueError(
+                    f"`polling` contains unexpected keys: {sorted(unknown)}; "
+                    f"allowed keys are {sorted(allowed_keys)}"
+                )
+            for name, schedule in polling.items():
+                if not isinstance(schedule, Mapping):
+                    raise ValueError(f"`polling.{name}` must be a mapping")
+                unknown = set(schedule) - schedule_keys
+                if unknown:
+                    raise ValueError(
+                        f"`polling.{name}` contains unexpected keys: "
+                        f"{sorted(unknown)}; allowed keys are {sorted(schedule_keys)}"
+                    )
+                for key, value in schedule.items():
+                    if (
+                        not isinstance(value, (int, float))
+                        or isinstance(value, bool)
+                        or value <= 0
+                    ):
+                        raise ValueError(f"`polling.{name}.{key}` must be a number > 0")
+                if schedule.get("factor", 1) < 1:
+                    raise ValueError(f"`polling.{name}.factor` must be >= 1")
+
         # ---- base_url ----------------------------------------------------
         if (url := data.get("base_url")) is not None:
             if not isinstance(url, str) or not is_url(url):
@@ -152,13 +246,14 @@ class Config:
                 raise ValueError("`drivers` must be a list of driver specifications")
 
             required_driver_keys = {"name", "browser", "headless", "window_size"}
+            optional_driver_keys = {"profile"}
 
             for idx, driver in enumerate(drivers):
                 if not isinstance(driver, Mapping):
                     raise ValueError(f"driver #{idx} must be a mapping")
 
                 missing = required_driver_keys - set(driver)
-                extra = set(driver) - required_driver_keys
+                extra = set(driver) - required_driver_keys - optional_driver_keys
                 if missing or extra:
                     raise ValueError(
                         f"driver #{idx} keys mismatch - missing: {sorted(missing)}, "
@@ -172,3 +267,81 @@ class Config:
                         f'driver #{idx} `window_size` must be "full" or an int pair '
                         f'(e.g. "1024,768"); got: {ws!r}'
                     )
+
+                profile = driver.get("profile")
+                if profile is not None and profile not in PROFILES:
+                    raise ValueError(
+                        f"driver #{idx} `profile` must be one of {sorted(PROFILES)}; "
+                        f"got: {profile!r}"
+                    )
+
+        # ---- pool ---------------------------------------------------------
+        if (pool := data.get("pool")) is not None:
+            allowed_keys = {"size", "max_age", "prewarm"}
+            if not isinstance(pool, Mapping):
+                raise ValueError("`pool` must be a mapping")
+            unknown = set(pool) - allowed_keys
+            if unknown:
+                raise ValueError(
+                    f"`pool` contains unexpected keys: {sorted(unknown)}; "
+                    f"allowed keys are {sorted(allowed_keys)}"
+                )
+            size = pool.get("size")
+            if size is not None and (
+                not isinstance(size, int) or isinstance(size, bool) or size < 0
+            ):
+                raise ValueError("`pool.size` must be an int >= 0")
+            max_age = pool.get("max_age")
+            if max_age is not None and (
+                not isinstance(max_age, (int, float))
+                or isinstance(max_age, bool)
+                or max_age <= 0
+            ):
+                raise ValueError("`pool.max_age` must be a number > 0")
+            if not isinstance(pool.get("prewarm", False), bool):
+                raise ValueError("`pool.prewarm` must be a bool")
+
+        # ---- network_idle -------------------------------------------------
+        if (network_idle := data.get("network_idle")) is not None:
+            allowed_keys = {"events", "quiet"}
+            if not isinstance(network_idle, Mapping):
+                raise ValueError("`network_idle` must be a mapping")
+            unknown = set(network_idle) - allowed_keys
+            if unknown:
+                raise ValueError(
+                    f"`network_idle` contains unexpected keys: {sorted(unknown)}; "
+                    f"allowed keys are {sorted(allowed_keys)}"
+                )
+            if not isinstance(network_idle.get("events", False), bool):
+                raise ValueError("`network_idle.events` must be a bool")
+            quiet = network_idle.get("quiet", 0.05)
+            if (
+                not isinstance(quiet, (int, float))
+                or isinstance(quiet, bool)
+                or quiet < 0
+            ):
+                raise ValueError("`network_idle.quiet` must be a number >= 0")
+
+        # ---- blocklist ----------------------------------------------------
+        if (blocklist := data.get("blocklist")) is not None:
+            allowed_keys = {"urls", "resource_types"}
+            if not isinstance(blocklist, Mapping):
+                raise ValueError("`blocklist` must be a mapping")
+            unknown = set(blocklist) - allowed_keys
+            if unknown:
+                raise ValueError(
+                    f"`blocklist` contains unexpected keys: {sorted(unknown)}; "
+                    f"allowed keys are {sorted(allowed_keys)}"
+                )
+            for key in allowed_keys & set(blocklist):
+                values = blocklist[key]
+                if not isinstance(values, list) or not all(
+                    isinstance(v, str) and v for v in values
+                ):
+                    raise ValueError(f"`blocklist.{key}` must be a list of strings")
+            unknown = set(blocklist.get("resource_types", ())) - set(RESOURCE_TYPES)
+            if unknown:
+                raise ValueError(
+                    f"`blocklist.resource_types` contains unknown types: "
+                    f"{sorted(unknown)}; allowed are {sorted(RESOURCE_TYPES)}"
+                )
@@ -0,0 +1,390 @@
+from __future__ import annotations
+
+import atexit
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
+
+from quick_qa._lazy import logger
+from quick_qa.web import driver_store
+from quick_qa.web.blocking import get_blocker
+from quick_qa.web.config import Config
+from quick_qa.web.network_events import get_monitor, is_chromium
+from quick_qa.web.webdriver_factory import BrowserOptionsSpec, DriverFactory
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+
+#  -------------------------------------#
+#  Pooled session
+# --------------------------------------#
+@dataclass
+class PooledDriver:
+    """a driver session owned by the pool"""
+
+    driver: WebDriver
+    opts: BrowserOptionsSpec
+    created: float = field(default_factory=time.monotonic)
+    leases: int = 0
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created
+
+
+@dataclass
+class PoolStats:
+    """counters for how sessions were handed out and retired"""
+
+    created: int = 0
+    reused: int = 0
+    evicted_unhealthy: int = 0
+    evicted_age: int = 0
+    evicted_reset: int = 0
+    discarded: int = 0
+    """sessions quit on release because the pool was full"""
+    prewarmed: int = 0
+    waited: float = 0.0
+    """seconds acquire spent blocked on sessions still warming up"""
+
+
+#  -------------------------------------#
+#  Session hygiene
+# --------------------------------------#
+_CLEAR_STORAGE = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+def reset_driver(driver: WebDriver) -> None:
+    """brings a session back to a blank state: replaces every tab with a
+    new one, clears cookies and web storage and navigates to about:blank.
+
+    the new tab starts with empty sessionStorage for every origin.
+    localStorage and IndexedDB belong to the browser profile, so they are
+    cleared per origin: on chromium for every origin the NetworkMonitor
+    saw a document from since the last reset, over devtools. other
+    browsers, or sessions without a monitor (``network_idle.events`` off),
+    only get the storage of the page the first tab is on cleared; storage
+    of other origins visited survives into the next lease there.
+
+    Args:
+        driver (WebDriver):
+    """
+    handles = driver.window_handles
+    driver.switch_to.window(handles[0])
+    # storage is per origin, clear the current page's before leaving it
+    driver.execute_script(_CLEAR_STORAGE)
+
+    driver.switch_to.new_window("tab")
+    fresh = driver.current_window_handle
+    for handle in handles:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(fresh)
+
+    if is_chromium(driver):
+        monitor = get_monitor(driver)
+        for origin in sorted(monitor.take_origins() if monitor else ()):
+            driver.execute_cdp_cmd(
+                "Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"}
+            )
+        # chromium can drop the cookies of every domain at once
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    driver.delete_all_cookies()
+    driver.get("about:blank")
+
+
+def is_healthy(driver: WebDriver) -> bool:
+    """True when the session still answers commands
+
+    Args:
+        driver (WebDriver):
+
+    Returns:
+        bool:
+    """
+    try:
+        return bool(driver.window_handles) and driver.execute_script("return 1") == 1
+    except Exception:
+        return False
+
+
+#  -------------------------------------#
+#  Pool
+# --------------------------------------#
+class DriverPool:
+    """keeps warm WebDriver sessions keyed by BrowserOptionsSpec.
+
+    a lease hands out an idle session for the spec, or builds one when
+    none is left. on return the session is reset and kept for the next
+    lease, unless the pool already holds ``size`` idle sessions for that
+    spec. sessions that fail the health check, the reset, or are older
+    than ``max_age`` are quit instead of reused.
+
+    Example, a driver per test in conftest.py:
+
+        @pytest.fixture
+        def driver():
+            with get_pool().lease(opts) as driver:
+                yield driver
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        max_age: float = 600.0,
+        factory: Callable[[BrowserOptionsSpec], WebDriver] = DriverFactory.get_driver,
+    ):
+        """
+        Args:
+            size (int, optional): idle sessions kept per spec. Defaults to 1.
+            max_age (float, optional): seconds a session is reused. Defaults to 600.0.
+            factory (Callable[[BrowserOptionsSpec], WebDriver], optional):
+                builds new sessions. Defaults to DriverFactory.get_driver.
+        """
+        self.size = size
+        self.max_age = max_age
+        self.factory = factory
+        self.stats = PoolStats()
+        self._idle: Dict[BrowserOptionsSpec, Deque[PooledDriver]] = {}
+        self._leased: Dict[int, PooledDriver] = {}
+        self._warming: Dict[BrowserOptionsSpec, List[Future]] = {}
+        self.warmup_times: Dict[BrowserOptionsSpec, float] = {}
+        """seconds each prewarmed session took to launch"""
+        self._lock = threading.Lock()
+
+    def acquire(self, opts: BrowserOptionsSpec) -> WebDriver:
+        """returns a healthy session for opts, reusing an idle one when possible
+
+        Args:
+            opts (BrowserOptionsSpec):
+
+        Returns:
+            WebDriver:
+        """
+        given_up: List[Future] = []
+        while True:
+            with self._lock:
+                idle = self._idle.get(opts)
+                entry = idle.popleft() if idle else None
+                warming = self._warming.get(opts, ()) if entry is None else ()
+                pending = next(
+                    (f for f in warming if not f.done() and f not in given_up), None
+                )
+            if pending is not None:
+                # a session for this spec is booting, cheaper to wait for it
+                started = time.monotonic()
+                try:
+                    pending.exception(timeout=Config.timeouts["launch"])
+                except FutureTimeout:
+                    logger.warning(f"prewarming {opts} hangs, launching another")
+                    given_up.append(pending)
+                self._count("waited", time.monotonic() - started)
+                continue
+            if entry is None:
+                entry = PooledDriver(self.factory(opts), opts)
+                self._count("created")
+                break
+            if entry.age >= self.max_age:
+                self._count("evicted_age")
+                _quit(entry)
+                continue
+            if not is_healthy(entry.driver):
+                self._count("evicted_unhealthy")
+                _quit(entry)
+                continue
+            self._count("reused")
+            break
+
+        entry.leases += 1
+        with self._lock:
+            self._leased[id(entry.driver)] = entry
+        return entry.driver
+
+    def release(self, driver: WebDriver, reset: bool = True) -> None:
+        """takes a leased session back. drivers the pool didn't hand out are
+        quit
+
+        Args:
+            driver (WebDriver):
+            reset (bool, optional): reset the session before keeping it.
+                Defaults to True.
+        """
+        with self._lock:
+            entry = self._leased.pop(id(driver), None)
+        if entry is None:
+            _quit_driver(driver)
+            return
+        if entry.age >= self.max_age:
+            self._count("evicted_age")
+            _quit(entry)
+            return
+        if self.idle(entry.opts) >= self.size:
+            self._count("discarded")
+            _quit(entry)
+            return
+        if blocker := get_blocker(driver):
+            blocker.close_page()
+        if reset:
+            try:
+                reset_driver(driver)
+            except Exception as e:
+                logger.warning(f"quitting webdriver session that failed to reset: {e}")
+                self._count("evicted_reset")
+                _quit(entry)
+                return
+        with self._lock:
+            idle = self._idle.setdefault(entry.opts, deque())
+            # another release may have filled the pool during the reset
+            if len(idle) < self.size:
+                idle.append(entry)
+                return
+        self._count("discarded")
+        _quit(entry)
+
+    def _count(self, counter: str, amount: float = 1) -> None:
+        """adds to a PoolStats counter, leases run on many threads"""
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + amount)
+
+    @contextmanager
+    def lease(self, opts: BrowserOptionsSpec) -> Iterator[WebDriver]:
+        """leases a session and sets it in driver_store for the block
+
+        Args:
+            opts (BrowserOptionsSpec):
+
+        Yields:
+            WebDriver:
+        """
+        driver = self.acquire(opts)
+        driver_store.set_driver(driver)
+        try:
+            yield driver
+        finally:
+            driver_store.clear_driver()
+            self.release(driver)
+
+    def prewarm(self, specs: Iterable[BrowserOptionsSpec]) -> List[Future]:
+        """starts building a session per spec on background threads. they
+        join the idle sessions as soon as they are up, and acquire waits for
+        a session that is still booting rather than launching another one.
+
+        Args:
+            specs (Iterable[BrowserOptionsSpec]): one session is built per entry
+
+        Returns:
+            List[Future]: resolve to the launch time in seconds
+        """
+        specs = list(specs)
+        if not specs:
+            return []
+        executor = ThreadPoolExecutor(
+            max_workers=len(specs), thread_name_prefix="quick_qa_prewarm"
+        )
+        futures = []
+        with self._lock:
+            for opts in specs:
+                future = executor.submit(self._warm, opts)
+                self._warming.setdefault(opts, []).append(future)
+                futures.append(future)
+        for opts, future in zip(specs, futures):
+            future.add_done_callback(partial(self._forget, opts))
+        executor.shutdown(wait=False)
+        return futures
+
+    def _warm(self, opts: BrowserOptionsSpec) -> float:
+        started = time.monotonic()
+        try:
+            entry = PooledDriver(self.factory(opts), opts)
+        except Exception as e:
+            # acquire launches its own session once this one is gone
+            logger.warning(f"prewarming {opts} failed: {e}")
+            raise
+        seconds = time.monotonic() - started
+        logger.info(f"prewarmed {opts.browser_type.value} in {seconds:.2f}s")
+        with self._lock:
+            self.warmup_times[opts] = seconds
+            self.stats.prewarmed += 1
+            idle = self._idle.setdefault(opts, deque())
+            kept = len(idle) < self.size
+            if kept:
+                idle.append(entry)
+        if not kept:
+            _quit(entry)
+        return seconds
+
+    def _forget(self, opts: BrowserOptionsSpec, future: Future) -> None:
+        with self._lock:
+            warming = self._warming.get(opts, [])
+            if future in warming:
+                warming.remove(future)
+
+    def idle(self, opts: Optional[BrowserOptionsSpec] = None) -> int:
+        """number of idle sessions, for one spec or all of them
+
+        Args:
+            opts (Optional[BrowserOptionsSpec], optional): Defaults to None.
+
+        Returns:
+            int:
+        """
+        with self._lock:
+            if opts is not None:
+                return len(self._idle.get(opts, ()))
+            return sum(len(idle) for idle in self._idle.values())
+
+    def close(self) -> None:
+        """quits every idle session. leased sessions are quit on release"""
+        with self._lock:
+            entries = [entry for idle in self._idle.values() for entry in idle]
+            self._idle.clear()
+            self.size = 0
+        for entry in entries:
+            _quit(entry)
+
+
+def _quit(entry: PooledDriver) -> None:
+    _quit_driver(entry.driver)
+
+
+def _quit_driver(driver: WebDriver) -> None:
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.warning(f"webdriver quit failed: {e}")
+
+
+_pool: Optional[DriverPool] = None
+
+
+def get_pool() -> DriverPool:
+    """returns the shared pool, configured from Config.pool. its idle
+    sessions are quit when the process exits
+
+    Returns:
+        DriverPool:
+    """
+    global _pool
+    if _pool is None:
+        _pool = DriverPool(size=Config.pool["size"], max_age=Config.pool["max_age"])
+        atexit.register(_pool.close)
+    return _pool
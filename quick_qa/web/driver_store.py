@@ -1,6 +1,10 @@
+from __future__ import annotations
+
 import contextvars
+from typing import TYPE_CHECKING
 
-from selenium.webdriver.remote.webdriver import WebDriver
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
 
 _driver_ctx: contextvars.ContextVar[WebDriver | None] = contextvars.ContextVar(
     "webdriver", default=None
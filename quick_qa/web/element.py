@@ -1,10 +1,10 @@
 from typing import Optional
 
-from loguru import logger
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
 
+from quick_qa._lazy import logger
 from quick_qa.web.config import Config
 from quick_qa.web.waits import wait
 
@@ -26,7 +26,12 @@ class Element:
         """click on element"""
         timeout = timeout or DEFAULT_INTERACT_TIMEOUT()
         try:
-            wait(self._parent, timeout, EC.element_to_be_clickable(self._parent))
+            wait(
+                self._parent,
+                timeout,
+                EC.element_to_be_clickable(self._parent),
+                poll="interact",
+            )
             self._parent.click()
         except TimeoutException:
             logger.error(f"timed out clicking on {self.name}")
@@ -48,6 +53,7 @@ class Element:
                 timeout,
                 EC.visibility_of(self._parent),
                 lambda d: d.is_enabled,
+                poll="interact",
             )
             self._parent.send_keys(text)
         except TimeoutException:
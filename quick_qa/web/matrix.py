@@ -0,0 +1,210 @@
+"""pytest plugin that runs browser tests once per Config.drivers entry.
+
+enable it in conftest.py, after the config is loaded in pytest_configure:
+
+    pytest_plugins = ["quick_qa.web.matrix"]
+
+    def test_login(matrix_driver):
+        ...
+
+every test using the ``matrix_driver`` (or ``driver_spec``) fixture is
+parametrized over Config.drivers, with the DriverSpec name as the id.
+the combinations of one browser share an ``xdist_group``, so with
+pytest-xdist
+
+    pytest -n <number of browsers> --dist loadgroup
+
+runs each browser on its own worker process, which owns that browser's
+driver pool. wall time is then close to the slowest browser instead of
+the sum. pytest-xdist is optional and not part of requirements.txt, so
+that scheduling is not covered by this repo's tests; without it the
+browsers run one after the other in a single process. a per browser
+timing table is printed at the end of the run.
+
+with ``pool: {prewarm: true}`` in the web config, every process that runs
+tests starts its browsers when the session starts. the xdist controller
+runs no tests, so it starts none.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+import pytest
+
+from quick_qa.configuration import CACHE_DIR_ENV, default_cache_dir
+from quick_qa.web.config import Config, DriverSpec
+from quick_qa.web.driver_pool import get_pool
+from quick_qa.web.webdriver_factory import BrowserOptionsSpecBuilder, DriverFactory
+
+SPEC_FIXTURE = "driver_spec"
+
+
+def selected_specs(names: Optional[str]) -> List[DriverSpec]:
+    """returns the Config.drivers entries named in a comma separated list
+
+    Args:
+        names (Optional[str]): None selects every entry
+
+    Raises:
+        pytest.UsageError: a name isn't in Config.drivers
+
+    Returns:
+        List[DriverSpec]:
+    """
+    if names is None:
+        return list(Config.drivers)
+    wanted = [name.strip() for name in names.split(",") if name.strip()]
+    known = {spec.name: spec for spec in Config.drivers}
+    unknown = [name for name in wanted if name not in known]
+    if unknown:
+        raise pytest.UsageError(
+            f"--browsers names not in Config.drivers: {unknown}; "
+            f"configured are {sorted(known)}"
+        )
+    return [known[name] for name in wanted]
+
+
+#  -------------------------------------#
+#  Timing
+# --------------------------------------#
+@dataclass
+class BrowserTiming:
+    """per browser totals of one run"""
+
+    tests: int = 0
+    passed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+    """setup, call and teardown time of the browser's tests added up"""
+    start: float = 0.0
+    stop: float = 0.0
+
+    @property
+    def wall(self) -> float:
+        """seconds from the first test of the browser starting to the last ending"""
+        return self.stop - self.start
+
+
+class MatrixReporter:
+    """collects test reports per browser. reports from xdist workers reach
+    the controller with their user_properties, so this works across processes
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, BrowserTiming] = {}
+        self._outcomes: Dict[str, str] = {}
+        """outcome so far of the tests whose teardown hasn't been reported"""
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        browser = dict(report.user_properties).get("browser")
+        if browser is None:
+            return
+        timing = self.timings.setdefault(browser, BrowserTiming())
+        timing.seconds += report.duration
+        if report.start:
+            timing.start = min(timing.start or report.start, report.start)
+            timing.stop = max(timing.stop, report.stop)
+        # one outcome per test: the first phase that didn't pass, else the call
+        outcome = self._outcomes.get(report.nodeid)
+        if outcome in (None, "passed") and (
+            report.when == "call" or report.outcome != "passed"
+        ):
+            outcome = self._outcomes[report.nodeid] = report.outcome
+        if report.when == "teardown":
+            self._outcomes.pop(report.nodeid, None)
+            if outcome is not None:
+                timing.tests += 1
+                setattr(timing, outcome, getattr(timing, outcome) + 1)
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if not self.timings:
+            return
+        terminalreporter.section("browser matrix")
+        terminalreporter.write_line(
+            f"{'browser':<24} {'tests':>6} {'passed':>7} {'failed':>7} "
+            f"{'skipped':>8} {'time':>9} {'wall':>9}"
+        )
+        for browser, t in sorted(self.timings.items()):
+            terminalreporter.write_line(
+                f"{browser:<24} {t.tests:>6} {t.passed:>7} {t.failed:>7} "
+                f"{t.skipped:>8} {t.seconds:>8.2f}s {t.wall:>8.2f}s"
+            )
+        starts = [t.start for t in self.timings.values() if t.start]
+        if starts:
+            wall = max(t.stop for t in self.timings.values()) - min(starts)
+            slowest = max(t.wall for t in self.timings.values())
+            total = sum(t.seconds for t in self.timings.values())
+            terminalreporter.write_line(
+                f"wall {wall:.2f}s, slowest browser {slowest:.2f}s, "
+                f"browsers added up {total:.2f}s"
+            )
+
+
+#  -------------------------------------#
+#  Hooks
+# --------------------------------------#
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("quick_qa")
+    group.addoption(
+        "--browsers",
+        default=None,
+        help="comma separated Config.drivers names to run, defaults to all",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "browser: the Config.drivers entry a matrix test runs on"
+    )
+    if not config.pluginmanager.hasplugin("xdist"):
+        config.addinivalue_line("markers", "xdist_group(name): pytest-xdist group")
+    config.pluginmanager.register(MatrixReporter(), "quick_qa_matrix_reporter")
+    # xdist workers inherit the environment, so they read this process's
+    # config snapshots
+    if CACHE_DIR_ENV not in os.environ:
+        os.environ[CACHE_DIR_ENV] = str(default_cache_dir())
+        config.add_cleanup(lambda: os.environ.pop(CACHE_DIR_ENV, None))
+
+
+def pytest_sessionstart(session: pytest.Session) -> None:
+    # xdist registers its scheduler as "dsession" on the controller only
+    controller = session.config.pluginmanager.hasplugin("dsession")
+    if Config.pool["prewarm"] and not controller:
+        DriverFactory.prewarm()
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    if SPEC_FIXTURE not in metafunc.fixturenames:
+        return
+    specs = selected_specs(metafunc.config.getoption("browsers"))
+    metafunc.parametrize(SPEC_FIXTURE, specs, ids=[spec.name for spec in specs])
+
+
+def pytest_collection_modifyitems(items: List[pytest.Item]) -> None:
+    for item in items:
+        spec = getattr(item, "callspec", None) and item.callspec.params.get(
+            SPEC_FIXTURE
+        )
+        if not isinstance(spec, DriverSpec):
+            continue
+        # one group per browser keeps its tests on one worker and pool
+        item.add_marker(pytest.mark.xdist_group(name=f"browser-{spec.name}"))
+        item.add_marker(pytest.mark.browser(spec.name))
+        item.user_properties.append(("browser", spec.name))
+
+
+#  -------------------------------------#
+#  Fixtures
+# --------------------------------------#
+@pytest.fixture
+def matrix_driver(driver_spec: DriverSpec) -> Iterator:
+    """a pooled driver for the DriverSpec the test is parametrized with,
+    also set in driver_store for Page and Component
+    """
+    opts = BrowserOptionsSpecBuilder.from_driver_spec(driver_spec)
+    with get_pool().lease(opts) as driver:
+        yield driver
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Set
+from urllib.parse import urlsplit
+
+from quick_qa._lazy import logger
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+
+#  -------------------------------------#
+#  Connections
+# --------------------------------------#
+def is_chromium(driver: WebDriver) -> bool:
+    """True for chrome and edge drivers, which speak devtools
+
+    Args:
+        driver (WebDriver):
+
+    Returns:
+        bool:
+    """
+    # selenium is loaded by the time there is a driver
+    from selenium.webdriver.chromium.webdriver import ChromiumDriver
+
+    return isinstance(driver, ChromiumDriver)
+
+
+def subscribe_bidi(
+    driver: WebDriver, callbacks: Dict[str, Callable[[Dict[str, Any]], None]]
+) -> None:
+    """listens to WebDriver BiDi events without intercepting anything.
+    selenium only exposes network events through request interception,
+    which holds every request until it is continued
+
+    Args:
+        driver (WebDriver): started with the ``webSocketUrl`` capability
+        callbacks (Dict[str, Callable]): event name, e.g.
+            "network.beforeRequestSent", to a callback taking the event params
+    """
+    from selenium.webdriver.common.bidi.common import command_builder
+    from selenium.webdriver.common.bidi.network import NetworkEvent
+
+    conn = driver.network.conn
+    for name, callback in callbacks.items():
+        conn.add_callback(NetworkEvent(name), lambda e, cb=callback: cb(e.params))
+    conn.execute(command_builder("session.subscribe", {"events": list(callbacks)}))
+
+
+#  -------------------------------------#
+#  Monitor
+# --------------------------------------#
+class NetworkMonitor:
+    """keeps count of the requests in flight in one session from browser
+    network events, so network idle can be checked without asking the
+    browser.
+
+    chromium drivers get devtools ``Network.requestWillBeSent``,
+    ``loadingFinished`` and ``loadingFailed`` events, other browsers the
+    WebDriver BiDi ``network.*`` events. mode stays None when neither
+    connection can be opened.
+    """
+
+    def __init__(self, driver: WebDriver):
+        """
+        Args:
+            driver (WebDriver):
+        """
+        self._driver = weakref.ref(driver)
+        self.mode: Optional[str] = None
+        """"cdp", "bidi", or None when no events arrive"""
+        self._pending: Dict[str, int] = {}
+        self._last_activity = 0.0
+        """monotonic time of the last request event, 0 before the first"""
+        self._origins: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def install(self) -> NetworkMonitor:
+        driver = self._driver()
+        try:
+            if is_chromium(driver):
+                self._install_devtools(driver)
+            else:
+                self._install_bidi(driver)
+        except Exception as e:
+            logger.warning(
+                f"no network events from {driver.name}, "
+                f"network idle falls back to polling: {e}"
+            )
+        return self
+
+    def _install_devtools(self, driver: WebDriver) -> None:
+        devtools, conn = driver.start_devtools()
+        conn.execute(devtools.network.enable())
+        conn.add_callback(devtools.network.RequestWillBeSent, self._on_cdp_request)
+        conn.add_callback(devtools.network.LoadingFinished, self._on_cdp_done)
+        conn.add_callback(devtools.network.LoadingFailed, self._on_cdp_done)
+        self.mode = "cdp"
+
+    def _install_bidi(self, driver: WebDriver) -> None:
+        subscribe_bidi(
+            driver,
+            {
+                "network.beforeRequestSent": self._on_bidi_request,
+                "network.responseCompleted": self._on_bidi_done,
+                "network.fetchError": self._on_bidi_done,
+            },
+        )
+        self.mode = "bidi"
+
+    def _on_cdp_request(self, event: Any) -> None:
+        if event.type_ is not None and event.type_.value == "Document":
+            self._visited(event.request.url)
+        # a redirect reuses the request id of the request it replaces
+        if event.redirect_response is None:
+            self._started(str(event.request_id))
+
+    def _on_cdp_done(self, event: Any) -> None:
+        self._finished(str(event.request_id))
+
+    def _on_bidi_request(self, params: Dict[str, Any]) -> None:
+        if params.get("navigation") is not None:
+            self._visited(params["request"]["url"])
+        self._started(self._bidi_hop(params))
+
+    def _on_bidi_done(self, params: Dict[str, Any]) -> None:
+        self._finished(self._bidi_hop(params))
+
+    @staticmethod
+    def _bidi_hop(params: Dict[str, Any]) -> str:
+        # unlike devtools, BiDi completes every redirect hop before the next
+        # one starts under the same request id, so each hop is counted alone
+        return f"{params['request']['request']}:{params.get('redirectCount', 0)}"
+
+    def _visited(self, url: str) -> None:
+        parts = urlsplit(url)
+        if parts.scheme in ("http", "https") and parts.netloc:
+            with self._lock:
+                self._origins.add(f"{parts.scheme}://{parts.netloc}")
+
+    def take_origins(self) -> Set[str]:
+        """returns the origins of the documents loaded since the last call,
+        top level pages and frames
+
+        Returns:
+            Set[str]:
+        """
+        with self._lock:
+            origins, self._origins = self._origins, set()
+        return origins
+
+    def _started(self, request_id: str) -> None:
+        self._change(request_id, 1)
+
+    def _finished(self, request_id: str) -> None:
+        self._change(request_id, -1)
+
+    def _change(self, request_id: str, delta: int) -> None:
+        # events are delivered on threads of their own, so a request can
+        # finish before it starts; the count then goes through -1 to 0
+        with self._lock:
+            count = self._pending.get(request_id, 0) + delta
+            if count:
+                self._pending[request_id] = count
+            else:
+                self._pending.pop(request_id, None)
+            self._last_activity = time.monotonic()
+
+    @property
+    def in_flight(self) -> int:
+        """requests started and not finished yet"""
+        with self._lock:
+            return sum(1 for count in self._pending.values() if count > 0)
+
+    def start_navigation(self) -> None:
+        """forgets the requests of the document being left"""
+        with self._lock:
+            self._pending.clear()
+            self._last_activity = time.monotonic()
+
+    def idle_for(self, quiet: float) -> bool:
+        """True when nothing is in flight and nothing started or finished
+        for the last ``quiet`` seconds
+
+        Args:
+            quiet (float): seconds
+
+        Returns:
+            bool:
+        """
+        with self._lock:
+            busy = any(count > 0 for count in self._pending.values())
+            return not busy and time.monotonic() - self._last_activity >= quiet
+
+
+_monitors: "weakref.WeakKeyDictionary[Any, NetworkMonitor]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def install_monitor(driver: WebDriver) -> NetworkMonitor:
+    """starts following the network events of a session
+
+    Args:
+        driver (WebDriver):
+
+    Returns:
+        NetworkMonitor:
+    """
+    monitor = _monitors[driver] = NetworkMonitor(driver).install()
+    return monitor
+
+
+def get_monitor(driver: WebDriver) -> Optional[NetworkMonitor]:
+    """returns the monitor following a session, if any
+
+    Args:
+        driver (WebDriver):
+
+    Returns:
+        Optional[NetworkMonitor]:
+    """
+    try:
+        return _monitors.get(driver)
+    except TypeError:
+        return None
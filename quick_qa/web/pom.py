@@ -2,14 +2,16 @@ from __future__ import annotations
 
 from typing import Optional, Union, overload
 
-from loguru import logger
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By as _By
 from selenium.webdriver.remote.webelement import WebElement
 
+from quick_qa._lazy import logger
 from quick_qa.web import driver_store
+from quick_qa.web.blocking import get_blocker
 from quick_qa.web.config import Config
 from quick_qa.web.element import Element
+from quick_qa.web.network_events import get_monitor
 from quick_qa.web.waits import DocumentReady, JQueryInactive, NetworkIdle, wait
 
 
@@ -23,7 +25,7 @@ def _find(
     """find helper for basic find element logic."""
     timeout = timeout or DEFAULT_FIND_TIMEOUT()
     driver = parent or driver_store.get_driver()
-    wait(driver, timeout, lambda d: d.find_element(*locator))
+    wait(driver, timeout, lambda d: d.find_element(*locator), poll="find")
     return driver.find_element(*locator)
 
 
@@ -64,11 +66,22 @@ class Page:
         """navigates to page"""
         driver = driver_store.get_driver()
         self.wait_for_load()
+        if blocker := get_blocker(driver):
+            blocker.start_page(self.url)
+        if monitor := get_monitor(driver):
+            monitor.start_navigation()
         driver.get(self.url)
 
     def wait_for_load(self):
         driver = driver_store.get_driver()
-        wait(driver, 10.0, DocumentReady(), JQueryInactive(), NetworkIdle())
+        wait(
+            driver,
+            Config.timeouts["load"],
+            DocumentReady(),
+            JQueryInactive(),
+            NetworkIdle(),
+            poll="load",
+        )
 
 
 class Component:
@@ -113,7 +126,7 @@ class Component:
         timeout = timeout or DEFAULT_FIND_TIMEOUT()
         try:
             root = self.root
-            wait(root, timeout, lambda d: d.find_element(*locator))
+            wait(root, timeout, lambda d: d.find_element(*locator), poll="find")
             element = root.find_element(*locator)
             return element
         except TimeoutException:
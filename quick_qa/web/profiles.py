@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+
+#  -------------------------------------#
+#  Profiles
+# --------------------------------------#
+@dataclass(frozen=True)
+class PerformanceProfile:
+    """browser flags and preferences applied on top of a BrowserOptionsSpec"""
+
+    page_load_strategy: Optional[str] = None
+    """"normal", "eager" (return at DOMContentLoaded) or "none". None keeps
+    the browser default
+    """
+    block_images: bool = False
+    chrome_args: Tuple[str, ...] = ()
+    chrome_prefs: Dict[str, Any] = field(default_factory=dict)
+    firefox_prefs: Dict[str, Any] = field(default_factory=dict)
+
+
+_CHROME_FAST_ARGS = (
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-component-extensions-with-background-pages",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-features=Translate,OptimizationHints,MediaRouter",
+    "--disable-dev-shm-usage",
+    "--metrics-recording-only",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--password-store=basic",
+    "--mute-audio",
+)
+
+_FIREFOX_FAST_PREFS = {
+    "browser.shell.checkDefaultBrowser": False,
+    "browser.startup.page": 0,
+    "browser.startup.homepage_override.mstone": "ignore",
+    "startup.homepage_welcome_url": "about:blank",
+    "startup.homepage_welcome_url.additional": "",
+    "browser.newtabpage.enabled": False,
+    "browser.aboutwelcome.enabled": False,
+    "app.update.auto": False,
+    "extensions.update.enabled": False,
+    "datareporting.healthreport.uploadEnabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "toolkit.telemetry.enabled": False,
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "browser.safebrowsing.downloads.enabled": False,
+    "network.prefetch-next": False,
+    "network.dns.disablePrefetch": True,
+    "network.http.speculative-parallel-limit": 0,
+    "media.autoplay.default": 5,
+}
+
+PROFILES: Dict[str, PerformanceProfile] = {
+    "default": PerformanceProfile(),
+    "ci-fast": PerformanceProfile(
+        page_load_strategy="eager",
+        chrome_args=_CHROME_FAST_ARGS,
+        firefox_prefs=_FIREFOX_FAST_PREFS,
+    ),
+    "ci-fast-no-images": PerformanceProfile(
+        page_load_strategy="eager",
+        block_images=True,
+        chrome_args=_CHROME_FAST_ARGS,
+        firefox_prefs=_FIREFOX_FAST_PREFS,
+    ),
+}
+"""named profiles selectable with ``profile:`` on a Config.drivers entry"""
+
+
+def register_profile(name: str, profile: PerformanceProfile) -> None:
+    """adds or replaces a named profile. register before Config.set_values
+    so config files can refer to it
+
+    Args:
+        name (str):
+        profile (PerformanceProfile):
+    """
+    PROFILES[name] = profile
+
+
+def get_profile(name: Optional[str]) -> PerformanceProfile:
+    """returns a profile by name, None is the default profile
+
+    Args:
+        name (Optional[str]):
+
+    Raises:
+        ValueError: unknown profile
+
+    Returns:
+        PerformanceProfile:
+    """
+    try:
+        return PROFILES[name or "default"]
+    except KeyError:
+        raise ValueError(
+            f"unknown performance profile {name!r}, use one of {sorted(PROFILES)}"
+        ) from None
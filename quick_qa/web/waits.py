@@ -1,74 +1,283 @@
-from typing import Union
+from __future__ import annotations
 
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Union
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.types import WaitExcTypes
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
 
+from quick_qa.web.config import Config
+from quick_qa.web.network_events import get_monitor
+
+
+#  -------------------------------------#
+#  JS conditions
+# --------------------------------------#
+class JSCondition:
+    """a condition checked by a script in the page.
+
+    wait() runs the scripts of all JSConditions it is given in one
+    execute_script call, so a poll costs one round-trip however many of
+    them there are. conditions combined with ``&`` are batched the same way
+    when called on their own.
+
+    Example Usage:
+        app_ready = JSCondition("return window.app && window.app.ready;")
+        wait(driver, 10.0, DocumentReady() & app_ready)
+
+    subclasses set ``script`` and override ``check`` to read its result,
+    and ``local`` to answer without the browser when they can.
+    """
+
+    script: str = "return true;"
+    """body of a function returning the value passed to check"""
+
+    def __init__(self, script: Optional[str] = None):
+        """
+        Args:
+            script (Optional[str], optional): function body, the condition is
+                met when it returns something truthy. Defaults to None, which
+                keeps the class script.
+        """
+        if script is not None:
+            self.script = script
+
+    def local(self, driver) -> Optional[bool]:
+        """answers the condition without running the script, None when the
+        script has to run
+        """
+        return None
+
+    def check(self, driver, value) -> bool:
+        """reads the result of the script"""
+        return bool(value)
+
+    def __and__(self, other: JSCondition) -> JSConditions:
+        return JSConditions(self, other)
 
-class DocumentReady:
     def __call__(self, driver):
-        return driver.execute_script("return document.readyState") == "complete"
+        return JSConditions(self)(driver)
+
+
+class JSConditions(JSCondition):
+    """JSConditions that are all met, checked in one execute_script call"""
 
+    def __init__(self, *conditions: JSCondition):
+        self.conditions: List[JSCondition] = []
+        for condition in conditions:
+            if isinstance(condition, JSConditions):
+                self.conditions.extend(condition.conditions)
+            else:
+                self.conditions.append(condition)
+
+    @property
+    def script(self) -> str:
+        # each script on lines of its own, a trailing // comment can't
+        # swallow the closing brace
+        parts = ",\n".join(f"(() => {{\n{c.script}\n}})()" for c in self.conditions)
+        return f"return [\n{parts}\n];"
 
-class JQueryInactive:
     def __call__(self, driver):
-        return driver.execute_script(
-            """
-            return window.jQuery === undefined || jQuery.active === 0;
+        pending = []
+        for condition in self.conditions:
+            answer = condition.local(driver)
+            if answer is None:
+                pending.append(condition)
+            elif not answer:
+                # already known to fail, no script needed this poll
+                return False
+        if not pending:
+            return True
+        if len(pending) == 1:
+            values = [driver.execute_script(pending[0].script)]
+        else:
+            values = driver.execute_script(JSConditions(*pending).script)
+        return all(c.check(driver, v) for c, v in zip(pending, values))
+
+
+class DocumentReady(JSCondition):
+    script = "return document.readyState;"
+
+    def check(self, driver, value) -> bool:
+        return value == "complete"
+
+
+class JQueryInactive(JSCondition):
+    script = "return window.jQuery === undefined || jQuery.active === 0;"
+
+
+_TRACKER = """
+if (!window.__quickQaNetwork) {
+    const tracker = window.__quickQaNetwork = { pending: 0, last: 0 };
+    const change = (delta) => {
+        tracker.pending += delta;
+        tracker.last = performance.now();
+    };
+
+    const open = XMLHttpRequest.prototype.open;
+    XMLHttpRequest.prototype.open = function() {
+        this.addEventListener('loadstart', () => change(1));
+        this.addEventListener('loadend', () => change(-1));
+        return open.apply(this, arguments);
+    };
+
+    const fetch = window.fetch;
+    window.fetch = function() {
+        change(1);
+        return fetch.apply(this, arguments).finally(() => change(-1));
+    };
+}
+"""
+
+_POLL = """
+const tracker = window.__quickQaNetwork;
+return tracker ? [tracker.pending, performance.now() - tracker.last] : null;
+"""
+
+
+class NetworkIdle(JSCondition):
+    """no requests in flight for a quiet window.
+
+    sessions built by DriverFactory are followed by a NetworkMonitor, so the
+    check is answered from network events already received, without a call
+    to the browser, and counts every request since navigation started.
+    without events a tracker of XHR and fetch calls is injected once per
+    document and polled with a short script; it misses requests started
+    before it was injected.
+    """
+
+    script = _POLL
+
+    def __init__(self, quiet: Optional[float] = None):
         """
-        )
-
-
-class NetworkIdle:
-    def __init__(self):
-        self._script = """
-        if (!window.__seleniumXHRTracker) {
-            window.__seleniumXHRTracker = { pending: 0 };
-
-            const open = XMLHttpRequest.prototype.open;
-            XMLHttpRequest.prototype.open = function() {
-                this.addEventListener('readystatechange', function() {
-                    if (this.readyState === 1) window.__seleniumXHRTracker.pending++;
-                    if (this.readyState === 4) window.__seleniumXHRTracker.pending--;
-                });
-                open.apply(this, arguments);
-            };
-
-            const fetch = window.fetch;
-            window.fetch = function() {
-                window.__seleniumXHRTracker.pending++;
-                return fetch.apply(this, arguments).finally(() => {
-                    window.__seleniumXHRTracker.pending--;
-                });
-            };
-        }
-        return window.__seleniumXHRTracker.pending;
+        Args:
+            quiet (Optional[float], optional): seconds without network activity.
+                Defaults to None, which uses Config.network_idle["quiet"].
         """
+        self._quiet = quiet
+
+    @property
+    def quiet(self) -> float:
+        return Config.network_idle["quiet"] if self._quiet is None else self._quiet
+
+    def local(self, driver) -> Optional[bool]:
+        monitor = get_monitor(driver)
+        if monitor is not None and monitor.mode is not None:
+            return monitor.idle_for(self.quiet)
+        return None
+
+    def check(self, driver, value) -> bool:
+        if value is None:
+            # a new document, the tracker goes in once and is polled after
+            value = driver.execute_script(_TRACKER + _POLL)
+        pending, idle_ms = value
+        return pending <= 0 and idle_ms >= self.quiet * 1000
+
+
+#  -------------------------------------#
+#  Polling
+# --------------------------------------#
+@dataclass(frozen=True)
+class PollSchedule:
+    """delays between the checks of a wait, growing from initial by factor
+    up to maximum. a condition that is met soon after the wait starts is
+    seen within a few milliseconds, a slow one isn't polled more often
+    than every maximum seconds
+    """
+
+    initial: float = 0.01
+    factor: float = 1.5
+    maximum: float = 0.25
+
+    def delays(self) -> Iterator[float]:
+        delay = self.initial
+        while True:
+            yield min(delay, self.maximum)
+            delay *= self.factor
 
-    def __call__(self, driver):
-        return driver.execute_script(self._script) == 0
+
+def poll_schedule(name: Optional[str] = None) -> PollSchedule:
+    """returns the schedule for a kind of wait, the Config.polling "default"
+    entry with the entry of that name on top
+
+    Args:
+        name (Optional[str], optional): a Config.timeouts key, e.g. "find".
+            Defaults to None, which is the default schedule.
+
+    Returns:
+        PollSchedule:
+    """
+    settings = {**Config.polling["default"], **Config.polling.get(name or "", {})}
+    return PollSchedule(settings["initial"], settings["factor"], settings["max"])
 
 
 def wait(
     driver: Union[WebDriver, WebElement],
     timeout: float,
     *conditions,
-    ignored_exceptions: WaitExcTypes | None = None
+    ignored_exceptions: WaitExcTypes | None = None,
+    poll: Union[str, PollSchedule, None] = None,
 ):
-    """waits depending on the input
+    """waits until all conditions are met, checking them on a poll schedule
 
     Example Usage:
         wait(driver, 3.0, EC.preseence_of_element_located(locator), [StaleElementReference])
+        wait(driver, Config.timeouts["find"], condition, poll="find")
 
     Args:
         driver (Union[WebDriver, WebElement]):
         timeout (float):
         ignored_exceptions (WaitExcTypes | None, optional): . Defaults to None.
+        poll (Union[str, PollSchedule, None], optional): a schedule, or the
+            name of a Config.polling entry. Defaults to None, the default schedule.
+
+    Raises:
+        TimeoutException: conditions weren't met within timeout
+
+    Returns:
+        Any: result of the combined conditions
     """
-    wait = WebDriverWait(
-        driver=driver, timeout=timeout, ignored_exceptions=ignored_exceptions
-    )
-    combined = EC.all_of(*conditions)
-    wait.until(combined)
+    schedule = poll if isinstance(poll, PollSchedule) else poll_schedule(poll)
+    ignored: List[type] = [NoSuchElementException]
+    if ignored_exceptions is not None:
+        try:
+            ignored.extend(iter(ignored_exceptions))
+        except TypeError:
+            ignored.append(ignored_exceptions)
+    combined = EC.all_of(*_batched(conditions))
+    delays = schedule.delays()
+    screen, stacktrace = None, None
+    end = time.monotonic() + timeout
+    while True:
+        try:
+            value = combined(driver)
+            if value:
+                return value
+        except tuple(ignored) as exc:
+            screen = getattr(exc, "screen", None)
+            stacktrace = getattr(exc, "stacktrace", None)
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutException(
+                f"conditions not met within {timeout}s", screen, stacktrace
+            )
+        time.sleep(min(next(delays), remaining))
+
+
+def _batched(conditions: tuple) -> list:
+    """merges the JSConditions into one, where the first of them was"""
+    scripts = [c for c in conditions if isinstance(c, JSCondition)]
+    if len(scripts) < 2:
+        return list(conditions)
+    batched, merged = [], JSConditions(*scripts)
+    for condition in conditions:
+        if not isinstance(condition, JSCondition):
+            batched.append(condition)
+        elif merged is not None:
+            batched.append(merged)
+            merged = None
+    return batched
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
+from concurrent.futures import Future
 from dataclasses import dataclass, replace
 from enum import Enum
-from typing import Callable, Dict, List, Optional, Protocol, Tuple, Union
+from typing import Callable, Dict, Iterable, List, Optional, Protocol, Tuple, Union
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.remote.webdriver import WebDriver
 
+from quick_qa.web.blocking import install_blocker
+from quick_qa.web.config import Config, DriverSpec
+from quick_qa.web.network_events import install_monitor
+from quick_qa.web.profiles import get_profile
+
 
 #  -------------------------------------#
 #  Enums
@@ -30,6 +36,8 @@ class BrowserOptionsSpec:
     browser_type: BrowserType
     window_size: Union[str, Tuple[int, int], None]
     headless: bool = False
+    profile: Optional[str] = None
+    """name of a PerformanceProfile in quick_qa.web.profiles, None for the default"""
 
 
 class _DriverBuilderProtocol(Protocol):
@@ -53,6 +61,7 @@ class BrowserOptionsSpecBuilder:
     _browser_type: Optional[BrowserType] = None
     _headless: bool = False
     _window_size: Union[str, Tuple[int, int], None] = None
+    _profile: Optional[str] = None
 
     @staticmethod
     def create() -> BrowserOptionsSpecBuilder:
@@ -94,6 +103,21 @@ class BrowserOptionsSpecBuilder:
             return_value = tuple([int(x) for x in value.split(",")])
         return replace(self, _window_size=return_value)
 
+    def set_profile(self, name: Optional[str]) -> BrowserOptionsSpecBuilder:
+        """sets the performance profile
+
+        Args:
+            name (Optional[str]): a key of quick_qa.web.profiles.PROFILES
+
+        Raises:
+            ValueError: unknown profile
+
+        Returns:
+            BrowserOptionsBuilder:
+        """
+        get_profile(name)
+        return replace(self, _profile=name)
+
     def build(self) -> BrowserOptionsSpec:
         """builds the BrowserOptions
 
@@ -109,6 +133,26 @@ class BrowserOptionsSpecBuilder:
             browser_type=self._browser_type,
             headless=self._headless,
             window_size=self._window_size,
+            profile=self._profile,
+        )
+
+    @staticmethod
+    def from_driver_spec(spec: DriverSpec) -> BrowserOptionsSpec:
+        """builds the BrowserOptions for a Config.drivers entry
+
+        Args:
+            spec (DriverSpec):
+
+        Returns:
+            BrowserOptionsSpec:
+        """
+        return (
+            BrowserOptionsSpecBuilder.create()
+            .set_browser_type(BrowserType(spec.browser))
+            .set_headless(spec.headless)
+            .set_window_size(spec.window_size)
+            .set_profile(spec.profile)
+            .build()
         )
 
 
@@ -131,6 +175,20 @@ class ChromeBuilder:
             self.options.add_argument(
                 f"--window-size={self._opts_spec.window_size[0]},{self._opts_spec.window_size[1]}"
             )
+        self._apply_profile()
+
+    def _apply_profile(self) -> None:
+        profile = get_profile(self._opts_spec.profile)
+        if profile.page_load_strategy:
+            self.options.page_load_strategy = profile.page_load_strategy
+        for arg in profile.chrome_args:
+            self.options.add_argument(arg)
+        prefs = dict(profile.chrome_prefs)
+        if profile.block_images:
+            prefs["profile.managed_default_content_settings.images"] = 2
+            self.options.add_argument("--blink-settings=imagesEnabled=false")
+        if prefs:
+            self.options.add_experimental_option("prefs", prefs)
 
     def build(self) -> WebDriver:
         """returns the webdriver"""
@@ -154,6 +212,20 @@ class FirefoxBuilder:
             self.options.add_argument(
                 f"--window-size={self._opts_spec.window_size[0]},{self._opts_spec.window_size[1]}"
             )
+        self._apply_profile()
+        if any(Config.blocklist.values()) or Config.network_idle["events"]:
+            # requests are blocked and followed over BiDi
+            self.options.enable_bidi = True
+
+    def _apply_profile(self) -> None:
+        profile = get_profile(self._opts_spec.profile)
+        if profile.page_load_strategy:
+            self.options.page_load_strategy = profile.page_load_strategy
+        prefs = dict(profile.firefox_prefs)
+        if profile.block_images:
+            prefs["permissions.default.image"] = 2
+        for key, value in prefs.items():
+            self.options.set_preference(key, value)
 
     def build(self) -> WebDriver:
         """returns the webdriver"""
@@ -203,4 +275,31 @@ class DriverFactory:
             raise ValueError(f"Unsupported browser type: {opts.browser_type}") from exc
 
         builder = builder_cls(opts)
-        return builder.build()
+        driver = builder.build()
+        install_blocker(driver, **Config.blocklist)
+        if Config.network_idle["events"]:
+            install_monitor(driver)
+        return driver
+
+    @staticmethod
+    def prewarm(specs: Optional[Iterable[BrowserOptionsSpec]] = None) -> List[Future]:
+        """starts launching sessions on background threads into the shared
+        driver pool, so browsers boot while pytest collects and runs other
+        tests. leasing one of them only blocks until it is up. launch times
+        are logged and kept in ``get_pool().warmup_times``.
+
+        Args:
+            specs (Optional[Iterable[BrowserOptionsSpec]], optional): Defaults
+                to one session per Config.drivers entry.
+
+        Returns:
+            List[Future]: resolve to the launch time in seconds
+        """
+        from quick_qa.web.driver_pool import get_pool
+
+        if specs is None:
+            specs = [
+                BrowserOptionsSpecBuilder.from_driver_spec(spec)
+                for spec in Config.drivers
+            ]
+        return get_pool().prewarm(specs)
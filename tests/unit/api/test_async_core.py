@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from pytest_mock import MockerFixture
+from requests import Response
+
+from quick_qa.api import async_core
+from quick_qa.api.async_core import AsyncBaseEndpoint, ConcurrencyLimiter
+
+
+class MyEndpoint(AsyncBaseEndpoint):
+    path_url = "/mypath"
+
+
+@pytest.fixture
+def limiter():
+    lim = ConcurrencyLimiter(2)
+    yield lim
+    lim.shutdown()
+
+
+class TestConcurrencyLimiter:
+    def test_run(self, limiter: ConcurrencyLimiter):
+        result = asyncio.run(limiter.run(lambda a, b=0: a + b, 1, b=2))
+
+        assert result == 3
+
+    def test_run_is_bounded(self, limiter: ConcurrencyLimiter):
+        lock = threading.Lock()
+        running = {"now": 0, "peak": 0}
+
+        def blocking():
+            with lock:
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+            time.sleep(0.02)
+            with lock:
+                running["now"] -= 1
+
+        async def main():
+            await asyncio.gather(*(limiter.run(blocking) for _ in range(8)))
+
+        asyncio.run(main())
+
+        assert running["peak"] == 2
+
+    def test_semaphore_per_loop(self, limiter: ConcurrencyLimiter):
+        async def get():
+            return limiter.semaphore()
+
+        first = asyncio.run(get())
+        second = asyncio.run(get())
+
+        assert first is not second
+
+
+def test_set_concurrency(mocker: MockerFixture):
+    mocker.patch.object(async_core, "_limiter", None)
+
+    async_core.set_concurrency(3)
+
+    assert async_core.get_limiter().limit == 3
+    async_core.get_limiter().shutdown()
+
+
+class TestAsyncBaseEndpoint:
+    @pytest.mark.parametrize("code, expected", [(200, True), (404, False)])
+    def test_ping(self, code, expected, mocker: MockerFixture):
+        mock_response = mocker.Mock(spec=Response)
+        mock_response.status_code = code
+        mock_response.headers = {}
+        mock_options = mocker.patch.object(MyEndpoint._session, "options")
+        mock_options.return_value = mock_response
+        endpoint = MyEndpoint("http://www.myurl.com")
+
+        result = asyncio.run(endpoint.ping())
+
+        mock_options.assert_called_once_with(endpoint.endpoint_url)
+        assert result is expected
+
+    def test_allowed_methods(self, mocker: MockerFixture):
+        mock_response = mocker.Mock(spec=Response)
+        mock_response.status_code = 200
+        mock_response.headers = {"Allow": "GET POST"}
+        mocker.patch.object(MyEndpoint._session, "options", return_value=mock_response)
+
+        result = asyncio.run(MyEndpoint("http://www.myurl.com").allowed_methods())
+
+        assert result == ["GET", "POST"]
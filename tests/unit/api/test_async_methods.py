@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+from pytest_mock.plugin import MockerFixture
+from requests import Response
+
+from quick_qa.api.async_methods import AsyncDelete, AsyncGet, AsyncPost, AsyncPut
+from quick_qa.api.core import BaseEndpoint
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+@pytest.fixture
+def base_endpoint_obj():
+    BaseEndpoint.path_url = "/mypath"
+    be = BaseEndpoint("http://www.myurl.com")
+    yield be
+    BaseEndpoint.path_url = None
+
+
+@pytest.fixture
+def mock_session(mocker: MockerFixture):
+    ms = mocker.patch.multiple(
+        BaseEndpoint._session,
+        get=mocker.DEFAULT,
+        post=mocker.DEFAULT,
+        put=mocker.DEFAULT,
+        delete=mocker.DEFAULT,
+    )
+    yield ms
+
+
+@pytest.fixture
+def mock_response(mocker: MockerFixture):
+    mr = mocker.Mock(spec=Response)
+    mr.status_code = 200
+    yield mr
+
+
+def test_async_get(base_endpoint_obj, mock_session, mock_response):
+    mock_session["get"].return_value = mock_response
+    get = AsyncGet(base_endpoint_obj)
+
+    res = asyncio.run(get.get(params={"id": 1}))
+
+    mock_session["get"].assert_called_once_with(
+        url=get.endpoint_url, params={"id": 1}, stream=False
+    )
+    assert res == mock_response
+
+
+def test_async_get_gather(base_endpoint_obj, mock_session, mock_response):
+    mock_session["get"].return_value = mock_response
+    get = AsyncGet(base_endpoint_obj)
+
+    async def main():
+        return await asyncio.gather(*(get.get(params={"id": i}) for i in range(20)))
+
+    results = asyncio.run(main())
+
+    assert results == [mock_response] * 20
+    assert mock_session["get"].call_count == 20
+
+
+def test_async_post(base_endpoint_obj, mock_session, mock_response):
+    mock_session["post"].return_value = mock_response
+    post = AsyncPost(base_endpoint_obj)
+
+    res = asyncio.run(post.post(data={}, json=""))
+
+    mock_session["post"].assert_called_once_with(
+        url=post.endpoint_url, data=b'""', headers=JSON_HEADERS
+    )
+    assert res == mock_response
+
+
+def test_async_put(base_endpoint_obj, mock_session, mock_response):
+    mock_session["put"].return_value = mock_response
+    put = AsyncPut(base_endpoint_obj)
+
+    res = asyncio.run(put.put(data={}, json=""))
+
+    mock_session["put"].assert_called_once_with(
+        url=put.endpoint_url, data=b'""', headers=JSON_HEADERS
+    )
+    assert res == mock_response
+
+
+def test_async_delete(base_endpoint_obj, mock_session, mock_response):
+    mock_session["delete"].return_value = mock_response
+    delete = AsyncDelete(base_endpoint_obj)
+
+    res = asyncio.run(delete.delete(data={}))
+
+    mock_session["delete"].assert_called_once_with(url=delete.endpoint_url, data={})
+    assert res == mock_response
+
+
+def test_batch_runs_the_blocking_verb(base_endpoint_obj, mock_session, mock_response):
+    mock_session["get"].return_value = mock_response
+    get = AsyncGet(base_endpoint_obj)
+
+    results = list(get.batch("get", [{"params": {"id": i}} for i in range(3)]))
+
+    assert [r.response for r in results] == [mock_response] * 3
+    assert mock_session["get"].call_count == 3
+
+
+def test_batch_unknown_verb(base_endpoint_obj):
+    with pytest.raises(AttributeError, match="post"):
+        AsyncGet(base_endpoint_obj).batch("post", [{}])
+
+
+def test_load_runs_the_blocking_verb(base_endpoint_obj, mock_session, mock_response):
+    mock_session["get"].return_value = mock_response
+    get = AsyncGet(base_endpoint_obj)
+
+    report = get.load("get", duration=0.1, concurrency=2)
+
+    assert report.requests > 0
+    assert report.errors == 0
+    assert report.status_codes == {200: report.requests}
+    mock_session["get"].assert_called_with(
+        url=get.endpoint_url, params=None, stream=False
+    )
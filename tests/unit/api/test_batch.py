@@ -0,0 +1,70 @@
+import itertools
+import random
+import threading
+import time
+
+import pytest
+
+from quick_qa.api.batch import BatchResult, run_batch
+
+
+def _echo(**payload):
+    time.sleep(random.random() / 500)
+    return payload["value"]
+
+
+class TestRunBatch:
+    def test_results_in_input_order(self):
+        payloads = [{"value": i} for i in range(50)]
+
+        results = list(run_batch(_echo, payloads, workers=8))
+
+        assert [r.index for r in results] == list(range(50))
+        assert [r.response for r in results] == list(range(50))
+        assert all(r.elapsed >= 0 for r in results)
+        assert all(r.ok for r in results)
+
+    def test_call_error(self):
+        def call(**payload):
+            raise ConnectionError("down")
+
+        result = next(run_batch(call, [{}], workers=1))
+
+        assert result.response is None
+        assert isinstance(result.error, ConnectionError)
+        assert result.ok is False
+
+    @pytest.mark.parametrize("valid, ok", [(True, True), (ValueError("bad"), False)])
+    def test_validator(self, valid, ok):
+        threads = []
+
+        def validator(response):
+            threads.append(threading.current_thread().name)
+            return valid
+
+        result = next(run_batch(_echo, [{"value": 1}], workers=1, validator=validator))
+
+        assert result.valid is valid
+        assert result.ok is ok
+        assert threads[0].startswith("quick_qa_batch")
+
+    def test_payloads_pulled_lazily(self):
+        pulled = []
+
+        def payloads():
+            for i in itertools.count():
+                pulled.append(i)
+                yield {"value": i}
+
+        results = run_batch(_echo, payloads(), workers=2, window=4)
+        first = [next(results) for _ in range(3)]
+        results.close()
+
+        assert [r.index for r in first] == [0, 1, 2]
+        assert len(pulled) <= 3 + 4
+
+    def test_result_type(self):
+        result = next(run_batch(_echo, [{"value": 1}], workers=1))
+
+        assert isinstance(result, BatchResult)
+        assert result.payload == {"value": 1}
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+from jsonschema.exceptions import SchemaError
+from pytest_mock import MockerFixture
+from requests import Response
+
+from quick_qa.api.bulk import BulkValidator, ItemError, validate_bulk
+from quick_qa.api.core import BaseEndpoint
+
+SCHEMA = {
+    "type": "object",
+    "required": ["id"],
+    "properties": {"id": {"type": "integer", "minimum": 0}},
+}
+
+BODIES = [{"id": 1}, {"id": -1}, {}, {"id": 2}, b'{"id": "x"}', b"{", b'{"id": 3}']
+
+
+def check(results):
+    assert [r.index for r in results] == list(range(len(BODIES)))
+    assert [r.valid for r in results] == [True, False, False, True, False, False, True]
+    assert results[1].errors == (
+        ItemError(
+            message="-1 is less than the minimum of 0",
+            path=("id",),
+            validator="minimum",
+            schema_path=("properties", "id", "minimum"),
+        ),
+    )
+    assert results[2].errors[0].validator == "required"
+    assert results[4].errors[0].path == ("id",)
+    assert results[5].errors[0].validator == "decode"
+
+
+@pytest.mark.parametrize("fast", [False, True])
+def test_in_process(fast):
+    check(validate_bulk(SCHEMA, BODIES, workers=1, fast=fast))
+
+
+def test_process_pool():
+    with BulkValidator(SCHEMA, workers=2) as validator:
+        check(validator.validate(BODIES, chunk_size=2))
+        # the pool is reused for the next batch
+        pool = validator._pool
+        assert validator.validate([{"id": 1}] * 4, chunk_size=1)[3].valid
+        assert validator._pool is pool
+
+    assert validator._pool is None
+
+
+def test_max_errors():
+    results = validate_bulk(
+        {"type": "array", "items": {"type": "string"}}, [[1, 2, 3]], max_errors=2
+    )
+
+    assert [e.path for e in results[0].errors] == [(0,), (1,)]
+
+
+def test_empty():
+    assert validate_bulk(SCHEMA, []) == []
+
+
+def test_invalid_schema():
+    with pytest.raises(SchemaError):
+        BulkValidator({"type": "nope"})
+
+
+def test_valid_schema_bulk(mocker: MockerFixture):
+    mocker.patch.object(BaseEndpoint, "expected_schema", SCHEMA)
+    mocker.patch.object(BaseEndpoint, "path_url", "/x")
+    responses = []
+    for body in ({"id": 1}, {"id": -1}):
+        response = mocker.Mock(spec=Response)
+        response.content = json.dumps(body).encode()
+        responses.append(response)
+
+    results = BaseEndpoint("http://a.com").valid_schema_bulk(responses, workers=2)
+
+    assert [r.valid for r in results] == [True, False]
@@ -0,0 +1,215 @@
+import pytest
+from pytest_mock import MockerFixture
+from requests import Response, Session
+
+from quick_qa.api import cache as cache_module
+from quick_qa.api.cache import ResponseCache, normalize_params
+
+
+def make_response(status=200, body=b"{}", headers=None) -> Response:
+    res = Response()
+    res.status_code = status
+    res._content = body
+    res.headers.update(headers or {})
+    return res
+
+
+@pytest.fixture
+def session(mocker: MockerFixture):
+    yield mocker.Mock(spec=Session)
+
+
+@pytest.fixture
+def clock(mocker: MockerFixture):
+    now = {"t": 1000.0}
+    mocker.patch("quick_qa.api.cache.time.monotonic", side_effect=lambda: now["t"])
+    yield now
+
+
+@pytest.mark.parametrize(
+    "params, expected",
+    [
+        (None, ()),
+        ({}, ()),
+        ({"b": 2, "a": "1"}, (("a", "1"), ("b", "2"))),
+        ({"a": [2, 1], "b": None}, (("a", "1"), ("a", "2"))),
+    ],
+)
+def test_normalize_params(params, expected):
+    assert normalize_params(params) == expected
+
+
+class TestResponseCache:
+    def test_hit(self, session):
+        session.get.return_value = make_response(body=b'{"a": 1}')
+        cache = ResponseCache(max_bytes=1000, ttl=60)
+
+        first = cache.get(session, "http://a.com", {"x": 1, "y": 2})
+        second = cache.get(session, "http://a.com", {"y": 2, "x": 1})
+
+        session.get.assert_called_once()
+        assert second.json() == {"a": 1}
+        assert second is not first
+        assert cache.stats()["total"]["hits"] == 1
+        assert cache.stats()["total"]["misses"] == 1
+
+    def test_revalidate_304(self, session, clock):
+        session.get.side_effect = [
+            make_response(body=b"[1]", headers={"ETag": '"v1"', "Last-Modified": "x"}),
+            make_response(status=304, body=b""),
+        ]
+        cache = ResponseCache(max_bytes=1000, ttl=10)
+
+        cache.get(session, "http://a.com")
+        clock["t"] += 11
+        result = cache.get(session, "http://a.com", label="Mine")
+
+        session.get.assert_called_with(
+            url="http://a.com",
+            params=None,
+            headers={"If-None-Match": '"v1"', "If-Modified-Since": "x"},
+        )
+        assert result.json() == [1]
+        assert cache.stats()["labels"]["Mine"]["revalidated"] == 1
+        assert cache.stats()["labels"]["Mine"]["bytes_saved"] == 3
+
+    def test_stale_changed(self, session, clock):
+        session.get.side_effect = [
+            make_response(body=b"[1]", headers={"ETag": '"v1"'}),
+            make_response(body=b"[2]", headers={"ETag": '"v2"'}),
+        ]
+        cache = ResponseCache(max_bytes=1000, ttl=10)
+
+        cache.get(session, "http://a.com")
+        clock["t"] += 11
+        result = cache.get(session, "http://a.com")
+        again = cache.get(session, "http://a.com")
+
+        assert result.json() == [2]
+        assert again.json() == [2]
+        assert session.get.call_count == 2
+
+    def test_hits_dont_share_headers(self, session):
+        session.get.return_value = make_response(headers={"X-Id": "1"})
+        cache = ResponseCache(max_bytes=1000, ttl=60)
+
+        first = cache.get(session, "http://a.com")
+        first.headers["X-Id"] = "changed"
+        second = cache.get(session, "http://a.com")
+        second.headers["X-Id"] = "changed again"
+
+        assert cache.get(session, "http://a.com").headers["X-Id"] == "1"
+
+    def test_304_refreshes_validators(self, session, clock):
+        session.get.side_effect = [
+            make_response(body=b"[1]", headers={"ETag": '"v1"'}),
+            make_response(status=304, body=b"", headers={"ETag": '"v2"'}),
+            make_response(status=304, body=b""),
+        ]
+        cache = ResponseCache(max_bytes=1000, ttl=10)
+
+        cache.get(session, "http://a.com")
+        clock["t"] += 11
+        assert cache.get(session, "http://a.com").headers["ETag"] == '"v2"'
+        clock["t"] += 11
+        cache.get(session, "http://a.com")
+
+        assert session.get.call_args.kwargs["headers"] == {"If-None-Match": '"v2"'}
+
+    @pytest.mark.parametrize(
+        "cache_control, seconds, fresh",
+        [
+            ("max-age=120", 100, True),
+            ("public, max-age=5", 6, False),
+            ("no-cache", 0, False),
+            ("", 59, True),
+        ],
+    )
+    def test_freshness_from_cache_control(
+        self, session, clock, cache_control, seconds, fresh
+    ):
+        session.get.return_value = make_response(
+            headers={"Cache-Control": cache_control}
+        )
+        cache = ResponseCache(max_bytes=1000, ttl=60)
+
+        cache.get(session, "http://a.com")
+        clock["t"] += seconds
+        cache.get(session, "http://a.com")
+
+        assert session.get.call_count == (1 if fresh else 2)
+
+    @pytest.mark.parametrize(
+        "response",
+        [
+            make_response(status=404),
+            make_response(headers={"Cache-Control": "no-store"}),
+        ],
+    )
+    def test_not_cacheable(self, response, session):
+        session.get.return_value = response
+        cache = ResponseCache(max_bytes=1000, ttl=60)
+
+        cache.get(session, "http://a.com")
+        cache.get(session, "http://a.com")
+
+        assert session.get.call_count == 2
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction(self, session):
+        session.get.side_effect = lambda url, **kw: make_response(body=b"x" * 40)
+        cache = ResponseCache(max_bytes=100, ttl=60)
+
+        cache.get(session, "http://a.com/1")
+        cache.get(session, "http://a.com/2")
+        cache.get(session, "http://a.com/1")
+        cache.get(session, "http://a.com/3")
+
+        stats = cache.stats()
+        assert stats["entries"] == 2
+        assert stats["size"] == 80
+        assert stats["evictions"] == 1
+        cache.get(session, "http://a.com/1")
+        assert session.get.call_count == 3
+
+    def test_too_large(self, session):
+        session.get.return_value = make_response(body=b"x" * 200)
+        cache = ResponseCache(max_bytes=100, ttl=60)
+
+        cache.get(session, "http://a.com")
+
+        assert cache.stats()["entries"] == 0
+
+    def test_clear(self, session):
+        session.get.return_value = make_response()
+        cache = ResponseCache(max_bytes=100, ttl=60)
+        cache.get(session, "http://a.com")
+
+        cache.clear()
+
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["size"] == 0
+
+
+def test_get_cache(mocker: MockerFixture):
+    mocker.patch.object(cache_module, "_cache", None)
+    mocker.patch.object(cache_module.ApiConfigs, "cache", {"max_bytes": 10, "ttl": 1.0})
+
+    cache = cache_module.get_cache()
+
+    assert cache is cache_module.get_cache()
+    assert cache.max_bytes == 10
+    assert cache.ttl == 1.0
+
+
+def test_get_cache_follows_config_loaded_later(mocker: MockerFixture, session):
+    mocker.patch.object(cache_module, "_cache", None)
+    mocker.patch.dict(cache_module.ApiConfigs.cache, {"max_bytes": 1000, "ttl": 60.0})
+    cache = cache_module.get_cache()
+    session.get.return_value = make_response(body=b"x" * 200)
+
+    mocker.patch.dict(cache_module.ApiConfigs.cache, {"max_bytes": 100})
+    cache.get(session, "http://a.com")
+
+    assert cache.max_bytes == 100
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,163 @@
+import pytest
+from pytest_mock import MockerFixture
+from requests import Request
+from requests.adapters import BaseAdapter
+
+from quick_qa.api import cassette as cassette_module
+from quick_qa.api.cassette import (
+    Cassette,
+    CassetteAdapter,
+    CassetteMiss,
+    CassetteMode,
+    request_key,
+    use_cassette,
+)
+from quick_qa.api.core import BaseEndpoint
+from quick_qa.api.methods import Get
+from quick_qa.api.session import PooledSession
+
+
+class Items(BaseEndpoint):
+    path_url = "/items"
+
+
+@pytest.fixture
+def path(tmp_path):
+    yield str(tmp_path / "cassettes" / "items.json.gz")
+
+
+@pytest.fixture
+def session():
+    s = PooledSession()
+    yield s
+    s.close()
+
+
+def prepare(method, url, **kwargs):
+    return Request(method, url, **kwargs).prepare()
+
+
+class TestRequestKey:
+    def test_query_order(self):
+        first = prepare("GET", "http://a.com/x", params={"b": 1, "a": 2})
+        second = prepare("GET", "http://a.com/x", params={"a": 2, "b": 1})
+
+        assert request_key(first) == request_key(second)
+
+    def test_body(self):
+        first = prepare("POST", "http://a.com/x", json={"a": 1})
+        second = prepare("POST", "http://a.com/x", json={"a": 2})
+
+        assert request_key(first) != request_key(second)
+        assert request_key(prepare("GET", "http://a.com/x")).endswith(" -")
+
+
+class TestCassette:
+    def test_record_then_replay(self, path, session, local_url, mocker: MockerFixture):
+        endpoint = Items(local_url)
+        mocker.patch.object(Items, "_session", session)
+
+        with use_cassette(path, CassetteMode.RECORD, session=session) as recording:
+            recorded = Get(endpoint).get(params={"id": 1})
+        assert len(recording) == 1
+        assert not isinstance(session.get_adapter(local_url), CassetteAdapter)
+
+        inner = mocker.Mock(spec=BaseAdapter)
+        session.mount("http://", inner)
+        with use_cassette(path, CassetteMode.STRICT, session=session):
+            replayed = Get(endpoint).get(params={"id": 1})
+            streamed = b"".join(
+                Get(endpoint).get({"id": 1}, stream=True).iter_content(3)
+            )
+
+        inner.send.assert_not_called()
+        assert replayed.status_code == recorded.status_code
+        assert replayed.json() == recorded.json()
+        assert replayed.headers["Content-Type"] == "application/json"
+        assert streamed == recorded.content
+
+    def test_strict_miss(self, path, session, local_url):
+        with use_cassette(path, CassetteMode.RECORD, session=session):
+            session.get(local_url + "/a")
+
+        with use_cassette(path, CassetteMode.STRICT, session=session):
+            with pytest.raises(CassetteMiss):
+                session.get(local_url + "/b")
+
+    def test_replay_falls_through(self, path, session, local_url):
+        with use_cassette(path, CassetteMode.RECORD, session=session):
+            session.get(local_url + "/a")
+
+        with use_cassette(path, CassetteMode.REPLAY, session=session):
+            response = session.get(local_url + "/b")
+
+        assert response.json()["path"] == "/b"
+
+    def test_repeated_requests_replay_in_order(self, path, session, local_url):
+        with use_cassette(path, CassetteMode.RECORD, session=session):
+            session.get(local_url + "/status/500")
+            session.get(local_url + "/status/500")
+
+        cassette = Cassette(path, CassetteMode.STRICT)
+        request = prepare("GET", local_url + "/status/500")
+
+        assert len(cassette) == 2
+        assert cassette.play(request).status_code == 500
+        assert cassette.play(request).status_code == 500
+        assert cassette.play(request).status_code == 500
+
+    def test_replay_missing_file(self, path):
+        with pytest.raises(FileNotFoundError):
+            Cassette(path, CassetteMode.REPLAY)
+
+
+def test_mount_configured_cassette(path, session, mocker: MockerFixture):
+    mocker.patch.object(
+        cassette_module.ApiConfigs, "cassette", {"path": path, "mode": "record"}
+    )
+    mock_register = mocker.patch("quick_qa.api.cassette.atexit.register")
+
+    cassette = cassette_module.mount_configured_cassette(session)
+
+    assert cassette.mode is CassetteMode.RECORD
+    assert isinstance(session.get_adapter("http://a.com"), CassetteAdapter)
+    mock_register.assert_called_once_with(cassette.save)
+
+
+def test_configure_twice_keeps_recording(path, session, local_url, mocker):
+    mocker.patch.object(
+        cassette_module.ApiConfigs, "cassette", {"path": path, "mode": "record"}
+    )
+    mocker.patch("quick_qa.api.cassette.atexit.register")
+    mock_unregister = mocker.patch("quick_qa.api.cassette.atexit.unregister")
+
+    first = cassette_module.mount_configured_cassette(session)
+    session.get(local_url + "/a")
+    session.configure()
+    second = cassette_module.mount_configured_cassette(session)
+    session.get(local_url + "/b")
+    second.unmount()
+
+    assert second is first
+    assert session.cassette is first
+    mock_unregister.assert_called_with(first.save)
+    assert len(Cassette(path, CassetteMode.STRICT)) == 2
+
+
+def test_record_streamed_response(path, session, local_url, mocker):
+    endpoint = Items(local_url)
+    mocker.patch.object(Items, "_session", session)
+
+    with use_cassette(path, CassetteMode.RECORD, session=session) as recording:
+        response = Get(endpoint).get(stream=True)
+        assert len(recording) == 0
+        body = b"".join(response.iter_content(4))
+        assert len(recording) == 1
+        # closed before reading, the rest is read for the cassette
+        Get(endpoint).get(stream=True).close()
+
+    replayed = Cassette(path, CassetteMode.STRICT)
+    request = prepare("GET", local_url + "/items")
+    assert len(replayed) == 2
+    assert replayed.play(request).content == body
+    assert replayed.play(request).content == body
@@ -0,0 +1,93 @@
+import gzip
+import json
+import zlib
+
+import pytest
+from pytest_mock import MockerFixture
+
+from quick_qa.api import codec as codec_module
+from quick_qa.api.codec import JsonCodec, compress, encode_json, get_codec
+from quick_qa.api.configs import ApiConfigs
+from quick_qa.api.core import BaseEndpoint
+
+BODY = {"id": 1, "name": "é", "tags": ["a", None], "score": 1.5}
+
+
+@pytest.mark.parametrize("name", ["json", "orjson"])
+def test_round_trip(name):
+    codec = get_codec(name)
+
+    encoded = codec.dumps(BODY)
+
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == BODY
+    assert codec.loads(encoded) == BODY
+    assert codec.loads(encoded.decode()) == BODY
+
+
+def test_orjson_fallbacks():
+    codec = get_codec("orjson")
+
+    assert json.loads(codec.dumps({1: 2**70})) == {"1": 2**70}
+    assert codec.loads('{"a": 1}'.encode("utf-16")) == {"a": 1}
+    with pytest.raises(ValueError):
+        codec.loads(b"{")
+
+
+def test_get_codec(mocker: MockerFixture):
+    assert get_codec("auto") is get_codec("orjson")
+
+    mocker.patch.dict(codec_module._codecs, {"json": JsonCodec()}, clear=True)
+    assert get_codec("auto").name == "json"
+    with pytest.raises(ValueError, match="not available"):
+        get_codec("orjson")
+
+
+@pytest.mark.parametrize(
+    "encoding, decompress", [("gzip", gzip.decompress), ("deflate", zlib.decompress)]
+)
+def test_compress(encoding, decompress):
+    assert decompress(compress(b"abc" * 100, encoding)) == b"abc" * 100
+
+
+def test_compress_unknown():
+    with pytest.raises(ValueError, match="unknown encoding"):
+        compress(b"", "br")
+
+
+def test_encode_json_threshold():
+    codec = get_codec("json")
+
+    small, small_headers = encode_json([1], codec, "gzip", min_size=100)
+    large, large_headers = encode_json(list(range(100)), codec, "gzip", min_size=100)
+
+    assert small == b"[1]"
+    assert "Content-Encoding" not in small_headers
+    assert large_headers == {
+        "Content-Type": "application/json",
+        "Content-Encoding": "gzip",
+    }
+    assert json.loads(gzip.decompress(large)) == list(range(100))
+
+
+def test_endpoint_codec(mocker: MockerFixture):
+    class Fast(BaseEndpoint):
+        json_codec = "json"
+
+    mocker.patch.object(ApiConfigs, "codec", "orjson")
+
+    assert Fast.codec().name == "json"
+    assert BaseEndpoint.codec().name == "orjson"
+
+
+def test_endpoint_codec_instance_override(mocker: MockerFixture):
+    class Users(BaseEndpoint):
+        path_url = "/users"
+
+    mocker.patch.object(ApiConfigs, "codec", "orjson")
+    endpoint = Users("http://www.myurl.com")
+
+    endpoint.json_codec = "json"
+
+    assert endpoint.codec().name == "json"
+    assert BaseEndpoint.codec().name == "orjson"
@@ -0,0 +1,74 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from quick_qa.api.configs import ApiConfigs
+
+
+@pytest.fixture
+def restore_configs():
+    saved = {k: getattr(ApiConfigs, k) for k in ("base_url", "pool", "cache", "retry")}
+    yield
+    for key, value in saved.items():
+        setattr(ApiConfigs, key, value)
+
+
+class TestApiConfigs:
+    def test_set_values(self, mocker: MockerFixture, restore_configs):
+        mocker.patch(
+            "quick_qa.api.configs.Configuration.get_config",
+            return_value={"base_url": "http://www.myurl.com", "pool": {"maxsize": 32}},
+        )
+
+        ApiConfigs.set_values()
+
+        assert ApiConfigs.base_url == "http://www.myurl.com"
+        assert ApiConfigs.pool["maxsize"] == 32
+        assert ApiConfigs.pool["hosts"] == 10
+
+    def test_set_values_merges_retry(self, mocker: MockerFixture, restore_configs):
+        mocker.patch(
+            "quick_qa.api.configs.Configuration.get_config",
+            return_value={"retry": {"attempts": 3}},
+        )
+
+        ApiConfigs.set_values()
+
+        assert ApiConfigs.retry["attempts"] == 3
+        assert ApiConfigs.retry["statuses"] == [502, 503, 504]
+
+    def test_set_values_no_config(self, mocker: MockerFixture, restore_configs):
+        mocker.patch("quick_qa.api.configs.Configuration.get_config", return_value=None)
+
+        ApiConfigs.set_values()
+
+        assert ApiConfigs.base_url is None
+
+    @pytest.mark.parametrize(
+        "data, match",
+        [
+            ({"base_url": "not a url"}, "base_url"),
+            ({"pool": []}, "mapping"),
+            ({"pool": {"size": 1}}, "unexpected keys"),
+            ({"pool": {"maxsize": 0}}, "positive int"),
+            ({"pool": {"hosts": True}}, "positive int"),
+            ({"pool": {"prewarm": -1}}, "prewarm"),
+            ({"pool": {"keep_alive": "yes"}}, "bool"),
+            ({"concurrency": 0}, "concurrency"),
+            ({"cache": {"size": 1}}, "unexpected keys"),
+            ({"cache": {"max_bytes": 0}}, "max_bytes"),
+            ({"cache": {"ttl": -1}}, "ttl"),
+            ({"probe_ttl": "1"}, "probe_ttl"),
+            ({"cassette": {"mode": "record"}}, "path"),
+            ({"cassette": {"path": "a", "mode": "live"}}, "mode"),
+            ({"metrics": {"csv": "a"}}, "metrics"),
+            ({"metrics": {"json": 1}}, "paths"),
+            ({"codec": "ujson"}, "codec"),
+            ({"breaker": {"threshold": 0}}, "threshold"),
+            ({"retry": {"jitter": True}}, "unexpected"),
+            ({"retry": {"statuses": ["503"]}}, "statuses"),
+            ({"retry": {"methods": "GET"}}, "methods"),
+        ],
+    )
+    def test_validate_data_error(self, data, match):
+        with pytest.raises(ValueError, match=match):
+            ApiConfigs._validate_data(data)
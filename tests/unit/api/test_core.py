@@ -1,7 +1,12 @@
+import json
+
 import pytest
+from jsonschema.exceptions import ValidationError
 from pytest_mock.plugin import MockerFixture
 
 from quick_qa.api.core import BaseEndpoint, Response, Session
+from quick_qa.api.session import PooledSession
+from quick_qa.api.streaming import StreamValidationError
 
 
 @pytest.fixture(autouse=True)
@@ -16,6 +21,15 @@ def base_url():
     yield url
 
 
+@pytest.fixture
+def schema():
+    yield {
+        "type": "object",
+        "required": ["name"],
+        "properties": {"name": {"type": "string"}},
+    }
+
+
 @pytest.fixture
 def base_endpoint(base_url):
     BaseEndpoint.path_url = "/mypath"
@@ -31,6 +45,7 @@ class TestBaseEndpoint:
         be = BaseEndpoint(base_url=base_url)
 
         assert isinstance(be._session, Session)
+        assert isinstance(be._session, PooledSession)
         assert be.base_url == base_url
         assert be.path_url == path_url
         assert be.endpoint_url == base_url + path_url
@@ -41,33 +56,109 @@ class TestBaseEndpoint:
             BaseEndpoint(base_url)
 
     @pytest.mark.parametrize(
-        "side_effect, result",
-        [(TypeError("my error"), TypeError("my error")), (None, True)],
+        "body, expected",
+        [({"name": "me"}, True), ({"name": 1}, ValidationError), ({}, ValidationError)],
     )
+    @pytest.mark.parametrize("fast", [False, True])
     def test_valid_schema(
-        self, side_effect, result, mocker: MockerFixture, base_endpoint
+        self, body, expected, fast, mocker: MockerFixture, base_endpoint, schema
     ):
-        mock_jsonschema = mocker.patch("quick_qa.api.core.jsonschema")
-        mock_jsonschema.validate.return_value = None
-        mock_jsonschema.validate.side_effect = side_effect
+        mocker.patch.object(BaseEndpoint, "expected_schema", schema)
+        mocker.patch.object(BaseEndpoint, "fast_schema", fast)
+        mock_response = mocker.Mock(spec=Response)
+        mock_response.content = json.dumps(body).encode()
+
+        result = base_endpoint.valid_schema(mock_response)
+
+        if expected is True:
+            assert result is True
+        else:
+            assert isinstance(result, expected)
+
+    def test_valid_schema_error(self, mocker: MockerFixture, base_endpoint):
         mock_response = mocker.Mock(spec=Response)
+        mock_response.content = b"{"
 
         result = base_endpoint.valid_schema(mock_response)
 
-        mock_jsonschema.validate.assert_called_once_with(
-            instance=mock_response.json(), schema=BaseEndpoint.expected_schema
+        assert isinstance(result, ValueError)
+
+    @pytest.mark.parametrize(
+        "body, expected",
+        [(b'[{"name": "a"}]', True), (b'[{"name": 1}]', StreamValidationError)],
+    )
+    def test_valid_schema_stream(
+        self, body, expected, mocker: MockerFixture, base_endpoint, schema
+    ):
+        mocker.patch.object(
+            BaseEndpoint, "expected_schema", {"type": "array", "items": schema}
         )
-        assert result is result
+        mock_response = mocker.Mock(spec=Response)
+        mock_response.iter_content.return_value = iter([body])
+
+        result = base_endpoint.valid_schema_stream(mock_response, chunk_size=10)
+
+        mock_response.iter_content.assert_called_once_with(chunk_size=10)
+        mock_response.close.assert_called_once()
+        if expected is True:
+            assert result is True
+        else:
+            assert isinstance(result, expected)
+
+    def test_compiled_schema_cached(self, mocker: MockerFixture, schema):
+        mocker.patch.object(BaseEndpoint, "expected_schema", schema)
+        BaseEndpoint.invalidate_schema()
+
+        first = BaseEndpoint.compiled_schema()
+
+        assert BaseEndpoint.compiled_schema() is first
+        assert first.schema is schema
+
+    def test_compiled_schema_invalidation(self, mocker: MockerFixture, schema):
+        mocker.patch.object(BaseEndpoint, "expected_schema", schema)
+        first = BaseEndpoint.compiled_schema()
+
+        BaseEndpoint.expected_schema = {"type": "array"}
+        second = BaseEndpoint.compiled_schema()
+        BaseEndpoint.invalidate_schema()
+        third = BaseEndpoint.compiled_schema()
+
+        assert second is not first
+        assert second.schema == {"type": "array"}
+        assert third is not second
+
+    def test_compiled_schema_per_class(self, mocker: MockerFixture, schema):
+        class MyEndpoint(BaseEndpoint):
+            path_url = "/mine"
+            expected_schema = {"type": "array"}
+
+        mocker.patch.object(BaseEndpoint, "expected_schema", schema)
+
+        assert BaseEndpoint.compiled_schema().schema is schema
+        assert MyEndpoint.compiled_schema().schema == {"type": "array"}
+
+    def test_compiled_schema_instance_override(
+        self, mocker: MockerFixture, base_endpoint, schema
+    ):
+        mocker.patch.object(BaseEndpoint, "expected_schema", schema)
+        base_endpoint.expected_schema = {"type": "array"}
+        response = mocker.Mock(spec=Response)
+        response.content = b"[]"
+
+        assert base_endpoint.compiled_schema().schema == {"type": "array"}
+        assert BaseEndpoint.compiled_schema().schema is schema
+        assert base_endpoint.valid_schema(response) is True
 
     @pytest.mark.parametrize("code, expected_ping_result", [(200, True), (404, False)])
     def test_ping(
         self, code, expected_ping_result, mocker: MockerFixture, base_endpoint
     ):
-        mock_optionscall = mocker.patch("quick_qa.api.core.requests.options")
+        mock_optionscall = mocker.patch.object(BaseEndpoint._session, "options")
         mock_response = mocker.Mock(spec=Response)
         mock_optionscall.return_value = mock_response
 
         mock_response.status_code = code
+        mock_response.headers = {}
         up = base_endpoint.ping()
 
         mock_optionscall.assert_called_once_with(base_endpoint.endpoint_url)
@@ -76,10 +167,38 @@ class TestBaseEndpoint:
     def test_allowed_methods(self, mocker: MockerFixture, base_endpoint):
         expected_methods = ["options", "get", "post"]
         mock_response = mocker.Mock(spec=Response)
+        mock_response.status_code = 200
         mock_response.headers = {"Allow": "options,get,post"}
-        mock_optionscall = mocker.patch("quick_qa.api.core.requests.options")
+        mock_optionscall = mocker.patch.object(BaseEndpoint._session, "options")
         mock_optionscall.return_value = mock_response
 
         methods = base_endpoint.allowed_methods()
 
         assert methods.sort() == expected_methods.sort()
+        assert sorted(methods) == sorted(expected_methods)
+
+    def test_allowed_methods_missing_header(self, mocker: MockerFixture, base_endpoint):
+        mock_response = mocker.Mock(spec=Response)
+        mock_response.status_code = 200
+        mock_response.headers = {}
+        mocker.patch.object(
+            BaseEndpoint._session, "options", return_value=mock_response
+        )
+
+        assert base_endpoint.allowed_methods() is None
+
+    def test_ping_and_allowed_methods_share_probe(
+        self, mocker: MockerFixture, base_endpoint
+    ):
+        mock_response = mocker.Mock(spec=Response)
+        mock_response.status_code = 204
+        mock_response.headers = {"Allow": "GET, POST"}
+        mock_optionscall = mocker.patch.object(BaseEndpoint._session, "options")
+        mock_optionscall.return_value = mock_response
+
+        assert base_endpoint.ping() is True
+        assert base_endpoint.allowed_methods() == ["GET", "POST"]
+        mock_optionscall.assert_called_once_with(base_endpoint.endpoint_url)
+
+        base_endpoint.probe(refresh=True)
+        assert mock_optionscall.call_count == 2
@@ -0,0 +1,143 @@
+import random
+
+import pytest
+from requests import Session
+
+from quick_qa.api.core import BaseEndpoint
+from quick_qa.api.fake_server import FakeServer, fake_instance
+from quick_qa.api.methods import Delete, Get, Post
+from quick_qa.api.schema import CompiledSchema
+
+USER = {
+    "type": "object",
+    "required": ["id", "email", "created"],
+    "properties": {
+        "id": {"type": "integer", "minimum": 1, "maximum": 10},
+        "email": {"type": "string", "format": "email"},
+        "created": {"type": "string", "format": "date-time"},
+        "name": {"type": "string", "minLength": 2, "maxLength": 4},
+        "score": {"type": ["number", "null"], "exclusiveMaximum": 5},
+        "kind": {"enum": ["a", "b"]},
+        "tags": {"type": "array", "items": {"type": "string"}, "minItems": 5},
+    },
+    "additionalProperties": False,
+}
+
+
+class Users(BaseEndpoint):
+    path_url = "/users"
+    expected_schema = {"type": "array", "items": {"$ref": "#/$defs/user"}}
+    expected_schema["$defs"] = {"user": USER}
+
+
+class Health(BaseEndpoint):
+    path_url = "/health"
+    expected_schema = {"const": "ok"}
+
+
+@pytest.fixture
+def server():
+    with FakeServer(seed=1) as s:
+        yield s
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [
+        USER,
+        Users.expected_schema,
+        {"allOf": [{"required": ["a"]}, {"properties": {"a": {"type": "boolean"}}}]},
+        {"anyOf": [{"type": "integer", "multipleOf": 3, "minimum": 10}]},
+        {"type": "array", "maxItems": 1},
+        True,
+    ],
+)
+def test_fake_instance_matches_schema(schema):
+    instance = fake_instance(schema, random.Random(0))
+
+    assert CompiledSchema(schema).validate(instance) is True
+
+
+def test_fake_instance_is_deterministic():
+    assert fake_instance(USER, random.Random(3)) == fake_instance(
+        USER, random.Random(3)
+    )
+
+
+class TestFakeServer:
+    def test_get_serves_valid_body(self, server):
+        body = server.register(Users)
+        endpoint = Users(server.base_url)
+
+        response = Get(endpoint).get(params={"page": 1})
+
+        assert response.status_code == 200
+        assert response.json() == body
+        assert endpoint.valid_schema(response) is True
+        assert server.requests["/users"] == 1
+
+    def test_explicit_body_and_methods(self, server):
+        server.register(Health, body="ok", methods=("GET",))
+        endpoint = Health(server.base_url)
+
+        assert Get(endpoint).get().json() == "ok"
+        assert Post(endpoint).post(json={"a": 1}).status_code == 405
+        assert sorted(endpoint.allowed_methods()) == ["GET", "OPTIONS"]
+
+    def test_delete_and_ping(self, server):
+        server.register(Users)
+        endpoint = Users(server.base_url)
+
+        assert Delete(endpoint).delete().status_code == 204
+        assert endpoint.ping() is True
+
+    def test_unknown_path(self, server):
+        assert Session().get(server.base_url + "/nope").status_code == 404
+
+    def test_ungeneratable_schema(self, server):
+        class Pattern(BaseEndpoint):
+            path_url = "/p"
+            expected_schema = {"type": "string", "pattern": "^[0-9]+$"}
+
+        with pytest.raises(ValueError, match="pass body explicitly"):
+            server.register(Pattern)
+
+    def test_error_injection(self, server):
+        server.register(Users, error_rate=1.0)
+        server.error_status = 503
+
+        assert Get(Users(server.base_url)).get().status_code == 503
+
+    def test_error_rate_fraction(self):
+        with FakeServer(error_rate=0.5, seed=7) as server:
+            server.register(Health, body="ok")
+            session = Session()
+            statuses = [
+                session.get(server.base_url + "/health").status_code for _ in range(200)
+            ]
+
+        assert 60 < statuses.count(500) < 140
+
+    def test_latency(self, server):
+        server.register(Health, body="ok", latency=(0.05, 0.06))
+
+        response = Session().get(server.base_url + "/health")
+
+        assert response.elapsed.total_seconds() >= 0.05
+
+    def test_keep_alive(self, server):
+        server.register(Health, body="ok")
+        session = Session()
+
+        for _ in range(3):
+            session.get(server.base_url + "/health")
+
+        pool = session.get_adapter(server.base_url).poolmanager
+        assert len(pool.pools) == 1
+        assert pool.pools[next(iter(pool.pools.keys()))].num_connections == 1
+
+    def test_stop_twice(self):
+        server = FakeServer()
+        server.start()
+        server.stop()
+        server.stop()
@@ -0,0 +1,137 @@
+import json
+
+import pytest
+from pytest_mock import MockerFixture
+from requests import Response
+
+from quick_qa.api.core import BaseEndpoint
+from quick_qa.api.load import LatencyHistogram, LoadReport, LoadRunner
+from quick_qa.api.methods import Get
+
+
+class MyEndpoint(BaseEndpoint):
+    path_url = "/items"
+    expected_schema = {"type": "object", "required": ["name"]}
+
+
+class TestLatencyHistogram:
+    def test_percentiles(self):
+        hist = LatencyHistogram()
+        for ms in range(1, 1001):
+            hist.record(ms / 1000)
+
+        assert hist.count == 1000
+        assert hist.percentile(50) == pytest.approx(0.5, rel=1e-3)
+        assert hist.percentile(99) == pytest.approx(0.99, rel=1e-3)
+        assert hist.percentile(99.9) == pytest.approx(0.999, rel=1e-3)
+        assert hist.percentile(100) == pytest.approx(1.0, rel=1e-3)
+        assert hist.mean() == pytest.approx(0.5005, rel=1e-3)
+
+    def test_empty(self):
+        hist = LatencyHistogram()
+
+        assert hist.percentile(99) == 0.0
+        assert hist.mean() == 0.0
+
+    def test_buckets_are_bounded(self):
+        hist = LatencyHistogram(digits=2)
+        for us in range(100_000):
+            hist.record(us / 1_000_000)
+
+        assert len(hist._counts) < 2000
+
+    def test_merge(self):
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.record(0.001)
+        second.record(0.003)
+        second.record(0.002)
+
+        first.merge(second)
+
+        assert first.count == 3
+        assert first.min == 1000
+        assert first.max == 3000
+        assert first.percentile(50) == pytest.approx(0.002, rel=1e-3)
+
+
+class TestLoadReport:
+    def test_as_dict(self):
+        hist = LatencyHistogram()
+        for _ in range(10):
+            hist.record(0.01)
+        report = LoadReport(duration=2.0, latency=hist, errors=1, status_codes={200: 9})
+
+        data = json.loads(report.to_json())
+
+        assert data["requests"] == 10
+        assert data["throughput_rps"] == 5.0
+        assert data["error_rate"] == 0.1
+        assert data["status_codes"] == {"200": 9}
+        assert set(data["latency_ms"]) == {
+            "p50",
+            "p90",
+            "p99",
+            "p99.9",
+            "min",
+            "max",
+            "mean",
+        }
+        assert data["latency_ms"]["p99"] == 10.0
+
+
+class TestLoadRunner:
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError, match="rate"):
+            LoadRunner(call=lambda: None, duration=1, concurrency=1, rate=0)
+
+    def test_call_errors_are_counted(self):
+        def call():
+            raise ConnectionError("down")
+
+        report = LoadRunner(call=call, duration=0.05, concurrency=2).run()
+
+        assert report.requests > 0
+        assert report.errors == report.requests
+
+    def test_rate(self, mocker: MockerFixture):
+        response = mocker.Mock(spec=Response, status_code=200, ok=True)
+        calls = []
+
+        def call(**kwargs):
+            calls.append(kwargs)
+            return response
+
+        report = LoadRunner(
+            call=call,
+            duration=0.5,
+            concurrency=4,
+            rate=40,
+            payload=lambda n: {"params": {"n": n}},
+        ).run()
+
+        assert 15 <= report.requests <= 21
+        assert calls[0] == {"params": {"n": 0}}
+
+
+def test_load_local_server(local_url):
+    get = Get(MyEndpoint(local_url))
+
+    report = get.load("get", duration=0.3, concurrency=4, validate_sample=1.0)
+
+    data = report.as_dict()
+    assert data["requests"] > 0
+    assert data["errors"] == 0
+    assert data["status_codes"] == {"200": data["requests"]}
+    assert data["schema"] == {"sampled": data["requests"], "invalid": 0}
+    assert data["latency_ms"]["p50"] > 0
+
+
+def test_load_local_server_errors(local_url):
+    class Failing(MyEndpoint):
+        path_url = "/status/503"
+
+    report = Get(Failing(local_url)).load("get", duration=0.2, concurrency=2)
+
+    assert report.requests > 0
+    assert report.error_rate == 1.0
+    assert report.status_codes == {503: report.requests}
@@ -1,10 +1,15 @@
+import gzip
+
 import pytest
 from pytest_mock.plugin import MockerFixture
 from requests import Response
 
+from quick_qa.api.cache import ResponseCache
 from quick_qa.api.core import BaseEndpoint
 from quick_qa.api.methods import Delete, Get, Post, Put
 
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 
 @pytest.fixture
 def base_endpoint_obj():
@@ -27,14 +32,21 @@ def post_obj(base_endpoint_obj):
 
 
 @pytest.fixture
-def mock_requests(mocker: MockerFixture):
-    mr = mocker.patch("quick_qa.api.methods.requests")
-    yield mr
+def mock_session(mocker: MockerFixture):
+    ms = mocker.patch.multiple(
+        BaseEndpoint._session,
+        get=mocker.DEFAULT,
+        post=mocker.DEFAULT,
+        put=mocker.DEFAULT,
+        delete=mocker.DEFAULT,
+    )
+    yield ms
 
 
 @pytest.fixture
 def mock_response(mocker: MockerFixture):
     mr = mocker.Mock(spec=Response)
+    mr.status_code = 200
     yield mr
 
 
@@ -43,20 +55,83 @@ class TestGet:
         get = Get(base_endpoint_obj)
 
         assert get.endpoint_url == base_endpoint_obj.endpoint_url
+        assert get._session is base_endpoint_obj._session
 
     @pytest.mark.parametrize(
         "params", [(None), ({"email": "e@mail.com", "name": "myname"})]
     )
-    def test_get(self, params, get_obj: Get, mock_requests, mock_response):
-        mock_requests.get.return_value = mock_response
+    def test_get(self, params, get_obj: Get, mock_session, mock_response):
+        mock_session["get"].return_value = mock_response
 
         res = get_obj.get(params)
 
-        mock_requests.get.assert_called_once_with(
-            url=get_obj.endpoint_url, params=params
+        mock_session["get"].assert_called_once_with(
+            url=get_obj.endpoint_url, params=params, stream=False
         )
         assert res == mock_response
 
+    def test_get_cached(self, get_obj: Get, mock_session, mocker):
+        mock_cache = mocker.Mock()
+        mocker.patch.object(BaseEndpoint, "response_cache", mock_cache)
+
+        res = get_obj.get({"id": 1})
+
+        mock_cache.get.assert_called_once_with(
+            BaseEndpoint._session,
+            get_obj.endpoint_url,
+            {"id": 1},
+            label="BaseEndpoint",
+        )
+        mock_session["get"].assert_not_called()
+        assert res == mock_cache.get.return_value
+
+    def test_get_cached_accept_encoding(self, get_obj: Get, mock_session, mocker):
+        mocker.patch.object(BaseEndpoint, "accept_encoding", "gzip")
+        mocker.patch.object(
+            BaseEndpoint, "response_cache", ResponseCache(max_bytes=1000, ttl=60)
+        )
+        response = Response()
+        response.status_code = 200
+        response._content = b"{}"
+        mock_session["get"].return_value = response
+
+        get_obj.get({"id": 1})
+
+        mock_session["get"].assert_called_once_with(
+            url=get_obj.endpoint_url,
+            params={"id": 1},
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+    def test_get_stream_skips_cache(self, get_obj: Get, mock_session, mocker):
+        mock_cache = mocker.Mock()
+        mocker.patch.object(BaseEndpoint, "response_cache", mock_cache)
+
+        get_obj.get(stream=True)
+
+        mock_cache.get.assert_not_called()
+        mock_session["get"].assert_called_once_with(
+            url=get_obj.endpoint_url, params=None, stream=True
+        )
+
+
+class TestBatch:
+    @pytest.mark.parametrize("validate", [False, True])
+    def test_batch(self, validate, get_obj: Get, mock_session, mock_response, mocker):
+        mock_session["get"].return_value = mock_response
+        mock_valid = mocker.patch.object(
+            get_obj._base_endpoint, "valid_schema", return_value=True
+        )
+        payloads = [{"params": {"id": i}} for i in range(5)]
+
+        results = list(get_obj.batch("get", payloads, workers=2, validate=validate))
+
+        assert [r.payload for r in results] == payloads
+        assert all(r.response == mock_response for r in results)
+        assert mock_session["get"].call_count == 5
+        assert mock_valid.call_count == (5 if validate else 0)
+        assert all(r.valid is (True if validate else None) for r in results)
+
 
 class TestPost:
     def test_post_init(self, base_endpoint_obj):
@@ -64,16 +139,44 @@ class TestPost:
 
         assert post.endpoint_url == base_endpoint_obj.endpoint_url
 
-    def test_post(self, post_obj: Post, mock_requests, mock_response):
-        mock_requests.post.return_value = mock_response
+    def test_post(self, post_obj: Post, mock_session, mock_response):
+        mock_session["post"].return_value = mock_response
 
         res = post_obj.post(data={}, json="")
 
-        mock_requests.post.assert_called_once_with(
-            url=post_obj.endpoint_url, data={}, json=""
+        mock_session["post"].assert_called_once_with(
+            url=post_obj.endpoint_url, data=b'""', headers=JSON_HEADERS
         )
         assert res == mock_response
 
+    def test_post_compressed(self, post_obj: Post, mock_session, mock_response, mocker):
+        mocker.patch.multiple(
+            BaseEndpoint,
+            compression="gzip",
+            compress_min_size=0,
+            accept_encoding="gzip",
+        )
+        mock_session["post"].return_value = mock_response
+
+        post_obj.post(json={"a": 1})
+
+        kwargs = mock_session["post"].call_args.kwargs
+        assert gzip.decompress(kwargs["data"]) == b'{"a":1}'
+        assert kwargs["headers"] == {
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip",
+            "Accept-Encoding": "gzip",
+        }
+
+    def test_post_data_wins(self, post_obj: Post, mock_session, mock_response):
+        mock_session["post"].return_value = mock_response
+
+        post_obj.post(data={"a": 1}, json={"b": 2})
+
+        mock_session["post"].assert_called_once_with(
+            url=post_obj.endpoint_url, data={"a": 1}, json={"b": 2}
+        )
+
 
 class TestPut:
     def test_put_init(self, base_endpoint_obj):
@@ -81,14 +184,14 @@ class TestPut:
 
         assert put.endpoint_url == base_endpoint_obj.endpoint_url
 
-    def test_put(self, base_endpoint_obj, mock_requests, mock_response):
-        mock_requests.put.return_value = mock_response
+    def test_put(self, base_endpoint_obj, mock_session, mock_response):
+        mock_session["put"].return_value = mock_response
         put = Put(base_endpoint_obj)
 
         res = put.put(data={}, json="")
 
-        mock_requests.put.assert_called_once_with(
-            url=put.endpoint_url, data={}, json=""
+        mock_session["put"].assert_called_once_with(
+            url=put.endpoint_url, data=b'""', headers=JSON_HEADERS
         )
         assert res == mock_response
 
@@ -99,11 +202,11 @@ class TestDelete:
 
         assert delete.endpoint_url == base_endpoint_obj.endpoint_url
 
-    def test_delete(self, base_endpoint_obj, mock_requests, mock_response):
-        mock_requests.delete.return_value = mock_response
+    def test_delete(self, base_endpoint_obj, mock_session, mock_response):
+        mock_session["delete"].return_value = mock_response
         delete = Delete(base_endpoint_obj)
 
         res = delete.delete(data={})
 
-        mock_requests.delete.assert_called_once_with(url=delete.endpoint_url, data={})
+        mock_session["delete"].assert_called_once_with(url=delete.endpoint_url, data={})
         assert res == mock_response
@@ -0,0 +1,193 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from jsonschema.exceptions import ValidationError
+from requests import HTTPError
+
+from quick_qa.api.core import BaseEndpoint
+from quick_qa.api.methods import Get
+from quick_qa.api.pagination import (
+    CursorPagination,
+    LinkPagination,
+    OffsetPagination,
+    PageError,
+    iter_pages,
+)
+
+ITEMS = list(range(25))
+
+
+class _PagesHandler(BaseHTTPRequestHandler):
+    """serves ITEMS 10 at a time in cursor, offset and link styles"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = {k: int(v[0]) for k, v in parse_qs(parts.query).items()}
+        headers = {}
+        if parts.path == "/cursor":
+            start = query.get("cursor", 0)
+            more = start + 10 < len(ITEMS)
+            body = {
+                "items": ITEMS[start : start + 10],
+                "next": start + 10 if more else None,
+            }
+        elif parts.path == "/offset":
+            body = ITEMS[query["offset"] : query["offset"] + query["limit"]]
+        elif parts.path == "/link":
+            start = query.get("page", 0) * 10
+            body = ITEMS[start : start + 10]
+            if start + 10 < len(ITEMS):
+                page = query.get("page", 0) + 1
+                headers["Link"] = f'</link?page={page}>; rel="next"'
+        else:
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        raw = json.dumps(body).encode()
+        self.send_response(200)
+        for key, value in {**headers, "Content-Length": str(len(raw))}.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def pages_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PagesHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def endpoint(base_url: str, path: str, schema: dict = {}) -> BaseEndpoint:
+    cls = type("Pages", (BaseEndpoint,), {"path_url": path, "expected_schema": schema})
+    return cls(base_url)
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+@pytest.mark.parametrize(
+    "path, paginator",
+    [
+        ("/cursor", CursorPagination(next_field="next")),
+        ("/offset", OffsetPagination(limit=10)),
+        ("/link", LinkPagination()),
+    ],
+)
+def test_paginate(pages_url, path, paginator, prefetch):
+    get = Get(endpoint(pages_url, path))
+
+    assert list(get.paginate(paginator, prefetch=prefetch)) == ITEMS
+
+
+def test_paginate_max_pages(pages_url):
+    get = Get(endpoint(pages_url, "/link"))
+
+    assert list(get.paginate(LinkPagination(), max_pages=2)) == ITEMS[:20]
+
+
+def test_paginate_validate(pages_url):
+    get = Get(endpoint(pages_url, "/offset", {"type": "array", "maxItems": 5}))
+
+    with pytest.raises(PageError) as e:
+        list(get.paginate(OffsetPagination(limit=10), validate=True))
+
+    assert e.value.page == 0
+    assert isinstance(e.value.error, ValidationError)
+
+
+def test_paginate_http_error(pages_url):
+    get = Get(endpoint(pages_url, "/missing"))
+
+    with pytest.raises(PageError) as e:
+        list(get.paginate(LinkPagination()))
+
+    assert isinstance(e.value.error, HTTPError)
+    assert e.value.response.status_code == 500
+
+
+class _Page:
+    url = "u"
+    links = {}
+
+
+def counting_fetch(pages: int, size: int = 10, delay: float = 0.0):
+    state = {"fetched": 0, "in_flight": 0, "max_in_flight": 0}
+    lock = threading.Lock()
+
+    def fetch(url, params):
+        with lock:
+            state["fetched"] += 1
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        time.sleep(delay)
+        cursor = (params or {}).get("cursor", (params or {}).get("offset", 0))
+        page = cursor // size
+        body = {
+            "items": list(range(cursor, cursor + size)) if page < pages else [],
+            "next_cursor": cursor + size if page + 1 < pages else None,
+        }
+        with lock:
+            state["in_flight"] -= 1
+        return _Page(), body
+
+    return fetch, state
+
+
+def test_chained_prefetch_is_bounded():
+    fetch, state = counting_fetch(pages=20)
+    pages = iter_pages(fetch, CursorPagination(), "u", prefetch=3)
+
+    next(pages)
+    time.sleep(0.1)
+
+    # the page being consumed plus three ahead
+    assert state["fetched"] == 4
+    pages.close()
+    assert state["fetched"] == 4
+
+
+def test_concurrent_prefetch():
+    fetch, state = counting_fetch(pages=6, delay=0.02)
+    paginator = OffsetPagination(limit=10, items_field="items")
+
+    pages = list(iter_pages(fetch, paginator, "u", prefetch=4))
+
+    # the seventh page comes back short, which ends the walk
+    assert [body["items"][:1] for _, body in pages] == [
+        [0],
+        [10],
+        [20],
+        [30],
+        [40],
+        [50],
+        [],
+    ]
+    assert state["max_in_flight"] > 1
+
+
+def test_chained_error_propagates():
+    def fetch(url, params):
+        if params:
+            raise ConnectionError("down")
+        return _Page(), {"items": [1], "next_cursor": "a"}
+
+    pages = iter_pages(fetch, CursorPagination(), "u", prefetch=2)
+
+    assert next(pages)[1]["items"] == [1]
+    with pytest.raises(ConnectionError):
+        next(pages)
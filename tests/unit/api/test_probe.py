@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+from pytest_mock import MockerFixture
+from requests import Response, Session
+
+from quick_qa.api import probe as probe_module
+from quick_qa.api.core import BaseEndpoint
+from quick_qa.api.probe import ProbeCache, probe_all
+
+
+@pytest.fixture
+def session(mocker: MockerFixture):
+    s = mocker.Mock(spec=Session)
+    response = mocker.Mock(spec=Response)
+    response.status_code = 200
+    response.headers = {"Allow": "GET"}
+    s.options.return_value = response
+    yield s
+
+
+class TestProbeCache:
+    def test_probe_cached(self, session):
+        cache = ProbeCache(ttl=60)
+
+        first = cache.probe(session, "http://a.com/x")
+        second = cache.probe(session, "http://a.com/x")
+
+        session.options.assert_called_once_with("http://a.com/x")
+        assert first is second
+        assert first.status_code == 200
+        assert first.allow == "GET"
+
+    def test_probe_expired(self, session, mocker: MockerFixture):
+        now = {"t": 100.0}
+        mocker.patch("quick_qa.api.probe.time.monotonic", side_effect=lambda: now["t"])
+        cache = ProbeCache(ttl=10)
+
+        cache.probe(session, "http://a.com/x")
+        now["t"] += 11
+        cache.probe(session, "http://a.com/x")
+
+        assert session.options.call_count == 2
+
+    def test_probe_single_flight(self, session):
+        original = session.options.return_value
+
+        def slow_options(url):
+            time.sleep(0.05)
+            return original
+
+        session.options.side_effect = slow_options
+        cache = ProbeCache(ttl=60)
+        threads = [
+            threading.Thread(target=cache.probe, args=(session, "http://a.com/x"))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        session.options.assert_called_once()
+
+    def test_clear(self, session):
+        cache = ProbeCache(ttl=60)
+        cache.probe(session, "http://a.com/x")
+
+        cache.clear()
+        cache.probe(session, "http://a.com/x")
+
+        assert session.options.call_count == 2
+
+
+class TestProbeAll:
+    def test_probe_all(self, mocker: MockerFixture, session):
+        class First(BaseEndpoint):
+            path_url = "/first"
+
+        class Second(BaseEndpoint):
+            path_url = "/second"
+
+        mocker.patch.object(BaseEndpoint._session, "options", session.options)
+
+        results = probe_all([First, Second], base_url="http://a.com", workers=2)
+
+        assert set(results) == {"http://a.com/first", "http://a.com/second"}
+        assert First("http://a.com").ping() is True
+        assert session.options.call_count == 2
+
+    def test_probe_all_no_base_url(self, mocker: MockerFixture):
+        mocker.patch.object(probe_module.ApiConfigs, "base_url", None)
+
+        with pytest.raises(ValueError, match="base_url"):
+            probe_all([BaseEndpoint])
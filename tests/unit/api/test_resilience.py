@@ -0,0 +1,247 @@
+import threading
+import time
+
+import pytest
+import requests
+from pytest_mock import MockerFixture
+
+from quick_qa.api import resilience
+from quick_qa.api.core import BaseEndpoint
+from quick_qa.api.fake_server import FakeServer
+from quick_qa.api.resilience import (
+    BreakerRegistry,
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    RetryPolicy,
+    TimeBudgetExceeded,
+    cap_timeout,
+    remaining_budget,
+    time_budget,
+)
+from quick_qa.api.session import PooledAdapter, PooledSession
+
+
+class Flaky(BaseEndpoint):
+    path_url = "/flaky"
+
+
+@pytest.fixture
+def clock(mocker: MockerFixture):
+    now = {"t": 100.0}
+    mocker.patch("quick_qa.api.resilience.time.monotonic", side_effect=lambda: now["t"])
+    yield now
+
+
+def make_session(retry: RetryPolicy, breakers: BreakerRegistry) -> PooledSession:
+    session = PooledSession()
+    for prefix in ("http://", "https://"):
+        session.mount(
+            prefix, PooledAdapter(stats=session.stats, retry=retry, breakers=breakers)
+        )
+    return session
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(threshold=2)
+
+        breaker.record_failure()
+        breaker.before_request()
+        breaker.record_failure()
+
+        assert breaker.state is CircuitState.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request("http://a.com")
+        assert breaker.snapshot() == {
+            "state": "open",
+            "failures": 2,
+            "opened": 1,
+            "rejected": 1,
+        }
+
+    def test_success_resets_failures(self):
+        breaker = CircuitBreaker(threshold=2)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state is CircuitState.CLOSED
+
+    @pytest.mark.parametrize(
+        "outcome, state",
+        [
+            ("record_success", CircuitState.CLOSED),
+            ("record_failure", CircuitState.OPEN),
+        ],
+    )
+    def test_half_open_probe(self, clock, outcome, state):
+        breaker = CircuitBreaker(threshold=1, reset_timeout=10)
+        breaker.record_failure()
+
+        clock["t"] += 10
+        breaker.before_request()
+        assert breaker.state is CircuitState.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+        getattr(breaker, outcome)()
+        assert breaker.state is state
+
+    def test_release_probe_slot(self, clock):
+        breaker = CircuitBreaker(threshold=1, reset_timeout=10)
+        breaker.record_failure()
+        clock["t"] += 10
+
+        breaker.before_request()
+        breaker.release()
+        breaker.before_request()
+
+
+class TestBreakerRegistry:
+    def test_one_breaker_per_host(self):
+        registry = BreakerRegistry(threshold=3)
+
+        a = registry.get("http://user@A.com:80/x?y=1")
+        assert registry.get("http://a.com:80/other") is a
+        assert registry.get("https://a.com:80/x") is not a
+        assert a.threshold == 3
+        assert list(registry.snapshot()) == ["http://a.com:80", "https://a.com:80"]
+
+        registry.configure(threshold=1)
+        assert registry.get("http://a.com:80").threshold == 1
+
+    def test_get_breakers_from_configs(self, mocker: MockerFixture):
+        mocker.patch.object(resilience, "_breakers", None)
+
+        assert resilience.get_breakers() is resilience.get_breakers()
+
+
+class TestRetryPolicy:
+    def test_should_retry(self, mocker: MockerFixture):
+        policy = RetryPolicy(attempts=1, statuses=[503], methods=["get"])
+        response = mocker.Mock(status_code=503)
+
+        assert policy.should_retry("GET", 0)
+        assert policy.should_retry("GET", 0, response)
+        assert not policy.should_retry("GET", 1)
+        assert not policy.should_retry("POST", 0)
+        response.status_code = 500
+        assert not policy.should_retry("GET", 0, response)
+
+    def test_delay(self, mocker: MockerFixture):
+        policy = RetryPolicy(backoff=1, max_backoff=4)
+
+        assert all(0 <= policy.delay(attempt) <= 4 for attempt in range(10))
+        response = mocker.Mock(headers={"Retry-After": "3"})
+        assert 3 <= policy.delay(0, response) <= 4
+
+
+class TestTimeBudget:
+    def test_no_budget(self):
+        assert remaining_budget() is None
+        assert cap_timeout((1, None)) == (1, None)
+
+    def test_nested_budgets(self, clock):
+        with time_budget(10):
+            with time_budget(20):
+                assert remaining_budget() == 10
+            clock["t"] += 4
+            assert remaining_budget() == 6
+            assert cap_timeout(None) == 6
+            assert cap_timeout(2) == 2
+            assert cap_timeout((2, None)) == (2, 6)
+            clock["t"] += 6
+            with pytest.raises(TimeBudgetExceeded):
+                cap_timeout(1)
+        assert remaining_budget() is None
+
+    def test_threads_exit_out_of_order(self):
+        short_entered, long_entered, short_exited = (
+            threading.Event(),
+            threading.Event(),
+            threading.Event(),
+        )
+        seen = {}
+
+        def short():
+            with time_budget(0.05):
+                short_entered.set()
+                long_entered.wait(5)
+            short_exited.set()
+
+        def long():
+            short_entered.wait(5)
+            with time_budget(100):
+                long_entered.set()
+                short_exited.wait(5)
+                seen["inside"] = remaining_budget()
+            seen["after"] = remaining_budget()
+
+        threads = [threading.Thread(target=short), threading.Thread(target=long)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert seen["inside"] > 99
+        assert seen["after"] is None
+        assert remaining_budget() is None
+
+    def test_batch_workers_share_the_budget(self):
+        from quick_qa.api.batch import run_batch
+
+        with time_budget(50):
+            results = list(run_batch(lambda: remaining_budget(), [{}] * 4, workers=2))
+
+        assert all(0 < result.response <= 50 for result in results)
+
+
+class TestPooledAdapter:
+    def test_retries_statuses(self):
+        session = make_session(
+            RetryPolicy(attempts=2, backoff=0.001), BreakerRegistry(threshold=10)
+        )
+        with FakeServer(error_rate=1.0, error_status=503) as server:
+            server.register(Flaky, body={})
+            response = session.get(server.base_url + "/flaky")
+            session.post(server.base_url + "/flaky")
+
+        assert response.status_code == 503
+        assert server.requests["/flaky"] == 4
+
+    def test_retries_connection_errors(self, mocker: MockerFixture):
+        session = make_session(
+            RetryPolicy(attempts=2, backoff=0.001), BreakerRegistry(threshold=10)
+        )
+        mock_sleep = mocker.patch("quick_qa.api.session.time.sleep")
+
+        with pytest.raises(requests.ConnectionError):
+            session.get("http://127.0.0.1:1")
+
+        assert mock_sleep.call_count == 2
+
+    def test_breaker_fails_fast(self):
+        breakers = BreakerRegistry(threshold=2, statuses=[503])
+        session = make_session(RetryPolicy(), breakers)
+        with FakeServer(error_rate=1.0, error_status=503) as server:
+            server.register(Flaky, body={})
+            for _ in range(2):
+                session.get(server.base_url + "/flaky")
+            with pytest.raises(CircuitOpenError):
+                session.get(server.base_url + "/flaky")
+
+        assert server.requests["/flaky"] == 2
+        assert breakers.snapshot()[server.base_url]["state"] == "open"
+
+    def test_time_budget(self):
+        session = make_session(RetryPolicy(attempts=5), BreakerRegistry())
+        with FakeServer(latency=0.3) as server:
+            server.register(Flaky, body={})
+            started = time.perf_counter()
+            with time_budget(0.1), pytest.raises(requests.Timeout):
+                session.get(server.base_url + "/flaky")
+            elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.3
@@ -0,0 +1,106 @@
+import pytest
+from jsonschema.exceptions import SchemaError, ValidationError
+from jsonschema.validators import Draft202012Validator
+
+from quick_qa.api.schema import CompiledSchema, compile_checks
+
+ITEM_SCHEMA = {
+    "type": "object",
+    "required": ["id", "name"],
+    "properties": {
+        "id": {"type": "integer", "minimum": 0},
+        "name": {"type": "string", "minLength": 1, "pattern": "^[a-z]+$"},
+        "score": {"type": ["number", "null"], "exclusiveMaximum": 10},
+        "kind": {"enum": ["a", "b", None]},
+        "tags": {"type": "array", "items": {"type": "string"}, "maxItems": 2},
+        "meta": {"description": "anything"},
+    },
+    "additionalProperties": False,
+}
+
+SCHEMA = {"type": "array", "items": ITEM_SCHEMA}
+
+
+@pytest.mark.parametrize(
+    "instance",
+    [
+        [],
+        [{"id": 1, "name": "abc"}],
+        [{"id": 1.0, "name": "abc", "score": 9.5, "kind": None, "tags": ["x"]}],
+        [{"id": 1, "name": "abc", "meta": {"nested": [1, 2]}}],
+        [{"id": True, "name": "abc"}],
+        [{"id": -1, "name": "abc"}],
+        [{"id": 1.5, "name": "abc"}],
+        [{"id": 1, "name": ""}],
+        [{"id": 1, "name": "ABC"}],
+        [{"id": 1}],
+        [{"id": 1, "name": "abc", "extra": 1}],
+        [{"id": 1, "name": "abc", "score": 10}],
+        [{"id": 1, "name": "abc", "score": "1"}],
+        [{"id": 1, "name": "abc", "kind": "c"}],
+        [{"id": 1, "name": "abc", "kind": 1}],
+        [{"id": 1, "name": "abc", "tags": ["a", "b", "c"]}],
+        [{"id": 1, "name": "abc", "tags": [1]}],
+        [[]],
+        {"id": 1, "name": "abc"},
+        None,
+    ],
+)
+def test_compile_checks_matches_jsonschema(instance):
+    check = compile_checks(SCHEMA)
+
+    assert check(instance) is Draft202012Validator(SCHEMA).is_valid(instance)
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [
+        {"$ref": "#/$defs/a", "$defs": {"a": {}}},
+        {"anyOf": [{"type": "string"}]},
+        {"enum": [1, 2]},
+        {
+            "items": [{"type": "string"}],
+            "$schema": "http://json-schema.org/draft-07/schema#",
+        },
+        {"$schema": "http://json-schema.org/draft-04/schema#"},
+    ],
+)
+def test_compile_checks_unsupported(schema):
+    with pytest.raises(NotImplementedError):
+        compile_checks(schema)
+
+
+@pytest.mark.parametrize("schema", [True, {}, {"properties": {"a": {"title": "a"}}}])
+def test_compile_checks_trivial(schema):
+    check = compile_checks(schema)
+
+    assert check({"a": 1}) is True
+
+
+class TestCompiledSchema:
+    def test_init_invalid_schema(self):
+        with pytest.raises(SchemaError):
+            CompiledSchema({"type": "not a type"})
+
+    @pytest.mark.parametrize("fast", [False, True])
+    def test_validate(self, fast):
+        compiled = CompiledSchema(SCHEMA, fast=fast)
+
+        assert compiled.is_fast is fast
+        assert compiled.validate([{"id": 1, "name": "abc"}]) is True
+        error = compiled.validate([{"id": "1", "name": "abc"}])
+        assert isinstance(error, ValidationError)
+        assert list(error.path) == [0, "id"]
+
+    def test_fast_fallback(self):
+        compiled = CompiledSchema({"anyOf": [{"type": "string"}]}, fast=True)
+
+        assert compiled.is_fast is False
+        assert compiled.validate("a") is True
+        assert isinstance(compiled.validate(1), ValidationError)
+
+    def test_iter_errors(self):
+        compiled = CompiledSchema(SCHEMA, fast=True)
+
+        assert list(compiled.iter_errors([{"id": 1, "name": "abc"}])) == []
+        assert len(list(compiled.iter_errors([{"id": -1}, {"id": -1}]))) == 4
@@ -0,0 +1,98 @@
+from pytest_mock import MockerFixture
+
+from quick_qa.api import session as session_module
+from quick_qa.api import timing
+from quick_qa.api.configs import ApiConfigs
+from quick_qa.api.session import PooledAdapter, PooledSession, PoolStats
+
+
+class TestPoolStats:
+    def test_hits(self):
+        stats = PoolStats(checkouts=5, misses=2)
+
+        assert stats.hits == 3
+
+    def test_record_and_reset(self):
+        stats = PoolStats()
+
+        stats.record("saturated")
+        stats.record("prewarmed", 3)
+        assert stats.snapshot()["saturated"] == 1
+        assert stats.snapshot()["prewarmed"] == 3
+
+        stats.reset()
+        assert set(stats.snapshot().values()) == {0}
+
+
+class TestPooledSession:
+    def test_init_mounts_pooled_adapters(self):
+        s = PooledSession()
+
+        assert isinstance(s.get_adapter("http://a.com"), PooledAdapter)
+        assert isinstance(s.get_adapter("https://a.com"), PooledAdapter)
+
+    def test_configure(self):
+        s = PooledSession()
+
+        s.configure(hosts=2, maxsize=4, block=True, keep_alive=False)
+        adapter = s.get_adapter("http://a.com")
+
+        assert adapter._pool_connections == 2
+        assert adapter._pool_maxsize == 4
+        assert adapter._pool_block is True
+        assert s.headers["Connection"] == "close"
+
+        s.configure(keep_alive=True)
+        assert "Connection" not in s.headers
+
+    def test_connections_are_reused(self, local_url):
+        s = PooledSession()
+
+        for _ in range(3):
+            assert s.get(local_url).status_code == 200
+
+        stats = s.stats.snapshot()
+        assert stats["checkouts"] == 3
+        assert stats["misses"] == 1
+        assert stats["hits"] == 2
+
+    def test_prewarm(self, local_url):
+        s = PooledSession()
+        s.configure(maxsize=2)
+
+        opened = s.prewarm(local_url, 5)
+        s.get(local_url)
+
+        assert opened == 2
+        stats = s.stats.snapshot()
+        assert stats["prewarmed"] == 2
+        assert stats["misses"] == 2
+        assert stats["hits"] == 1
+
+    def test_prewarm_unreachable(self):
+        s = PooledSession()
+
+        assert s.prewarm("http://127.0.0.1:1", 2) == 0
+
+
+def test_configure_session(mocker: MockerFixture):
+    mocker.patch.object(ApiConfigs, "base_url", "http://www.myurl.com")
+    mocker.patch.dict(ApiConfigs.pool, {"prewarm": 3})
+    mock_configure = mocker.patch.object(session_module._session, "configure")
+    mock_prewarm = mocker.patch.object(session_module._session, "prewarm")
+
+    result = session_module.configure_session()
+
+    mock_configure.assert_called_once_with(**ApiConfigs.pool)
+    mock_prewarm.assert_called_once_with("http://www.myurl.com", 3)
+    assert result is session_module.get_session()
+
+
+def test_configure_session_schedules_metrics(mocker: MockerFixture):
+    mocker.patch.object(ApiConfigs, "metrics", {"json": "t.json"})
+    mocker.patch.object(session_module._session, "configure")
+    mock_register = mocker.patch("quick_qa.api.session.atexit.register")
+
+    session_module.configure_session()
+
+    mock_register.assert_called_once_with(timing.export_configured_metrics)
@@ -0,0 +1,106 @@
+import json
+import tracemalloc
+
+import pytest
+
+from quick_qa.api.schema import CompiledSchema
+from quick_qa.api.streaming import StreamValidationError, iter_array, validate_stream
+
+SCHEMA = {
+    "type": "array",
+    "items": {"$ref": "#/$defs/item"},
+    "$defs": {
+        "item": {
+            "type": "object",
+            "required": ["id"],
+            "properties": {"id": {"type": "integer"}},
+        }
+    },
+}
+
+
+def chunked(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+class TestIterArray:
+    @pytest.mark.parametrize("size", [1, 2, 7, 4096])
+    def test_chunk_boundaries(self, size):
+        data = [{"id": i, "name": "é" * i} for i in range(50)] + [123456, -1.5e3, None]
+
+        result = list(iter_array(chunked(json.dumps(data).encode(), size)))
+
+        assert result == data
+
+    @pytest.mark.parametrize(
+        "body, expected",
+        [
+            (b"[]", []),
+            (b" [ ] ", []),
+            (b"\xef\xbb\xbf[1]", [1]),
+            (b"[ 1 , 2 ]", [1, 2]),
+        ],
+    )
+    def test_edge_cases(self, body, expected):
+        assert list(iter_array([body])) == expected
+
+    @pytest.mark.parametrize("body", [b"{}", b"", b"[1,2", b"[1 2]", b"[1,]"])
+    def test_invalid(self, body):
+        with pytest.raises(ValueError):
+            list(iter_array([body]))
+
+    def test_memory_is_bounded(self):
+        item = json.dumps({"id": 1, "name": "x" * 100}).encode()
+
+        def body():
+            yield b"["
+            for i in range(50_000):
+                yield (b"," if i else b"") + item
+            yield b"]"
+
+        tracemalloc.start()
+        count = sum(1 for _ in iter_array(body()))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert count == 50_000
+        assert peak < 1024 * 1024
+
+
+class TestValidateStream:
+    def test_valid(self):
+        body = json.dumps([{"id": i} for i in range(100)]).encode()
+
+        assert validate_stream(chunked(body, 10), CompiledSchema(SCHEMA)) is True
+
+    @pytest.mark.parametrize("fast", [False, True])
+    def test_stops_at_max_errors(self, fast):
+        def body():
+            yield b'[{"id": 1}, {"id": "a"}, {}, {"id": "b"}'
+            raise AssertionError("read past max_errors")
+
+        result = validate_stream(
+            body(), CompiledSchema(SCHEMA, fast=fast), max_errors=2
+        )
+
+        assert isinstance(result, StreamValidationError)
+        assert result.items == 3
+        assert [list(e.path) for e in result.errors] == [[1, "id"], [2]]
+
+    @pytest.mark.parametrize(
+        "extra, body",
+        [
+            ({"minItems": 2}, b'[{"id": 1}]'),
+            ({"maxItems": 1}, b'[{"id": 1}, {"id": 2}]'),
+        ],
+    )
+    def test_item_counts(self, extra, body):
+        result = validate_stream([body], CompiledSchema({**SCHEMA, **extra}))
+
+        assert isinstance(result, StreamValidationError)
+
+    @pytest.mark.parametrize("schema", [{"type": "object"}, {"uniqueItems": True}])
+    def test_not_streamable(self, schema):
+        with pytest.raises(ValueError, match="stream"):
+            validate_stream([b"[]"], CompiledSchema(schema))
@@ -0,0 +1,144 @@
+import json
+
+import pytest
+import requests
+
+from quick_qa.api import timing
+from quick_qa.api.cache import ResponseCache
+from quick_qa.api.configs import ApiConfigs
+from quick_qa.api.core import BaseEndpoint
+from quick_qa.api.methods import Get
+from quick_qa.api.session import PooledSession
+from quick_qa.api.timing import Sample, TimingRecorder
+
+
+class Users(BaseEndpoint):
+    path_url = "/users"
+
+
+@pytest.fixture
+def recorder(mocker):
+    r = TimingRecorder()
+    mocker.patch.object(timing, "_recorder", r)
+    yield r
+
+
+def test_mark_without_active_sample():
+    timing.mark("dns", 1.0)
+
+    assert timing.active() is None
+
+
+class TestTimingRecorder:
+    def test_measure_phases(self, local_url, recorder):
+        session = PooledSession()
+
+        for _ in range(2):
+            with recorder.measure("Users", "get") as sample:
+                sample.status = session.get(local_url).status_code
+
+        phases = recorder.as_dict()["Users.get"]["phases_ms"]
+        assert phases["total"]["count"] == 2
+        for phase in ("send", "ttfb", "download"):
+            assert phases[phase]["count"] == 2
+        # the second request reuses the connection
+        assert phases["dns"]["count"] == 1
+        assert phases["connect"]["count"] == 1
+        assert "tls" not in phases
+        assert phases["total"]["max"] >= phases["ttfb"]["max"]
+
+    def test_measure_connection_error(self, recorder):
+        session = PooledSession()
+
+        with pytest.raises(requests.ConnectionError):
+            with recorder.measure("Users", "get"):
+                session.get("http://127.0.0.1:1")
+
+        assert recorder.as_dict()["Users.get"]["status_codes"] == {"error": 1}
+
+    def test_unresolvable_host(self, recorder):
+        session = PooledSession()
+
+        with pytest.raises(requests.ConnectionError):
+            with recorder.measure("Users", "get"):
+                session.get("http://no-such-host.invalid")
+
+    def test_disabled(self, local_url, recorder):
+        recorder.enabled = False
+
+        with recorder.measure("Users", "get"):
+            PooledSession().get(local_url)
+
+        assert recorder.as_dict() == {}
+
+    def test_exports(self, recorder, tmp_path):
+        sample = Sample()
+        sample.phases = {"ttfb": 0.01, "total": 0.02}
+        sample.status = 200
+        recorder.record("Users", "get", sample)
+        recorder.record("Users", "get", sample)
+
+        data = json.loads(recorder.to_json())
+        assert data["Users.get"]["requests"] == 2
+        assert data["Users.get"]["status_codes"] == {"200": 2}
+        assert data["Users.get"]["phases_ms"]["ttfb"]["p50"] == pytest.approx(10, 0.01)
+
+        text = recorder.to_prometheus()
+        labels = 'endpoint="Users",verb="get",phase="ttfb"'
+        assert "# TYPE quick_qa_request_phase_seconds summary" in text
+        median = f'quick_qa_request_phase_seconds{{{labels},quantile="0.5"}} '
+        value = text.split(median)[1].split("\n")[0]
+        assert float(value) == pytest.approx(0.01, 0.01)
+        assert f"quick_qa_request_phase_seconds_count{{{labels}}} 2" in text
+        assert (
+            'quick_qa_requests_total{endpoint="Users",verb="get",status="200"} 2'
+            in text
+        )
+
+        recorder.write(tmp_path / "t.json", tmp_path / "t.prom")
+        assert json.loads((tmp_path / "t.json").read_text()) == data
+        assert (tmp_path / "t.prom").read_text() == text
+
+        recorder.reset()
+        assert recorder.as_dict() == {}
+
+
+def test_verbs_are_tagged(local_url, recorder):
+    Get(Users(local_url)).get()
+
+    data = recorder.as_dict()
+    assert data["Users.get"]["status_codes"] == {"200": 1}
+
+
+@pytest.mark.parametrize("consume", ["content", "close"])
+def test_streamed_get_ends_with_the_body(local_url, recorder, consume):
+    response = Get(Users(local_url)).get(stream=True)
+    assert recorder.as_dict() == {}
+
+    if consume == "content":
+        assert response.json()["name"] == "me"
+    response.close()
+    response.close()
+
+    data = recorder.as_dict()["Users.get"]
+    assert data["status_codes"] == {"200": 1}
+    assert data["phases_ms"]["download"]["count"] == 1
+
+
+def test_cache_hits_are_not_recorded(local_url, recorder, mocker):
+    mocker.patch.object(Users, "response_cache", ResponseCache(1000, 60))
+    get = Get(Users(local_url))
+
+    get.get()
+    get.get()
+
+    assert recorder.as_dict()["Users.get"]["requests"] == 1
+
+
+def test_export_configured_metrics(recorder, mocker, tmp_path):
+    path = tmp_path / "metrics.prom"
+    mocker.patch.object(ApiConfigs, "metrics", {"prometheus": str(path)})
+
+    timing.export_configured_metrics()
+
+    assert path.read_text().startswith("# HELP")
@@ -0,0 +1,142 @@
+import os
+import pickle
+
+import pytest
+from pytest_mock import MockerFixture
+
+from quick_qa import configuration
+from quick_qa.api.configs import ApiConfigs
+from quick_qa.configuration import CACHE_DIR_ENV, ConfigType, Configuration
+
+CONFIG = """
+api:
+  base_url: http://api.local
+web:
+  base_url: http://web.local
+"""
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+    saved = {
+        k: getattr(Configuration, k)
+        for k in ("config_data", "_snapshot", "_key", "_validated")
+    }
+    saved_base_url = ApiConfigs.base_url
+    path = tmp_path / "config.yaml"
+    path.write_text(CONFIG)
+    yield path
+    for key, value in saved.items():
+        setattr(Configuration, key, value)
+    ApiConfigs.base_url = saved_base_url
+
+
+def touch(path, text):
+    """rewrites the file with a different mtime"""
+    stat = path.stat()
+    path.write_text(text)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestConfiguration:
+    def test_set_config_data(self, config_file):
+        Configuration.set_config_data(str(config_file))
+
+        assert Configuration.get_config(ConfigType.API) == {
+            "base_url": "http://api.local"
+        }
+        assert Configuration._snapshot.exists()
+
+    def test_snapshot_skips_parsing(self, config_file, mocker: MockerFixture):
+        Configuration.set_config_data(str(config_file))
+        load = mocker.patch("yaml.load")
+
+        Configuration.set_config_data(str(config_file))
+
+        load.assert_not_called()
+        assert (
+            Configuration.get_config(ConfigType.WEB)["base_url"] == "http://web.local"
+        )
+
+    def test_changed_file_is_parsed_again(self, config_file):
+        Configuration.set_config_data(str(config_file))
+        touch(config_file, CONFIG.replace("api.local", "changed.local"))
+
+        Configuration.set_config_data(str(config_file))
+
+        assert Configuration.get_config(ConfigType.API)["base_url"] == (
+            "http://changed.local"
+        )
+
+    def test_cache_off(self, config_file, tmp_path):
+        Configuration.set_config_data(str(config_file), cache=False)
+        Configuration.mark_validated(ConfigType.API)
+
+        assert not (tmp_path / "cache").exists()
+        assert not Configuration.is_validated(ConfigType.API)
+
+    def test_unreadable_snapshot_is_ignored(self, config_file):
+        Configuration.set_config_data(str(config_file))
+        Configuration._snapshot.write_bytes(b"not a pickle")
+
+        Configuration.set_config_data(str(config_file))
+
+        assert (
+            Configuration.get_config(ConfigType.API)["base_url"] == "http://api.local"
+        )
+        with open(Configuration._snapshot, "rb") as f:
+            assert pickle.load(f)["data"] == Configuration.config_data
+
+    def test_validation_is_kept_in_snapshot(self, config_file, mocker: MockerFixture):
+        Configuration.set_config_data(str(config_file))
+        ApiConfigs.set_values()
+        assert Configuration.is_validated(ConfigType.API)
+
+        # a new process loads the snapshot and skips validation
+        Configuration._validated = set()
+        Configuration.set_config_data(str(config_file))
+        validate = mocker.spy(ApiConfigs, "_validate_data")
+        ApiConfigs.set_values()
+
+        validate.assert_not_called()
+        assert ApiConfigs.base_url == "http://api.local"
+
+    def test_changed_file_is_validated_again(self, config_file):
+        Configuration.set_config_data(str(config_file))
+        ApiConfigs.set_values()
+        touch(config_file, CONFIG.replace("http://api.local", "not a url"))
+
+        Configuration.set_config_data(str(config_file))
+
+        assert not Configuration.is_validated(ConfigType.API)
+        with pytest.raises(ValueError, match="base_url"):
+            ApiConfigs.set_values()
+
+    def test_loading_leaves_the_environment_alone(
+        self, config_file, monkeypatch, tmp_path
+    ):
+        monkeypatch.delenv(CACHE_DIR_ENV)
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+
+        Configuration.set_config_data(str(config_file))
+
+        assert CACHE_DIR_ENV not in os.environ
+        assert Configuration._snapshot.parent == tmp_path / "xdg" / "quick_qa"
+
+    def test_changed_validators_validate_again(
+        self, config_file, mocker: MockerFixture
+    ):
+        Configuration.set_config_data(str(config_file))
+        ApiConfigs.set_values()
+
+        # a newer quick_qa loads the snapshot of an older one
+        Configuration._validated = set()
+        mocker.patch.object(configuration, "_validator_digest", return_value="new")
+        Configuration.set_config_data(str(config_file))
+        validate = mocker.spy(ApiConfigs, "_validate_data")
+        ApiConfigs.set_values()
+
+        validate.assert_called_once()
+        with open(Configuration._snapshot, "rb") as f:
+            assert pickle.load(f)["validators"] == "new"
@@ -0,0 +1,90 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+API_MODULES = [
+    "quick_qa.api.methods",
+    "quick_qa.api.async_methods",
+    "quick_qa.api.cassette",
+]
+WEB_MODULES = [
+    "quick_qa.web.config",
+    "quick_qa.web.driver_store",
+    "quick_qa.web.pom",
+    "quick_qa.web.webdriver_factory",
+]
+
+
+def cold_import(modules: list) -> set:
+    """top level packages loaded by importing modules in a fresh interpreter.
+    import times are measured by benchmarks/bench_import.py
+    """
+    code = "\n".join(
+        [
+            "import sys",
+            *(f"import {module}" for module in modules),
+            "print(' '.join(sorted({m.split('.')[0] for m in sys.modules})))",
+        ]
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return set(out.split())
+
+
+@pytest.mark.parametrize(
+    "modules, unwanted",
+    [
+        (API_MODULES, {"selenium", "jsonschema", "yaml", "loguru"}),
+        (WEB_MODULES, {"requests", "jsonschema", "yaml", "loguru"}),
+    ],
+    ids=["api", "web"],
+)
+def test_cold_import(modules, unwanted):
+    assert not cold_import(modules) & unwanted
+
+
+@pytest.mark.parametrize(
+    "module, unwanted",
+    [
+        ("quick_qa.web.config", {"selenium", "requests"}),
+        ("quick_qa.web.driver_store", {"selenium"}),
+        ("quick_qa.configuration", {"yaml", "loguru"}),
+    ],
+)
+def test_module_stays_light(module, unwanted):
+    assert not cold_import([module]) & unwanted
+
+
+def test_api_doesnt_import_web():
+    code = "import sys, quick_qa.api.configs; print('quick_qa.web' in sys.modules)"
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+
+    assert out.strip() == "False"
+
+
+def test_lazy_dependencies_load_on_use(tmp_path):
+    config = tmp_path / "config.yaml"
+    config.write_text("api:\n  base_url: http://localhost\n")
+    code = "\n".join(
+        [
+            "import sys",
+            "from quick_qa.configuration import ConfigType, Configuration",
+            f"Configuration.set_config_data({str(config)!r})",
+            "Configuration.get_config(ConfigType.WEB)",
+            "print('yaml' in sys.modules, 'loguru' in sys.modules)",
+        ]
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "QUICK_QA_CACHE_DIR": str(tmp_path / "cache")},
+    ).stdout
+
+    assert out.split() == ["True", "True"]
@@ -0,0 +1,194 @@
+from types import SimpleNamespace
+
+import pytest
+from pytest_mock import MockerFixture
+from selenium.webdriver.chrome.webdriver import WebDriver as ChromeDriver
+from selenium.webdriver.firefox.webdriver import WebDriver as FirefoxDriver
+
+from quick_qa.web.blocking import (
+    blocked_patterns,
+    compile_patterns,
+    get_block_stats,
+    get_blocker,
+    install_blocker,
+    reset_block_stats,
+)
+from quick_qa.web.config import Config
+
+
+@pytest.fixture(autouse=True)
+def clean_stats():
+    reset_block_stats()
+    yield
+    reset_block_stats()
+
+
+@pytest.fixture
+def chrome(mocker: MockerFixture):
+    driver = mocker.Mock(spec=ChromeDriver)
+    devtools, conn = mocker.Mock(), mocker.Mock()
+    devtools.network.BlockedReason.INSPECTOR = "inspector"
+    driver.start_devtools.return_value = (devtools, conn)
+    driver.execute_script.return_value = 120.0
+    return driver
+
+
+@pytest.fixture
+def firefox(mocker: MockerFixture):
+    driver = mocker.Mock(spec=FirefoxDriver)
+    driver.name = "firefox"
+    driver.network = mocker.Mock()
+    driver.execute_script.return_value = 80.0
+    return driver
+
+
+def _callbacks(conn):
+    return [c.args[1] for c in conn.add_callback.call_args_list]
+
+
+def _request(request_id, url):
+    return SimpleNamespace(request_id=request_id, request=SimpleNamespace(url=url))
+
+
+def _failed(request_id, blocked_reason="inspector"):
+    return SimpleNamespace(request_id=request_id, blocked_reason=blocked_reason)
+
+
+class TestPatterns:
+    def test_resource_types_add_extensions(self):
+        patterns = blocked_patterns(["*ads.example.com*"], ["font"])
+
+        assert patterns[0] == "*ads.example.com*"
+        assert "*.woff2" in patterns
+        assert "*.woff2?*" in patterns
+
+    @pytest.mark.parametrize(
+        "url, expected",
+        [
+            ("https://ads.example.com/pixel", True),
+            ("https://app.example.com/logo.PNG", True),
+            ("https://app.example.com/logo.png?v=3", True),
+            ("https://app.example.com/png", False),
+            ("https://app.example.com/page", False),
+        ],
+    )
+    def test_compile_patterns(self, url, expected):
+        regex = compile_patterns(blocked_patterns(["*ads.example.com*"], ["image"]))
+
+        assert bool(regex.fullmatch(url)) is expected
+
+    def test_empty_blocklist_installs_nothing(self, chrome):
+        assert install_blocker(chrome) is None
+        assert get_blocker(chrome) is None
+        chrome.start_devtools.assert_not_called()
+
+
+class TestChrome:
+    def test_blocks_over_devtools(self, chrome):
+        blocker = install_blocker(chrome, urls=["*ads*"], resource_types=["font"])
+
+        devtools, conn = chrome.start_devtools.return_value
+        devtools.network.set_blocked_ur_ls.assert_called_once_with(
+            urls=blocker.patterns
+        )
+        assert blocker.mode == "cdp"
+        assert get_blocker(chrome) is blocker
+
+    def test_counts_blocked_requests_per_page(self, chrome):
+        blocker = install_blocker(chrome, urls=["*ads*"], resource_types=["font"])
+        devtools, conn = chrome.start_devtools.return_value
+        on_request, on_finished, on_failed = _callbacks(conn)
+
+        blocker.start_page("https://app/home")
+        on_request(_request("1", "https://ads.test/tag"))
+        on_request(_request("2", "https://app/a.woff2"))
+        on_request(_request("4", "https://app/api"))
+        on_failed(_failed("1"))
+        on_failed(_failed("2"))
+        # failed reported before the request, events run on their own threads
+        on_failed(_failed("3"))
+        on_request(_request("3", "https://app/b.ttf?v=2"))
+        on_failed(_failed("4", blocked_reason=None))
+        blocker.start_page("https://app/about")
+        blocker.close_page()
+
+        stats = get_block_stats()
+        assert stats["https://app/home"].blocked == 3
+        assert stats["https://app/home"].by_type == {"other": 1, "font": 2}
+        assert stats["https://app/home"].mean_load_ms == 120.0
+        assert stats["https://app/about"].blocked == 0
+
+    def test_ignores_requests_blocked_by_the_page(self, chrome):
+        blocker = install_blocker(chrome, urls=["*ads*"])
+        devtools, conn = chrome.start_devtools.return_value
+        on_request, _, on_failed = _callbacks(conn)
+
+        blocker.start_page("https://app/home")
+        on_request(_request("1", "https://app/inline.js"))
+        on_request(_request("2", "http://app/logo.png"))
+        on_failed(_failed("1", blocked_reason="csp"))
+        on_failed(_failed("2", blocked_reason="mixed-content"))
+        blocker.close_page()
+
+        assert get_block_stats()["https://app/home"].blocked == 0
+
+    def test_falls_back_to_cdp_command(self, chrome):
+        chrome.start_devtools.side_effect = RuntimeError("no websocket")
+
+        blocker = install_blocker(chrome, urls=["*ads*"])
+
+        chrome.execute_cdp_cmd.assert_called_with(
+            "Network.setBlockedURLs", {"urls": ["*ads*"]}
+        )
+        assert blocker.mode == "cdp-command"
+
+
+class TestFirefox:
+    def test_fails_matching_requests(self, firefox, mocker: MockerFixture):
+        blocker = install_blocker(firefox, resource_types=["image"])
+        handler = firefox.network.add_request_handler.call_args.args[1]
+        blocked = mocker.Mock(url="https://app/logo.svg")
+        passed = mocker.Mock(url="https://app/api/user")
+
+        blocker.start_page("https://app/home")
+        handler(blocked)
+        handler(passed)
+        blocker.close_page()
+
+        assert blocker.mode == "bidi"
+        blocked.fail_request.assert_called_once()
+        passed.continue_request.assert_called_once()
+        assert get_block_stats()["https://app/home"].by_type == {"image": 1}
+
+    def test_without_bidi_blocks_nothing(self, firefox):
+        firefox.network.add_request_handler.side_effect = RuntimeError("no bidi")
+
+        blocker = install_blocker(firefox, urls=["*ads*"])
+
+        assert blocker.mode is None
+
+
+class TestConfig:
+    def test_rejects_unknown_resource_type(self):
+        with pytest.raises(ValueError, match="unknown types"):
+            Config._validate_data({"blocklist": {"resource_types": ["video"]}})
+
+    def test_rejects_unknown_key(self):
+        with pytest.raises(ValueError, match="unexpected keys"):
+            Config._validate_data({"blocklist": {"hosts": []}})
+
+    def test_factory_installs_configured_blocklist(self, mocker: MockerFixture):
+        from quick_qa.web import webdriver_factory
+        from quick_qa.web.webdriver_factory import BrowserOptionsSpec, BrowserType
+
+        mocker.patch.object(
+            Config, "blocklist", {"urls": ["*ads*"], "resource_types": []}
+        )
+        mocker.patch.object(webdriver_factory.ChromeBuilder, "build")
+        install = mocker.patch.object(webdriver_factory, "install_blocker")
+
+        driver = webdriver_factory.DriverFactory.get_driver(
+            BrowserOptionsSpec(BrowserType.CHROME, "full", headless=True)
+        )
+
+        install.assert_called_once_with(driver, urls=["*ads*"], resource_types=[])
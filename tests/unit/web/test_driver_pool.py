@@ -0,0 +1,295 @@
+import threading
+
+import pytest
+from pytest_mock import MockerFixture
+from selenium.webdriver.chrome.webdriver import WebDriver as ChromeDriver
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from quick_qa.web import driver_store
+from quick_qa.web.config import Config
+from quick_qa.web.driver_pool import (
+    _CLEAR_STORAGE,
+    DriverPool,
+    get_pool,
+    is_healthy,
+    reset_driver,
+)
+from quick_qa.web.network_events import NetworkMonitor
+from quick_qa.web.webdriver_factory import BrowserOptionsSpec, BrowserType
+
+CHROME = BrowserOptionsSpec(BrowserType.CHROME, (800, 600), headless=True)
+FIREFOX = BrowserOptionsSpec(BrowserType.FIREFOX, "full", headless=True)
+
+
+@pytest.fixture
+def make_driver(mocker: MockerFixture):
+    def make(opts):
+        driver = mocker.Mock(spec=WebDriver)
+        driver.window_handles = ["main"]
+        driver.execute_script.return_value = 1
+        return driver
+
+    return make
+
+
+@pytest.fixture
+def pool(make_driver, mocker: MockerFixture):
+    factory = mocker.Mock(side_effect=make_driver)
+    return DriverPool(size=1, max_age=60, factory=factory)
+
+
+class TestDriverPool:
+    def test_reuses_released_session(self, pool: DriverPool):
+        first = pool.acquire(CHROME)
+        pool.release(first)
+
+        second = pool.acquire(CHROME)
+
+        assert second is first
+        assert pool.factory.call_count == 1
+        assert pool.stats.reused == 1
+
+    def test_keyed_by_spec(self, pool: DriverPool):
+        chrome = pool.acquire(CHROME)
+        pool.release(chrome)
+
+        firefox = pool.acquire(FIREFOX)
+
+        assert firefox is not chrome
+        assert pool.idle(CHROME) == 1
+
+    def test_release_resets_session(self, pool: DriverPool):
+        driver = pool.acquire(CHROME)
+
+        pool.release(driver)
+
+        driver.delete_all_cookies.assert_called_once()
+        driver.get.assert_called_with("about:blank")
+
+    def test_full_pool_quits_extra_sessions(self, pool: DriverPool):
+        first, second = pool.acquire(CHROME), pool.acquire(CHROME)
+
+        pool.release(first)
+        pool.release(second)
+
+        second.quit.assert_called_once()
+        assert pool.idle() == 1
+        assert pool.stats.discarded == 1
+
+    def test_unhealthy_session_is_evicted(self, pool: DriverPool):
+        broken = pool.acquire(CHROME)
+        pool.release(broken)
+        broken.execute_script.side_effect = Exception("session deleted")
+
+        driver = pool.acquire(CHROME)
+
+        assert driver is not broken
+        broken.quit.assert_called_once()
+        assert pool.stats.evicted_unhealthy == 1
+
+    def test_old_session_is_evicted(self, pool: DriverPool, mocker: MockerFixture):
+        old = pool.acquire(CHROME)
+        pool.release(old)
+        mocker.patch("quick_qa.web.driver_pool.time.monotonic", return_value=1e12)
+
+        driver = pool.acquire(CHROME)
+
+        assert driver is not old
+        old.quit.assert_called_once()
+        assert pool.stats.evicted_age == 1
+
+    def test_failed_reset_quits_session(self, pool: DriverPool):
+        driver = pool.acquire(CHROME)
+        driver.delete_all_cookies.side_effect = Exception("gone")
+
+        pool.release(driver)
+
+        driver.quit.assert_called_once()
+        assert pool.idle() == 0
+
+    def test_release_unknown_driver_quits_it(self, pool: DriverPool, make_driver):
+        driver = make_driver(CHROME)
+
+        pool.release(driver)
+
+        driver.quit.assert_called_once()
+
+    def test_lease_sets_driver_store(self, pool: DriverPool):
+        with pool.lease(CHROME) as driver:
+            assert driver_store.get_driver() is driver
+
+        with pytest.raises(RuntimeError):
+            driver_store.get_driver()
+        assert pool.idle(CHROME) == 1
+
+    def test_close_quits_idle_and_later_releases(self, pool: DriverPool):
+        leased = pool.acquire(CHROME)
+        idle = pool.acquire(CHROME)
+        pool.release(idle)
+
+        pool.close()
+        pool.release(leased)
+
+        idle.quit.assert_called_once()
+        leased.quit.assert_called_once()
+        assert pool.idle() == 0
+
+
+def test_reset_driver_replaces_tabs(make_driver):
+    driver = make_driver(CHROME)
+    driver.window_handles = ["main", "popup"]
+    driver.current_window_handle = "fresh"
+
+    reset_driver(driver)
+
+    driver.switch_to.new_window.assert_called_once_with("tab")
+    assert driver.close.call_count == 2
+    driver.switch_to.window.assert_called_with("fresh")
+
+
+def test_reset_driver_clears_storage_of_visited_origins(mocker: MockerFixture):
+    driver = mocker.Mock(spec=ChromeDriver)
+    driver.window_handles = ["main"]
+    driver.current_window_handle = "fresh"
+    monitor = mocker.Mock(spec=NetworkMonitor)
+    monitor.take_origins.return_value = {"https://sso.test", "https://app.test"}
+    mocker.patch("quick_qa.web.driver_pool.get_monitor", return_value=monitor)
+
+    reset_driver(driver)
+
+    assert driver.execute_cdp_cmd.call_args_list == [
+        mocker.call(
+            "Storage.clearDataForOrigin",
+            {"origin": "https://app.test", "storageTypes": "all"},
+        ),
+        mocker.call(
+            "Storage.clearDataForOrigin",
+            {"origin": "https://sso.test", "storageTypes": "all"},
+        ),
+        mocker.call("Network.clearBrowserCookies", {}),
+    ]
+
+
+def test_reset_driver_without_devtools_clears_current_origin_only(make_driver):
+    # storage of other origins survives on non chromium browsers, see reset_driver
+    driver = make_driver(FIREFOX)
+    driver.window_handles = ["main"]
+
+    reset_driver(driver)
+
+    driver.execute_script.assert_called_once_with(_CLEAR_STORAGE)
+    driver.execute_cdp_cmd.assert_not_called()
+
+
+def test_is_healthy(make_driver):
+    driver = make_driver(CHROME)
+    assert is_healthy(driver)
+
+    driver.window_handles = []
+    assert not is_healthy(driver)
+
+
+def test_get_pool_uses_config(mocker: MockerFixture):
+    mocker.patch("quick_qa.web.driver_pool._pool", None)
+    mocker.patch("quick_qa.web.driver_pool.atexit.register")
+    mocker.patch.object(Config, "pool", {"size": 3, "max_age": 30.0})
+
+    pool = get_pool()
+
+    assert (pool.size, pool.max_age) == (3, 30.0)
+    assert get_pool() is pool
+
+
+def test_stats_from_many_threads(make_driver, mocker: MockerFixture):
+    pool = DriverPool(size=4, max_age=60, factory=make_driver)
+    mocker.patch("quick_qa.web.driver_pool.reset_driver")
+
+    def lease_many():
+        for _ in range(200):
+            pool.release(pool.acquire(CHROME))
+
+    threads = [threading.Thread(target=lease_many) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert pool.stats.created + pool.stats.reused == 8 * 200
+
+
+class TestPrewarm:
+    def test_prewarmed_session_is_leased(self, pool: DriverPool):
+        (future,) = pool.prewarm([CHROME])
+        future.result(timeout=5)
+
+        driver = pool.acquire(CHROME)
+
+        assert pool.factory.call_count == 1
+        assert pool.stats.prewarmed == 1
+        assert pool.stats.reused == 1
+        assert CHROME in pool.warmup_times
+        pool.release(driver)
+
+    def test_acquire_waits_for_booting_session(
+        self, pool: DriverPool, make_driver, mocker: MockerFixture
+    ):
+        booting = threading.Event()
+        release = threading.Event()
+
+        def slow(opts):
+            booting.set()
+            release.wait(5)
+            return make_driver(opts)
+
+        pool.factory = mocker.Mock(side_effect=slow)
+        pool.prewarm([CHROME])
+        booting.wait(5)
+        threading.Timer(0.05, release.set).start()
+
+        pool.acquire(CHROME)
+
+        assert pool.factory.call_count == 1
+        assert pool.stats.waited > 0
+
+    def test_hung_prewarm_falls_back_to_launch(
+        self, pool: DriverPool, make_driver, mocker: MockerFixture
+    ):
+        mocker.patch.dict(Config.timeouts, {"launch": 0.05})
+        hung = threading.Event()
+
+        def first_hangs(opts):
+            if pool.factory.call_count == 1:
+                hung.wait(5)
+            return make_driver(opts)
+
+        pool.factory = mocker.Mock(side_effect=first_hangs)
+        pool.prewarm([CHROME])
+
+        driver = pool.acquire(CHROME)
+        hung.set()
+
+        assert driver is not None
+        assert pool.factory.call_count == 2
+        assert pool.stats.created == 1
+        assert pool.stats.waited >= 0.05
+
+    def test_failed_prewarm_falls_back_to_launch(
+        self, pool: DriverPool, make_driver, mocker: MockerFixture
+    ):
+        pool.factory = mocker.Mock(side_effect=Exception("no browser"))
+        (future,) = pool.prewarm([CHROME])
+        assert isinstance(future.exception(timeout=5), Exception)
+
+        pool.factory.side_effect = make_driver
+        driver = pool.acquire(CHROME)
+
+        assert driver is not None
+        assert pool.stats.created == 1
+
+    def test_prewarm_into_closed_pool_quits(self, pool: DriverPool):
+        pool.close()
+
+        (future,) = pool.prewarm([CHROME])
+        future.result(timeout=5)
+
+        assert pool.idle() == 0
@@ -0,0 +1,184 @@
+import os
+from contextlib import contextmanager
+
+import pytest
+
+from quick_qa.configuration import CACHE_DIR_ENV
+from quick_qa.web import matrix
+from quick_qa.web.config import Config, DriverSpec
+from quick_qa.web.matrix import MatrixReporter, selected_specs
+
+pytest_plugins = ["pytester"]
+
+DRIVERS = [
+    DriverSpec("desktop", "chrome", True, "full"),
+    DriverSpec("mobile", "firefox", True, "375,812"),
+]
+
+CONFTEST = """
+pytest_plugins = ["quick_qa.web.matrix"]
+"""
+
+
+class FakePool:
+    def __init__(self):
+        self.leased = []
+
+    @contextmanager
+    def lease(self, opts):
+        self.leased.append(opts)
+        yield f"driver for {opts.browser_type.value}"
+
+
+@pytest.fixture
+def drivers(mocker):
+    mocker.patch.object(Config, "drivers", DRIVERS)
+    pool = FakePool()
+    mocker.patch.object(matrix, "get_pool", return_value=pool)
+    return pool
+
+
+def test_parametrizes_over_config_drivers(pytester, drivers):
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile(
+        """
+        def test_page(matrix_driver, driver_spec):
+            assert driver_spec.browser in matrix_driver
+
+        def test_no_browser():
+            pass
+        """
+    )
+
+    result = pytester.runpytest_inprocess("-v")
+
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(
+        [
+            "*test_page?desktop? PASSED*",
+            "*test_page?mobile? PASSED*",
+            "*browser matrix*",
+            "desktop *1 *1 *0 *0*",
+            "mobile *1 *1 *0 *0*",
+            "wall *slowest browser*",
+        ]
+    )
+    assert [opts.window_size for opts in drivers.leased] == ["full", (375, 812)]
+
+
+def test_browsers_option_filters(pytester, drivers):
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile("def test_page(matrix_driver): pass")
+
+    result = pytester.runpytest_inprocess("-v", "--browsers", "mobile")
+
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(["*test_page?mobile? PASSED*"])
+
+
+def test_items_are_grouped_per_browser(pytester, drivers):
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile("def test_page(driver_spec): pass")
+
+    items, _ = pytester.inline_genitems()
+
+    groups = [item.get_closest_marker("xdist_group").kwargs["name"] for item in items]
+    assert groups == ["browser-desktop", "browser-mobile"]
+    assert items[0].user_properties == [("browser", "desktop")]
+
+
+def test_selected_specs_unknown_name(mocker):
+    mocker.patch.object(Config, "drivers", DRIVERS)
+
+    with pytest.raises(pytest.UsageError, match="tablet"):
+        selected_specs("desktop, tablet")
+
+
+def _report(when, outcome, start=0.0, stop=0.0, nodeid="t"):
+    return pytest.TestReport(
+        nodeid,
+        (nodeid, 0, nodeid),
+        {},
+        outcome,
+        None,
+        when,
+        duration=stop - start,
+        start=start,
+        stop=stop,
+        user_properties=[("browser", "desktop")],
+    )
+
+
+def test_reporter_sums_per_browser():
+    reporter = MatrixReporter()
+
+    reporter.pytest_runtest_logreport(_report("setup", "passed", 10.0, 11.0))
+    reporter.pytest_runtest_logreport(_report("call", "failed", 11.0, 13.0))
+    reporter.pytest_runtest_logreport(_report("teardown", "passed", 13.0, 13.5))
+
+    timing = reporter.timings["desktop"]
+    assert (timing.tests, timing.passed, timing.failed) == (1, 0, 1)
+    assert timing.seconds == pytest.approx(3.5)
+    assert timing.wall == pytest.approx(3.5)
+
+
+def test_reporter_counts_one_outcome_per_test():
+    reporter = MatrixReporter()
+    reports = [
+        _report("setup", "skipped", nodeid="skipped"),
+        _report("teardown", "passed", nodeid="skipped"),
+        _report("setup", "passed", nodeid="teardown error"),
+        _report("call", "passed", nodeid="teardown error"),
+        _report("teardown", "failed", nodeid="teardown error"),
+        _report("setup", "passed", nodeid="ok"),
+        _report("call", "passed", nodeid="ok"),
+        _report("teardown", "passed", nodeid="ok"),
+    ]
+    for report in reports:
+        reporter.pytest_runtest_logreport(report)
+
+    timing = reporter.timings["desktop"]
+    assert timing.tests == 3
+    assert (timing.passed, timing.failed, timing.skipped) == (1, 1, 1)
+
+
+@pytest.mark.parametrize("controller, prewarmed", [(False, 1), (True, 0)])
+def test_prewarm_skips_xdist_controller(
+    pytester, drivers, mocker, controller, prewarmed
+):
+    mocker.patch.dict(Config.pool, {"prewarm": True})
+    prewarm = mocker.patch.object(matrix.DriverFactory, "prewarm")
+    conftest = CONFTEST
+    if controller:
+        conftest += """
+class DSession:
+    pass
+
+def pytest_configure(config):
+    config.pluginmanager.register(DSession(), "dsession")
+"""
+    pytester.makeconftest(conftest)
+    pytester.makepyfile("def test_page(driver_spec): pass")
+
+    pytester.runpytest_inprocess()
+
+    assert prewarm.call_count == prewarmed
+
+
+def test_exports_snapshot_dir_for_workers(pytester, drivers, monkeypatch, tmp_path):
+    monkeypatch.delenv(CACHE_DIR_ENV, raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile(
+        f"""
+        import os
+
+        def test_env():
+            assert os.environ["{CACHE_DIR_ENV}"] == {str(tmp_path / "quick_qa")!r}
+        """
+    )
+
+    result = pytester.runpytest_inprocess()
+
+    result.assert_outcomes(passed=1)
+    assert CACHE_DIR_ENV not in os.environ
@@ -0,0 +1,205 @@
+from types import SimpleNamespace
+
+import pytest
+from pytest_mock import MockerFixture
+from selenium.webdriver.chrome.webdriver import WebDriver as ChromeDriver
+from selenium.webdriver.firefox.webdriver import WebDriver as FirefoxDriver
+
+from quick_qa.web import network_events
+from quick_qa.web.config import Config
+from quick_qa.web.network_events import get_monitor, install_monitor
+from quick_qa.web.waits import NetworkIdle
+
+
+@pytest.fixture
+def clock(mocker: MockerFixture):
+    now = SimpleNamespace(value=100.0)
+    mocker.patch.object(network_events.time, "monotonic", side_effect=lambda: now.value)
+    return now
+
+
+@pytest.fixture
+def chrome(mocker: MockerFixture):
+    driver = mocker.Mock(spec=ChromeDriver)
+    driver.start_devtools.return_value = (mocker.Mock(), mocker.Mock())
+    return driver
+
+
+@pytest.fixture
+def firefox(mocker: MockerFixture):
+    driver = mocker.Mock(spec=FirefoxDriver)
+    driver.name = "firefox"
+    driver.network = mocker.Mock()
+    return driver
+
+
+def _callbacks(conn):
+    return [c.args[1] for c in conn.add_callback.call_args_list]
+
+
+def _cdp(request_id, redirect_response=None, document=None):
+    return SimpleNamespace(
+        request_id=request_id,
+        redirect_response=redirect_response,
+        type_=SimpleNamespace(value="Document") if document else None,
+        request=SimpleNamespace(url=document),
+    )
+
+
+class TestNetworkMonitor:
+    def test_cdp_counts_requests_in_flight(self, chrome, clock):
+        monitor = install_monitor(chrome)
+        _, conn = chrome.start_devtools.return_value
+        on_request, on_finished, on_failed = _callbacks(conn)
+
+        on_request(_cdp("1"))
+        on_request(_cdp("2"))
+        on_request(_cdp("2", redirect_response=object()))
+        on_finished(_cdp("1"))
+
+        assert monitor.mode == "cdp"
+        assert monitor.in_flight == 1
+        on_failed(_cdp("2"))
+        assert monitor.in_flight == 0
+
+    def test_idle_after_quiet_window(self, chrome, clock):
+        monitor = install_monitor(chrome)
+        _, conn = chrome.start_devtools.return_value
+        on_request, on_finished, _ = _callbacks(conn)
+
+        on_request(_cdp("1"))
+        clock.value += 5
+        assert not monitor.idle_for(0.5)
+
+        on_finished(_cdp("1"))
+        clock.value += 0.4
+        assert not monitor.idle_for(0.5)
+        clock.value += 0.1
+        assert monitor.idle_for(0.5)
+
+    def test_finish_before_start(self, chrome, clock):
+        monitor = install_monitor(chrome)
+        _, conn = chrome.start_devtools.return_value
+        on_request, on_finished, _ = _callbacks(conn)
+
+        on_finished(_cdp("1"))
+        on_request(_cdp("1"))
+
+        assert monitor.in_flight == 0
+
+    def test_start_navigation_forgets_pending(self, chrome, clock):
+        monitor = install_monitor(chrome)
+        _, conn = chrome.start_devtools.return_value
+        on_request = _callbacks(conn)[0]
+        on_request(_cdp("1"))
+
+        monitor.start_navigation()
+
+        assert monitor.in_flight == 0
+
+    def test_bidi_events(self, firefox, clock):
+        monitor = install_monitor(firefox)
+        conn = firefox.network.conn
+        events = [c.args[0].event_class for c in conn.add_callback.call_args_list]
+        on_request, on_completed, on_error = _callbacks(conn)
+
+        def hop(request_id, redirects=0):
+            params = {"request": {"request": request_id}, "redirectCount": redirects}
+            return SimpleNamespace(params=params)
+
+        on_request(hop("a"))
+        on_request(hop("b"))
+        # the 3xx hop of b completes before its redirect starts
+        on_completed(hop("b"))
+        on_request(hop("b", redirects=1))
+        on_completed(hop("a"))
+
+        assert monitor.mode == "bidi"
+        assert events == [
+            "network.beforeRequestSent",
+            "network.responseCompleted",
+            "network.fetchError",
+        ]
+        assert monitor.in_flight == 1
+        on_error(hop("b", redirects=1))
+        assert monitor.in_flight == 0
+
+    def test_bidi_redirect_completed_out_of_order(self, firefox, clock):
+        monitor = install_monitor(firefox)
+        on_request, on_completed, _ = _callbacks(firefox.network.conn)
+
+        def hop(redirects):
+            params = {"request": {"request": "a"}, "redirectCount": redirects}
+            return SimpleNamespace(params=params)
+
+        on_request(hop(0))
+        on_request(hop(1))
+        on_completed(hop(0))
+
+        assert monitor.in_flight == 1
+        on_completed(hop(1))
+        assert monitor.in_flight == 0
+
+    def test_collects_document_origins(self, chrome, firefox, clock):
+        cdp = install_monitor(chrome)
+        _, conn = chrome.start_devtools.return_value
+        on_request = _callbacks(conn)[0]
+        bidi = install_monitor(firefox)
+        on_bidi_request = _callbacks(firefox.network.conn)[0]
+
+        on_request(_cdp("1", document="https://app.example.com/login?next=/"))
+        on_request(_cdp("2", document="https://sso.example.com:8443/frame"))
+        on_request(_cdp("3"))
+        on_request(_cdp("4", document="about:blank"))
+        page = {"request": "a", "url": "http://shop.test/"}
+        script = {"request": "b", "url": "http://cdn.test/x.js"}
+        on_bidi_request(SimpleNamespace(params={"request": page, "navigation": "n"}))
+        on_bidi_request(SimpleNamespace(params={"request": script}))
+
+        assert cdp.take_origins() == {
+            "https://app.example.com",
+            "https://sso.example.com:8443",
+        }
+        assert cdp.take_origins() == set()
+        assert bidi.take_origins() == {"http://shop.test"}
+
+    def test_no_events_available(self, chrome):
+        chrome.start_devtools.side_effect = RuntimeError("no websocket")
+
+        assert install_monitor(chrome).mode is None
+
+
+class TestNetworkIdle:
+    def test_answers_from_events_without_browser_calls(self, chrome, clock):
+        monitor = install_monitor(chrome)
+        clock.value += 1
+
+        assert NetworkIdle(quiet=0.5)(chrome)
+        chrome.execute_script.assert_not_called()
+        assert get_monitor(chrome) is monitor
+
+    def test_idle_at_once_without_requests(self, chrome, clock):
+        install_monitor(chrome)
+
+        assert NetworkIdle()(chrome)
+
+    def test_installs_js_tracker_once_per_document(self, mocker: MockerFixture):
+        driver = mocker.Mock(spec=FirefoxDriver)
+        driver.execute_script.side_effect = [None, [0, 0.0], [0, 600.0]]
+        condition = NetworkIdle(quiet=0.5)
+
+        assert not condition(driver)
+        assert condition(driver)
+
+        install, poll = [c.args[0] for c in driver.execute_script.call_args_list[1:]]
+        assert "__quickQaNetwork =" in install
+        assert "__quickQaNetwork =" not in poll
+
+    def test_quiet_defaults_to_config(self, mocker: MockerFixture):
+        mocker.patch.object(Config, "network_idle", {"events": True, "quiet": 2.0})
+
+        assert NetworkIdle().quiet == 2.0
+
+    def test_config_rejects_negative_quiet(self):
+        with pytest.raises(ValueError, match="quiet"):
+            Config._validate_data({"network_idle": {"quiet": -1}})
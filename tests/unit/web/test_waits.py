@@ -0,0 +1,164 @@
+from itertools import islice
+
+import pytest
+from pytest_mock import MockerFixture
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+from quick_qa.web import waits
+from quick_qa.web.config import Config
+from quick_qa.web.network_events import NetworkMonitor
+from quick_qa.web.waits import (
+    DocumentReady,
+    JQueryInactive,
+    JSCondition,
+    NetworkIdle,
+    PollSchedule,
+    poll_schedule,
+    wait,
+)
+
+
+@pytest.fixture
+def clock(mocker: MockerFixture):
+    """fake time, sleeping moves it forward"""
+    slept = []
+    now = [0.0]
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    mocker.patch.object(waits.time, "monotonic", side_effect=lambda: now[0])
+    mocker.patch.object(waits.time, "sleep", side_effect=sleep)
+    return slept
+
+
+class TestPollSchedule:
+    def test_backs_off_to_maximum(self):
+        delays = PollSchedule(initial=0.01, factor=2.0, maximum=0.05).delays()
+
+        assert list(islice(delays, 5)) == [0.01, 0.02, 0.04, 0.05, 0.05]
+
+    def test_override_on_top_of_default(self, mocker: MockerFixture):
+        mocker.patch.object(
+            Config,
+            "polling",
+            {
+                "default": {"initial": 0.02, "factor": 2.0, "max": 0.5},
+                "find": {"max": 0.1},
+            },
+        )
+
+        assert poll_schedule("find") == PollSchedule(0.02, 2.0, 0.1)
+        assert poll_schedule("interact") == PollSchedule(0.02, 2.0, 0.5)
+        assert poll_schedule() == PollSchedule(0.02, 2.0, 0.5)
+
+    def test_config_rejects_shrinking_factor(self):
+        with pytest.raises(ValueError, match="factor"):
+            Config._validate_data({"polling": {"find": {"factor": 0.5}}})
+
+    def test_config_rejects_unknown_wait(self):
+        with pytest.raises(ValueError, match="unexpected keys"):
+            Config._validate_data({"polling": {"scroll": {"max": 1}}})
+
+
+class TestWait:
+    def test_polls_on_schedule(self, clock, mocker: MockerFixture):
+        condition = mocker.Mock(side_effect=[False, False, False, "done"])
+
+        result = wait("driver", 5.0, condition, poll=PollSchedule(0.01, 3.0, 1.0))
+
+        assert result == ["done"]
+        assert clock == pytest.approx([0.01, 0.03, 0.09])
+
+    def test_times_out(self, clock, mocker: MockerFixture):
+        condition = mocker.Mock(return_value=False)
+
+        with pytest.raises(TimeoutException):
+            wait("driver", 1.0, condition, poll=PollSchedule(0.1, 2.0, 0.5))
+
+        assert sum(clock) == pytest.approx(1.0)
+        assert clock[-1] == pytest.approx(0.3)
+
+    def test_ignores_exceptions(self, clock, mocker: MockerFixture):
+        condition = mocker.Mock(
+            side_effect=[
+                NoSuchElementException(),
+                StaleElementReferenceException(),
+                True,
+            ]
+        )
+
+        wait(
+            "driver",
+            1.0,
+            lambda d: condition(),
+            ignored_exceptions=[StaleElementReferenceException],
+        )
+
+        assert condition.call_count == 3
+
+    def test_other_exceptions_raise(self, clock):
+        def condition(driver):
+            raise ValueError("broken")
+
+        with pytest.raises(ValueError):
+            wait("driver", 1.0, condition)
+
+
+class TestJSConditions:
+    def test_wait_batches_scripts_in_one_call(self, clock, mocker: MockerFixture):
+        driver = mocker.Mock()
+        driver.execute_script.return_value = ["complete", True, [0, 900.0], 1]
+        app_ready = JSCondition("return window.app.ready;")
+        other = mocker.Mock(return_value=True)
+
+        wait(
+            driver,
+            1.0,
+            DocumentReady(),
+            other,
+            JQueryInactive(),
+            NetworkIdle(0.5) & app_ready,
+        )
+
+        driver.execute_script.assert_called_once()
+        script = driver.execute_script.call_args.args[0]
+        assert (
+            script.index("readyState")
+            < script.index("jQuery")
+            < script.index("app.ready")
+        )
+        other.assert_called_once_with(driver)
+
+    def test_one_false_result_fails_the_batch(self, mocker: MockerFixture):
+        driver = mocker.Mock()
+        driver.execute_script.return_value = ["loading", True]
+
+        assert not (DocumentReady() & JQueryInactive())(driver)
+
+    def test_single_condition_runs_its_own_script(self, mocker: MockerFixture):
+        driver = mocker.Mock()
+        driver.execute_script.return_value = "complete"
+
+        assert DocumentReady()(driver)
+        driver.execute_script.assert_called_once_with(DocumentReady.script)
+
+    def test_network_events_leave_the_batch(self, mocker: MockerFixture):
+        driver = mocker.Mock()
+        monitor = mocker.Mock(spec=NetworkMonitor, mode="cdp")
+        mocker.patch.object(waits, "get_monitor", return_value=monitor)
+        condition = DocumentReady() & NetworkIdle(0.5)
+
+        monitor.idle_for.return_value = False
+        assert not condition(driver)
+        driver.execute_script.assert_not_called()
+
+        monitor.idle_for.return_value = True
+        driver.execute_script.return_value = "complete"
+        assert condition(driver)
+        driver.execute_script.assert_called_once_with(DocumentReady.script)
@@ -3,11 +3,13 @@ from pytest_mock.plugin import MockerFixture
 from selenium.webdriver import ChromeOptions, FirefoxOptions
 from selenium.webdriver.remote.webdriver import WebDriver
 
+from quick_qa.web.config import Config, DriverSpec
 from quick_qa.web.webdriver_factory import (
     BrowserOptionsSpec,
     BrowserOptionsSpecBuilder,
     BrowserType,
     ChromeBuilder,
+    DriverFactory,
     FirefoxBuilder,
 )
 
@@ -72,6 +74,19 @@ class TestBrowserOptionsBuilder:
         ):
             BrowserOptionsSpecBuilder.create().build()
 
+    def test_from_driver_spec(self):
+        spec = DriverSpec("mobile", "firefox", True, "375,812", profile="ci-fast")
+
+        result = BrowserOptionsSpecBuilder.from_driver_spec(spec)
+
+        assert result == BrowserOptionsSpec(
+            BrowserType.FIREFOX, (375, 812), True, profile="ci-fast"
+        )
+
+    def test_set_profile_unknown(self):
+        with pytest.raises(ValueError, match="unknown performance profile"):
+            BrowserOptionsSpecBuilder.create().set_profile("turbo")
+
 
 class TestChromeBuilder:
     def test_init(self, mocker: MockerFixture):
@@ -231,3 +246,93 @@ class TestFirefoxBuilder:
 
         bo.assert_called_once()
         assert result == mock_driver
+
+
+class TestProfiles:
+    def test_chrome_ci_fast(self):
+        opts = BrowserOptionsSpec(BrowserType.CHROME, None, True, "ci-fast-no-images")
+        cb = ChromeBuilder(opts)
+
+        cb._build_options()
+
+        assert cb.options.page_load_strategy == "eager"
+        assert "--disable-gpu" in cb.options.arguments
+        assert "--no-first-run" in cb.options.arguments
+        prefs = cb.options.experimental_options["prefs"]
+        assert prefs["profile.managed_default_content_settings.images"] == 2
+
+    def test_firefox_ci_fast(self):
+        opts = BrowserOptionsSpec(BrowserType.FIREFOX, None, True, "ci-fast")
+        fb = FirefoxBuilder(opts)
+
+        fb._build_options()
+
+        assert fb.options.page_load_strategy == "eager"
+        assert fb.options.preferences["browser.shell.checkDefaultBrowser"] is False
+        assert "permissions.default.image" not in fb.options.preferences
+
+    def test_default_profile_keeps_options(self):
+        cb = ChromeBuilder(BrowserOptionsSpec(BrowserType.CHROME, None, True))
+
+        cb._build_options()
+
+        assert cb.options.arguments == ["--headless"]
+        assert cb.options.page_load_strategy == "normal"
+
+    def test_config_rejects_unknown_profile(self):
+        driver = {
+            "name": "desktop",
+            "browser": "chrome",
+            "headless": True,
+            "window_size": "full",
+            "profile": "turbo",
+        }
+
+        with pytest.raises(ValueError, match="profile"):
+            Config._validate_data({"drivers": [driver]})
+
+
+class TestDriverFactory:
+    def test_no_network_listeners_by_default(self, mocker: MockerFixture):
+        from quick_qa.web import webdriver_factory
+
+        firefox = mocker.patch.object(webdriver_factory.webdriver, "Firefox")
+        install = mocker.patch.object(webdriver_factory, "install_monitor")
+
+        DriverFactory.get_driver(BrowserOptionsSpec(BrowserType.FIREFOX, None, True))
+
+        assert not firefox.call_args.kwargs["options"].enable_bidi
+        install.assert_not_called()
+
+    def test_network_events_opt_in(self, mocker: MockerFixture):
+        from quick_qa.web import webdriver_factory
+
+        mocker.patch.dict(Config.network_idle, {"events": True})
+        firefox = mocker.patch.object(webdriver_factory.webdriver, "Firefox")
+        install = mocker.patch.object(webdriver_factory, "install_monitor")
+
+        driver = DriverFactory.get_driver(
+            BrowserOptionsSpec(BrowserType.FIREFOX, None, True)
+        )
+
+        assert firefox.call_args.kwargs["options"].enable_bidi
+        install.assert_called_once_with(driver)
+
+    def test_prewarm_configured_drivers(self, mocker: MockerFixture):
+        pool = mocker.patch("quick_qa.web.driver_pool.get_pool").return_value
+        mocker.patch.object(
+            Config,
+            "drivers",
+            [
+                DriverSpec("desktop", "chrome", True, "full"),
+                DriverSpec("mobile", "firefox", True, "375,812"),
+            ],
+        )
+
+        DriverFactory.prewarm()
+
+        (specs,) = pool.prewarm.call_args.args
+        assert [s.browser_type for s in specs] == [
+            BrowserType.CHROME,
+            BrowserType.FIREFOX,
+        ]